@@ -0,0 +1,158 @@
+"""Admission control: per-user rate limits and a global in-flight cap.
+
+Every /api/ request is classified into a route group (ROUTE_GROUPS, first
+match wins).  If settings.rate_limits has an entry for the group, the
+caller — the JWT subject, or the client address for anonymous requests —
+spends one token from its bucket for that group; an empty bucket is
+answered immediately with 429 and a Retry-After of the time until the next
+token.
+
+Independently, no more than settings.admission_max_in_flight requests are
+handled at once (by default the size of the DB connection pool plus its
+overflow).  Beyond that the request gets an immediate 503 instead of
+queueing for a connection and holding a worker thread for the pool timeout.
+The cap is checked first, so a 503 does not spend a rate-limit token.
+
+All state is per process: with N gunicorn workers the effective limits
+are N times the configured ones (exported as gauges by app.metrics).
+"""
+
+import math
+import re
+import time
+
+import orjson
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.auth import bearer_subject
+from app.config import RateLimit, settings
+from app.metrics import ADMISSION_ADMITTED, ADMISSION_IN_FLIGHT, ADMISSION_REJECTED
+
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+# (group, methods, path pattern) — first match wins
+ROUTE_GROUPS: list[tuple[str, frozenset[str], re.Pattern]] = [
+    ("import", frozenset({"POST"}), re.compile(r"^/api/campaigns/import$")),
+    ("trades", frozenset({"POST"}), re.compile(r"^/api/campaigns/\d+/rangers/\d+/trades(/\d+/revert)?$")),
+    ("writes", _WRITE_METHODS, re.compile(r"^/api/(?!auth/)")),
+    ("reads", frozenset({"GET"}), re.compile(r"^/api/")),
+]
+
+# Never limited: probes and scrapes must keep working under load
+EXEMPT_PATHS = frozenset({"/api/health", "/api/metrics"})
+
+_MAX_BUCKETS = 10_000
+
+
+class TokenBucket:
+    def __init__(self, limit: RateLimit):
+        self.limit = limit
+        self.tokens = float(limit.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.limit.burst, self.tokens + (now - self.updated) * self.limit.rate)
+        self.updated = now
+
+    def take(self) -> float:
+        """Spend one token; returns 0 on success, else seconds until one is available."""
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.limit.rate if self.limit.rate > 0 else math.inf
+
+    def is_full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.limit.burst
+
+
+_buckets: dict[tuple[str, str], TokenBucket] = {}
+_in_flight = 0
+
+
+def route_group(method: str, path: str) -> str | None:
+    for group, methods, pattern in ROUTE_GROUPS:
+        if method in methods and pattern.match(path):
+            return group
+    return None
+
+
+def _bucket(key: tuple[str, str], limit: RateLimit) -> TokenBucket:
+    bucket = _buckets.get(key)
+    if bucket is None or bucket.limit != limit:
+        if len(_buckets) >= _MAX_BUCKETS:
+            # Idle callers' buckets are full again; forgetting them changes nothing
+            for k in [k for k, b in _buckets.items() if b.is_full()]:
+                del _buckets[k]
+        bucket = _buckets[key] = TokenBucket(limit)
+    return bucket
+
+
+def max_in_flight() -> int:
+    if settings.admission_max_in_flight is not None:
+        return settings.admission_max_in_flight
+    return settings.db_pool_size + settings.db_max_overflow
+
+
+def reset() -> None:
+    """Forget all buckets (tests)."""
+    _buckets.clear()
+
+
+async def _reject(send: Send, status: int, detail: str, retry_after: float) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(max(1, math.ceil(min(retry_after, 3600)))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": orjson.dumps({"detail": detail})})
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _in_flight
+        path = scope.get("path", "")
+        if (
+            scope["type"] != "http"
+            or not settings.admission_enabled
+            or not path.startswith("/api/")
+            or path in EXEMPT_PATHS
+            or scope["method"] == "OPTIONS"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        group = route_group(scope["method"], path) or "other"
+        if _in_flight >= max_in_flight():
+            ADMISSION_REJECTED.labels(group, "overloaded").inc()
+            await _reject(send, 503, "Server busy, retry shortly", 1)
+            return
+
+        limit = settings.rate_limits.get(group)
+        if limit is not None:
+            caller = bearer_subject(Headers(scope=scope).get("authorization"))
+            if caller is None:
+                client = scope.get("client")
+                caller = f"addr:{client[0] if client else 'unknown'}"
+            wait = _bucket((caller, group), limit).take()
+            if wait:
+                ADMISSION_REJECTED.labels(group, "rate_limited").inc()
+                await _reject(send, 429, "Too many requests", wait)
+                return
+
+        ADMISSION_ADMITTED.labels(group).inc()
+        _in_flight += 1
+        ADMISSION_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _in_flight -= 1
+            ADMISSION_IN_FLIGHT.dec()
@@ -0,0 +1,184 @@
+"""Server-wide card analytics, maintained incrementally.
+
+Every mutation that changes what rangers hold or trade calls one of the
+record_* helpers inside its own transaction, so the aggregate tables in
+app.models.analytics are always consistent with the domain tables and the
+analytics endpoint never scans rangers or trades.  rebuild() recomputes
+everything from scratch; it runs at startup when the tables are empty and
+can be used to repair drift.
+"""
+
+import random
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert
+from app.models.analytics import COUNTER_SHARDS, AnalyticsCounter, CardPickStat, TradePairStat
+from app.models.campaign import Campaign, CampaignDay, CampaignStatus, DayStatus
+from app.models.ranger import Ranger, RangerTrade
+
+SLOTS = ("personality", "background", "specialty", "role", "outside_interest")
+
+
+def _ranger_picks(ranger) -> Counter:
+    """(card_id, slot) → 1 for every card the ranger selected at creation."""
+    picks: Counter = Counter()
+    for cid in ranger.personality_card_ids:
+        picks[(cid, "personality")] += 1
+    for cid in ranger.background_card_ids:
+        picks[(cid, "background")] += 1
+    for cid in ranger.specialty_card_ids:
+        picks[(cid, "specialty")] += 1
+    picks[(ranger.role_card_id, "role")] += 1
+    picks[(ranger.outside_interest_card_id, "outside_interest")] += 1
+    return picks
+
+
+def _bump_picks(db: Session, picks: Counter, sign: int) -> None:
+    for (card_id, slot), n in picks.items():
+        stmt = upsert(db, CardPickStat).values(card_id=card_id, slot=slot, picks=sign * n)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[CardPickStat.card_id, CardPickStat.slot],
+            set_={"picks": CardPickStat.picks + stmt.excluded.picks},
+        ))
+
+
+def _bump_trades(db: Session, pairs: Counter, sign: int) -> None:
+    for (original_id, reward_id), n in pairs.items():
+        stmt = upsert(db, TradePairStat).values(original_card_id=original_id, reward_card_id=reward_id, trades=sign * n)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[TradePairStat.original_card_id, TradePairStat.reward_card_id],
+            set_={"trades": TradePairStat.trades + stmt.excluded.trades},
+        ))
+
+
+def _bump_counter(db: Session, name: str, delta: int) -> None:
+    shard = random.randrange(COUNTER_SHARDS)
+    stmt = upsert(db, AnalyticsCounter).values(name=name, shard=shard, value=delta)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[AnalyticsCounter.name, AnalyticsCounter.shard],
+        set_={"value": AnalyticsCounter.value + stmt.excluded.value},
+    ))
+
+
+# ---------------------------------------------------------------------------
+# Incremental updates — call inside the mutating transaction
+# ---------------------------------------------------------------------------
+
+def record_ranger(db: Session, ranger: Ranger, sign: int = 1) -> None:
+    _bump_picks(db, _ranger_picks(ranger), sign)
+    _bump_counter(db, "rangers", sign)
+
+
+def record_trade(db: Session, original_card_id: int, reward_card_id: int, sign: int = 1) -> None:
+    """Count (sign=+1) or un-count (sign=-1, e.g. on revert) one applied trade."""
+    _bump_trades(db, Counter({(original_card_id, reward_card_id): 1}), sign)
+    _bump_counter(db, "trades", sign)
+
+
+def record_day_completed(db: Session, sign: int = 1) -> None:
+    _bump_counter(db, "days_completed", sign)
+
+
+def record_campaign_removed(db: Session, campaign_id: int) -> None:
+    """Subtract everything a campaign contributed; call before deleting it."""
+    picks: Counter = Counter()
+    rangers = (
+        db.query(
+            Ranger.personality_card_ids,
+            Ranger.background_card_ids,
+            Ranger.specialty_card_ids,
+            Ranger.role_card_id,
+            Ranger.outside_interest_card_id,
+        )
+        .filter(Ranger.campaign_id == campaign_id)
+        .all()
+    )
+    for r in rangers:
+        picks.update(_ranger_picks(r))
+
+    pairs = Counter({
+        (original_id, reward_id): n
+        for original_id, reward_id, n in db.execute(
+            select(RangerTrade.original_card_id, RangerTrade.reward_card_id, func.count())
+            .join(Ranger, RangerTrade.ranger_id == Ranger.id)
+            .where(Ranger.campaign_id == campaign_id, RangerTrade.reverted.is_(False))
+            .group_by(RangerTrade.original_card_id, RangerTrade.reward_card_id)
+        )
+    })
+    days_completed = db.scalar(
+        select(func.count())
+        .select_from(CampaignDay)
+        .where(CampaignDay.campaign_id == campaign_id, CampaignDay.status == DayStatus.completed)
+    )
+
+    _bump_picks(db, picks, -1)
+    _bump_trades(db, pairs, -1)
+    _bump_counter(db, "rangers", -len(rangers))
+    _bump_counter(db, "trades", -sum(pairs.values()))
+    _bump_counter(db, "days_completed", -days_completed)
+
+
+# ---------------------------------------------------------------------------
+# Full rebuild
+# ---------------------------------------------------------------------------
+
+def rebuild(db: Session) -> None:
+    """Recompute every aggregate from the domain tables (full scan) and commit.
+
+    Campaigns still being purged (status 'deleting') were already subtracted and are skipped.
+    """
+    live = select(Campaign.id).where(Campaign.status != CampaignStatus.deleting)
+    db.execute(delete(CardPickStat))
+    db.execute(delete(TradePairStat))
+    db.execute(delete(AnalyticsCounter))
+
+    picks: Counter = Counter()
+    n_rangers = 0
+    for r in db.query(
+        Ranger.personality_card_ids,
+        Ranger.background_card_ids,
+        Ranger.specialty_card_ids,
+        Ranger.role_card_id,
+        Ranger.outside_interest_card_id,
+    ).filter(Ranger.campaign_id.in_(live)).yield_per(500):
+        picks.update(_ranger_picks(r))
+        n_rangers += 1
+
+    pairs = Counter({
+        (original_id, reward_id): n
+        for original_id, reward_id, n in db.execute(
+            select(RangerTrade.original_card_id, RangerTrade.reward_card_id, func.count())
+            .join(Ranger, RangerTrade.ranger_id == Ranger.id)
+            .where(RangerTrade.reverted.is_(False), Ranger.campaign_id.in_(live))
+            .group_by(RangerTrade.original_card_id, RangerTrade.reward_card_id)
+        )
+    })
+    days_completed = db.scalar(
+        select(func.count())
+        .select_from(CampaignDay)
+        .where(CampaignDay.status == DayStatus.completed, CampaignDay.campaign_id.in_(live))
+    )
+
+    _bump_picks(db, picks, 1)
+    _bump_trades(db, pairs, 1)
+    _bump_counter(db, "rangers", n_rangers)
+    _bump_counter(db, "trades", sum(pairs.values()))
+    _bump_counter(db, "days_completed", days_completed)
+    db.commit()
+
+
+def ensure_analytics_built(db: Session) -> None:
+    """Rebuild once if the aggregates have never been populated (e.g. first boot after upgrade)."""
+    if db.scalar(select(AnalyticsCounter.name).where(AnalyticsCounter.name == "rangers").limit(1)) is None:
+        rebuild(db)
+        print("[analytics] Aggregates rebuilt.")
+
+
+def counter_totals(db: Session) -> dict[str, int]:
+    """Current value of every named counter (the sum of its shards)."""
+    return dict(db.execute(
+        select(AnalyticsCounter.name, func.sum(AnalyticsCounter.value)).group_by(AnalyticsCounter.name)
+    ).all())
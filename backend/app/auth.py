@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from app.config import settings
 from app.database import get_db
 from app.models.user import User
+from app.tracing import traced
 
 bearer_scheme = HTTPBearer()
 
@@ -26,16 +27,34 @@ def create_access_token(username: str) -> str:
     return jwt.encode({"sub": username, "exp": expire}, settings.jwt_secret, algorithm="HS256")  # returns str in PyJWT ≥2
 
 
+def decode_token_subject(token: str) -> str:
+    """Username from a valid token; raises jwt.InvalidTokenError otherwise."""
+    payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
+    username = payload.get("sub")
+    if not username:
+        raise jwt.InvalidTokenError("missing sub")
+    return username
+
+
+def bearer_subject(authorization: str | None) -> str | None:
+    """Username from an `Authorization: Bearer` header, or None — no database lookup."""
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return decode_token_subject(token)
+    except jwt.InvalidTokenError:
+        return None
+
+
+@traced("dependency")
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: Session = Depends(get_db),
 ) -> User:
     token = credentials.credentials
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=["HS256"])
-        username: str = payload.get("sub")
-        if not username:
-            raise jwt.InvalidTokenError("missing sub")
+        username = decode_token_subject(token)
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
     user = db.query(User).filter_by(username=username).first()
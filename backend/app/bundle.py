@@ -0,0 +1,67 @@
+"""Static publication of the reference bundle (cards + storylines).
+
+The bundle is written as <bundle_dir>/reference.<hash>.json, next to a
+.gz copy for nginx's gzip_static, and nginx serves the directory at
+settings.bundle_url_prefix with `Cache-Control: immutable`.  GET
+/api/reference advertises the current hash and URL, so a client
+downloads the library at most once per release.
+
+Card IDs are assigned by the database, so the bundle is built from the
+seeded tables rather than from seed.py.  The app publishes it at startup
+(app.startup.warm_reference_cache) when BUNDLE_DIR is set; as a build or
+deploy step run:
+
+    python -m app.bundle --out DIR
+"""
+
+import argparse
+import gzip
+import os
+from pathlib import Path
+
+from app.config import settings
+from app.database import SessionLocal
+from app.reference_cache import ReferenceBundle, get_reference_bundle
+
+
+def bundle_url(bundle: ReferenceBundle) -> str:
+    """Where clients fetch the bundle: the static file, or the API fallback when none is published."""
+    if settings.bundle_dir:
+        return settings.bundle_url_prefix + bundle.filename
+    return f"/api/reference/{bundle.filename}"
+
+
+def _write(path: Path, data: bytes) -> None:
+    # Write-then-rename so nginx never serves a partial file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def publish_bundle(bundle: ReferenceBundle, directory: str | Path) -> Path:
+    """Write the bundle (and its .gz) into `directory` unless this version is already there."""
+    directory = Path(directory)
+    path = directory / bundle.filename
+    if path.exists():
+        return path
+    directory.mkdir(parents=True, exist_ok=True)
+    _write(path.with_name(path.name + ".gz"), gzip.compress(bundle.payload.body, compresslevel=9, mtime=0))
+    _write(path, bundle.payload.body)
+    print(f"[bundle] Published {path}")
+    return path
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.bundle", description="Write the reference bundle.")
+    parser.add_argument("--out", default=settings.bundle_dir, required=settings.bundle_dir is None,
+                        help="output directory (default: BUNDLE_DIR)")
+    args = parser.parse_args(argv)
+    db = SessionLocal()
+    try:
+        publish_bundle(get_reference_bundle(db), args.out)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
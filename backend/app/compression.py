@@ -0,0 +1,152 @@
+"""Response compression negotiated with Accept-Encoding.
+
+CompressionMiddleware compresses complete (non-streaming) responses whose
+content type is on the allow-list and whose body is at least
+settings.compression_minimum_size bytes.  Brotli is used when the optional
+`brotli` package is installed and the client accepts it; otherwise gzip.
+Streaming responses are passed through untouched — buffering them to
+compress would delay the first byte.
+
+Payloads that never change between requests (the card library, storylines)
+are wrapped in a CompressedPayload so each encoding is computed once and
+reused; responses that already carry Content-Encoding are left alone by
+the middleware.
+"""
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional — gzip only
+    brotli = None
+
+
+def available_encodings() -> list[str]:
+    """Configured encodings, in preference order, that this process can produce."""
+    return [e for e in settings.compression_encodings if e == "gzip" or (e == "br" and brotli is not None)]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Pick the preferred encoding the client accepts, or None for identity."""
+    if not accept_encoding:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+
+    candidates = [
+        e for e in available_encodings()
+        if accepted.get(e, accepted.get("*", 0.0)) > 0
+    ]
+    if not candidates:
+        return None
+    # Highest q wins; ties go to the server's preference order
+    return max(candidates, key=lambda e: accepted.get(e, accepted.get("*", 0.0)))
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.compression_brotli_quality)
+    return gzip.compress(body, compresslevel=settings.compression_gzip_level)
+
+
+def _is_compressible(content_type: str | None) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type in settings.compression_content_types
+
+
+class CompressedPayload:
+    """A response body rendered once, with each compressed variant cached on first use."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.body = body
+        self.media_type = media_type
+        self._variants: dict[str, bytes] = {}
+
+    def variant(self, encoding: str) -> bytes:
+        data = self._variants.get(encoding)
+        if data is None:
+            data = self._variants[encoding] = compress(self.body, encoding)
+        return data
+
+    def response(self, request: Request, headers: dict[str, str] | None = None) -> Response:
+        headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+        encoding = None
+        if settings.compression_enabled and len(self.body) >= settings.compression_minimum_size:
+            encoding = negotiate(request.headers.get("accept-encoding"))
+        if encoding is None:
+            return Response(self.body, media_type=self.media_type, headers=headers)
+        headers["Content-Encoding"] = encoding
+        return Response(self.variant(encoding), media_type=self.media_type, headers=headers)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            if (
+                message.get("more_body", False)
+                or "content-encoding" in headers
+                or not _is_compressible(headers.get("content-type"))
+                or len(body) < settings.compression_minimum_size
+            ):
+                # Streaming, already encoded, wrong type or too small: send as-is
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,12 +1,71 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import time
+
+from fastapi import Request
+from sqlalchemy import Connection, Engine, create_engine, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import StaticPool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.config import settings
 
 
-engine = create_engine(settings.database_url)
+def is_in_memory(url) -> bool:
+    """True for an in-memory SQLite URL (sqlite:// or sqlite:///:memory:)."""
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def create_db_engine(url, **kwargs) -> Engine:
+    """create_engine() for any supported database URL.
+
+    PostgreSQL URLs get the configured pool size.  SQLite URLs (a file, or
+    sqlite:// for a throwaway in-memory database) get foreign-key
+    enforcement and connections usable from the threadpool; an in-memory
+    database is a single shared connection so every session sees the same data.
+    """
+    if make_url(url).get_backend_name() != "sqlite":
+        if "poolclass" not in kwargs:
+            kwargs.setdefault("pool_size", settings.db_pool_size)
+            kwargs.setdefault("max_overflow", settings.db_max_overflow)
+        return create_engine(url, **kwargs)
+    kwargs.setdefault("connect_args", {"check_same_thread": False})
+    if is_in_memory(url):
+        kwargs.setdefault("poolclass", StaticPool)
+    eng = create_engine(url, **kwargs)
+    event.listen(eng, "connect", _enable_sqlite_foreign_keys)
+    return eng
+
+
+def upsert(bind: Session | Connection, model):
+    """INSERT … ON CONFLICT construct for the database behind a session or connection.
+
+    PostgreSQL and SQLite share the on_conflict_do_update/do_nothing API,
+    so callers build the statement the same way on either.
+    """
+    dialect = bind.get_bind().dialect if isinstance(bind, Session) else bind.dialect
+    return (sqlite_insert if dialect.name == "sqlite" else pg_insert)(model)
+
+
+engine = create_db_engine(settings.database_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Read-only traffic goes to the replica when one is configured, otherwise to the primary
+read_engine = create_db_engine(settings.read_database_url) if settings.read_database_url else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Set on responses to writes; while present, that client's reads go to the primary
+PRIMARY_PIN_COOKIE = "rangers_primary_until"
+
 
 class Base(DeclarativeBase):
     pass
@@ -19,3 +78,62 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _pinned_to_primary(request: Request) -> bool:
+    try:
+        return float(request.cookies.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def get_read_db(request: Request):
+    """FastAPI dependency for read-only endpoints — yields a session on the read replica.
+
+    Falls back to the primary when no replica is configured, or when the
+    client wrote recently (PRIMARY_PIN_COOKIE) and the replica may not have
+    caught up yet.  Never write through this session.
+    """
+    factory = SessionLocal if _pinned_to_primary(request) else ReadSessionLocal
+    db = factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class PrimaryPinMiddleware:
+    """Pin a client to the primary for a few seconds after each successful write.
+
+    Gives read-your-writes consistency on top of asynchronous replication:
+    the GET that follows a POST/PATCH/DELETE sees its own change.  A no-op
+    when no read replica is configured.
+    """
+
+    _WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in self._WRITE_METHODS
+            or not settings.read_database_url
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                pin_seconds = settings.read_after_write_pin_seconds
+                cookie = (
+                    f"{PRIMARY_PIN_COOKIE}={time.time() + pin_seconds:.3f}; "
+                    f"Max-Age={pin_seconds}; Path=/api; HttpOnly; SameSite=Lax"
+                )
+                if Headers(scope=scope).get("x-forwarded-proto", scope.get("scheme")) == "https":
+                    cookie += "; Secure"
+                MutableHeaders(scope=message).append("set-cookie", cookie)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,46 @@
+"""Deck derivation shared by the ranger and session endpoints.
+
+A ranger's deck is never stored: it is the starting deck (each selected
+card ×2; the role card starts in play, not in the deck) adjusted by every
+non-reverted trade (−1 original, +1 reward).  Cards are resolved against
+the cached card library (app.reference_cache), so no card rows are queried.
+"""
+
+from collections import Counter
+
+from app.models.ranger import Ranger
+from app.schemas.ranger import CardRef, DeckEntry
+from app.tracing import traced
+
+
+def starting_deck(ranger) -> Counter:
+    """card id → quantity before any trade."""
+    deck: Counter = Counter()
+    for cid in ranger.personality_card_ids:
+        deck[cid] += 2
+    for cid in ranger.background_card_ids:
+        deck[cid] += 2
+    for cid in ranger.specialty_card_ids:
+        deck[cid] += 2
+    deck[ranger.outside_interest_card_id] += 2
+    return deck
+
+
+def deck_entries(deck: Counter, cards: dict[int, CardRef]) -> list[DeckEntry]:
+    """Cards with a positive quantity, ordered by name."""
+    return [
+        DeckEntry(card=cards[cid], quantity=qty)
+        for cid, qty in sorted(deck.items(), key=lambda x: cards[x[0]].name)
+        if qty > 0
+    ]
+
+
+@traced("decks")
+def current_decklist(ranger: Ranger, cards: dict[int, CardRef]) -> list[DeckEntry]:
+    """The ranger's deck now, from its (loaded) trades relationship."""
+    deck = starting_deck(ranger)
+    for trade in ranger.trades:
+        if not trade.reverted:
+            deck[trade.original_card_id] -= 1
+            deck[trade.reward_card_id] += 1
+    return deck_entries(deck, cards)
@@ -1,13 +1,19 @@
-from fastapi import Depends, HTTPException
+import hmac
+
+from fastapi import Depends, Header, HTTPException
+from sqlalchemy import Select, or_, select
 from sqlalchemy.orm import Session
 
 from app.auth import get_current_user
+from app.config import settings
 from app.database import get_db
 from app.models.access import CampaignCollaborator
-from app.models.campaign import Campaign
+from app.models.campaign import Campaign, CampaignStatus
 from app.models.user import User
+from app.tracing import traced
 
 
+@traced("dependency")
 def require_campaign_write(
     campaign_id: int,
     current_user: User = Depends(get_current_user),
@@ -15,7 +21,7 @@ def require_campaign_write(
 ) -> Campaign:
     """Allow access if: campaign has no owner (legacy), user is owner, or user is collaborator."""
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     if campaign.owner_id is None:
@@ -35,6 +41,7 @@ def require_campaign_write(
     raise HTTPException(status_code=403, detail="Access denied")
 
 
+@traced("dependency")
 def require_campaign_owner(
     campaign_id: int,
     current_user: User = Depends(get_current_user),
@@ -42,10 +49,32 @@ def require_campaign_owner(
 ) -> Campaign:
     """Allow access only to the campaign owner."""
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     if campaign.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Access denied")
 
     return campaign
+
+
+def accessible_campaign_ids(user: User) -> Select:
+    """SELECT of campaign ids the user can see: legacy (no owner), owned, or shared with them."""
+    return select(Campaign.id).where(
+        or_(
+            Campaign.owner_id.is_(None),
+            Campaign.owner_id == user.id,
+            Campaign.id.in_(
+                select(CampaignCollaborator.campaign_id).where(CampaignCollaborator.user_id == user.id)
+            ),
+        ),
+        Campaign.status != CampaignStatus.deleting,
+    )
+
+
+def require_admin(x_admin_token: str | None = Header(None)) -> None:
+    """Operator endpoints: require the X-Admin-Token header to match settings.admin_token."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
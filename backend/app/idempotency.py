@@ -0,0 +1,213 @@
+"""Idempotency-Key support for mutating API requests.
+
+A client that may retry a POST/PATCH/DELETE (flaky mobile connections)
+sends a unique `Idempotency-Key` header with it.  The first request with a
+given key claims a row in idempotency_keys, runs normally and stores its
+response.  Any later request with the same key and the same method, path
+and body gets the stored response back, marked with
+`Idempotent-Replayed: true`, without reaching the router.  A duplicate
+that arrives while the original is still running waits for it (up to
+settings.idempotency_wait_seconds, then 409).  Reusing a key for a
+different request is a 422.
+
+Keys are scoped to the authenticated user and expire after
+settings.idempotency_ttl_hours.  Server errors (5xx) are not stored, so
+the client can retry them with the same key.
+"""
+
+import asyncio
+import hashlib
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import orjson
+from sqlalchemy import and_, delete, or_, update
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.auth import bearer_subject
+from app.config import settings
+from app.database import get_db, upsert
+from app.models.idempotency import IdempotencyKey
+
+HEADER = "idempotency-key"
+_WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_POLL_INTERVAL = 0.05                   # seconds between checks while waiting on the original
+_ABANDONED_AFTER = timedelta(minutes=5)  # an in-flight claim this old belongs to a dead worker
+_PURGE_INTERVAL = 300                   # seconds between expired-row purges, per process
+
+_last_purge = 0.0
+
+
+@contextmanager
+def _session(app):
+    # Honour dependency overrides so the middleware shares the routers' database
+    dependency = app.dependency_overrides.get(get_db, get_db)
+    gen = dependency()
+    db = next(gen)
+    try:
+        yield db
+    finally:
+        gen.close()
+
+
+def _claim(app, owner: str, key: str, request_hash: str) -> IdempotencyKey | None:
+    """Claim the key for this request; returns None if claimed, else the existing row."""
+    global _last_purge
+    now = datetime.utcnow()
+    with _session(app) as db:
+        if time.monotonic() - _last_purge > _PURGE_INTERVAL:
+            _last_purge = time.monotonic()
+            db.execute(delete(IdempotencyKey).where(
+                IdempotencyKey.created_at < now - timedelta(hours=settings.idempotency_ttl_hours)
+            ))
+        # Expired, or claimed by a request that never finished: start over
+        db.execute(delete(IdempotencyKey).where(
+            IdempotencyKey.owner == owner,
+            IdempotencyKey.key == key,
+            or_(
+                IdempotencyKey.created_at < now - timedelta(hours=settings.idempotency_ttl_hours),
+                and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.created_at < now - _ABANDONED_AFTER),
+            ),
+        ))
+        claimed = db.execute(
+            upsert(db, IdempotencyKey)
+            .values(owner=owner, key=key, request_hash=request_hash, created_at=now)
+            .on_conflict_do_nothing()
+            .returning(IdempotencyKey.key)
+        ).first()
+        db.commit()
+        if claimed:
+            return None
+        existing = db.get(IdempotencyKey, (owner, key))
+        if existing is None:  # deleted between the insert and the read; let the caller retry
+            return IdempotencyKey(owner=owner, key=key, request_hash=request_hash)
+        db.expunge(existing)
+        return existing
+
+
+def _store(app, owner: str, key: str, status_code: int, content_type: str | None, body: bytes) -> None:
+    with _session(app) as db:
+        db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.owner == owner, IdempotencyKey.key == key)
+            .values(status_code=status_code, content_type=content_type, body=body)
+        )
+        db.commit()
+
+
+def _release(app, owner: str, key: str) -> None:
+    with _session(app) as db:
+        db.execute(delete(IdempotencyKey).where(IdempotencyKey.owner == owner, IdempotencyKey.key == key))
+        db.commit()
+
+
+def _request_hash(scope: Scope, body: bytes) -> str:
+    h = hashlib.sha256()
+    for part in (scope["method"].encode(), scope["path"].encode(), scope.get("query_string", b""), body):
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+async def _respond(send: Send, status: int, body: bytes, content_type: str | None, extra: list | None = None) -> None:
+    headers = [(b"content-length", str(len(body)).encode())]
+    if content_type:
+        headers.append((b"content-type", content_type.encode()))
+    await send({"type": "http.response.start", "status": status, "headers": headers + (extra or [])})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _error(send: Send, status: int, detail: str, extra: list | None = None) -> None:
+    await _respond(send, status, orjson.dumps({"detail": detail}), "application/json", extra)
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] not in _WRITE_METHODS
+            or not scope["path"].startswith("/api/")
+            or scope["path"].startswith("/api/auth/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        key = headers.get(HEADER)
+        owner = bearer_subject(headers.get("authorization"))
+        if not key or owner is None:
+            # No key, or unauthenticated (the router will reject it): nothing to deduplicate
+            await self.app(scope, receive, send)
+            return
+        if len(key) > 255:
+            await _error(send, 400, "Idempotency-Key must be at most 255 characters")
+            return
+
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        request_hash = _request_hash(scope, body)
+
+        app = scope["app"]
+        deadline = time.monotonic() + settings.idempotency_wait_seconds
+        while True:
+            existing = await run_in_threadpool(_claim, app, owner, key, request_hash)
+            if existing is None:
+                break
+            if existing.request_hash != request_hash:
+                await _error(send, 422, "Idempotency-Key was already used for a different request")
+                return
+            if existing.status_code is not None:
+                await _respond(
+                    send, existing.status_code, existing.body or b"", existing.content_type,
+                    [(b"idempotent-replayed", b"true")],
+                )
+                return
+            if time.monotonic() >= deadline:
+                await _error(send, 409, "A request with this Idempotency-Key is still in progress",
+                             [(b"retry-after", b"1")])
+                return
+            await asyncio.sleep(_POLL_INTERVAL)
+
+        body_sent = False
+
+        async def receive_body() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code: int | None = None
+        content_type: str | None = None
+        response_chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, content_type
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = Headers(raw=message["headers"]).get("content-type")
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_body, send_wrapper)
+        except BaseException:
+            await run_in_threadpool(_release, app, owner, key)
+            raise
+
+        if status_code is not None and status_code < 500:
+            await run_in_threadpool(_store, app, owner, key, status_code, content_type, b"".join(response_chunks))
+        else:
+            await run_in_threadpool(_release, app, owner, key)
@@ -0,0 +1,239 @@
+"""Postgres-backed background jobs.
+
+Heavy operations (campaign import, archive export, analytics rebuild,
+purging a very large deleted campaign) can be queued instead of running inside the request that asked for them:
+
+    job = jobs.enqueue(db, "import_campaign", payload, owner_id=user.id)
+
+enqueue() only adds the row; it is committed with the caller's
+transaction.  `python -m app.worker` (see app/worker.py) runs the queue.
+Each worker claims one job at a time with SELECT … FOR UPDATE SKIP
+LOCKED, so several workers never pick the same job and no broker beyond
+Postgres is needed.  A handler that raises is retried with exponential
+backoff until max_attempts; raising JobFailed fails the job at once.
+While a handler runs, its worker renews the lease (locked_at) every
+settings.job_lease_seconds / 3; a job whose lease has lapsed belongs to a
+dead worker and is claimed again.  Each claim increments attempts, which
+doubles as the claim token: a worker records success or failure only if
+the job is still running under its own claim, so a worker that was
+presumed dead and finishes late has its writes rolled back instead of
+overwriting the new owner's.  Clients poll GET /api/jobs/{id}.
+"""
+
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Callable
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import analytics
+from app.archive import ArchiveError, export_campaign, import_campaign
+from app.config import settings
+from app.database import SessionLocal
+from app.models.campaign import Campaign, NotableEvent
+from app.models.job import Job, JobStatus
+from app.models.ranger import Ranger, RangerTrade
+from app.schemas.import_export import ImportCampaign
+
+HANDLERS: dict[str, Callable[[Session, Job], dict | None]] = {}
+
+
+class JobFailed(Exception):
+    """Raised by a handler for errors that retrying cannot fix."""
+
+
+def handler(kind: str):
+    """Register a function as the handler for jobs of `kind`.
+
+    Handlers run in their own session; the job is marked succeeded (with the
+    returned dict as its result) in the same commit as the handler's writes.
+    """
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def enqueue(db: Session, kind: str, payload: dict | None = None, owner_id: int | None = None) -> Job:
+    if kind not in HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        status=JobStatus.queued,
+        max_attempts=settings.job_max_attempts,
+        owner_id=owner_id,
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def backoff(attempts: int) -> timedelta:
+    """Delay before retry number `attempts` (1-based): base × 2^(attempts-1), capped."""
+    seconds = settings.job_backoff_seconds * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.job_backoff_max_seconds))
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def _claim(session_factory: sessionmaker) -> tuple[int, int] | None:
+    """Mark the next runnable job as running; returns (job id, claim token) or None if the queue is idle."""
+    now = datetime.utcnow()
+    with session_factory() as db:
+        job = db.execute(
+            select(Job)
+            .where(or_(
+                and_(Job.status == JobStatus.queued, Job.run_after <= now),
+                and_(Job.status == JobStatus.running,
+                     Job.locked_at < now - timedelta(seconds=settings.job_lease_seconds)),
+            ))
+            .order_by(Job.run_after, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).scalar_one_or_none()
+        if job is None:
+            return None
+        job.status = JobStatus.running
+        job.locked_at = now
+        job.attempts += 1
+        db.commit()
+        return job.id, job.attempts
+
+
+def _owned(job_id: int, claim: int):
+    """UPDATE of the job that matches only while it is still running under `claim`."""
+    return update(Job).where(Job.id == job_id, Job.attempts == claim, Job.status == JobStatus.running)
+
+
+@contextmanager
+def _renewing_lease(session_factory: sessionmaker, job_id: int, claim: int):
+    """Keep the claim's lease fresh from a background thread while the block runs."""
+    stop = threading.Event()
+
+    def renew():
+        while not stop.wait(settings.job_lease_seconds / 3):
+            try:
+                with session_factory() as db:
+                    db.execute(_owned(job_id, claim).values(locked_at=datetime.utcnow()))
+                    db.commit()
+            except Exception as exc:
+                print(f"[jobs] Lease renewal for #{job_id} failed: {exc}")
+
+    thread = threading.Thread(target=renew, name=f"job-{job_id}-lease", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def _fail(session_factory: sessionmaker, job_id: int, claim: int, error: str, permanent: bool) -> None:
+    with session_factory() as db:
+        job = db.get(Job, job_id)
+        now = datetime.utcnow()
+        if permanent or job.attempts >= job.max_attempts:
+            values = dict(status=JobStatus.failed, finished_at=now)
+        else:
+            values = dict(status=JobStatus.queued, run_after=now + backoff(job.attempts))
+        if db.execute(_owned(job_id, claim).values(error=error, locked_at=None, **values)).rowcount:
+            db.commit()
+        else:
+            db.rollback()
+            print(f"[jobs] #{job_id} was claimed again; not recording this attempt's failure")
+
+
+def run_next(session_factory: sessionmaker = SessionLocal) -> bool:
+    """Claim and run one job.  Returns False when there was nothing to run."""
+    claimed = _claim(session_factory)
+    if claimed is None:
+        return False
+    job_id, claim = claimed
+
+    with session_factory() as db:
+        job = db.get(Job, job_id)
+        kind = job.kind
+        fn = HANDLERS.get(kind)
+        try:
+            with _renewing_lease(session_factory, job_id, claim):
+                if fn is None:
+                    raise JobFailed(f"No handler for job kind '{kind}'")
+                result = fn(db, job)
+        except JobFailed as exc:
+            db.rollback()
+            print(f"[jobs] {kind} #{job_id} failed: {exc}")
+            _fail(session_factory, job_id, claim, str(exc), permanent=True)
+            return True
+        except Exception as exc:
+            db.rollback()
+            print(f"[jobs] {kind} #{job_id} attempt errored:")
+            traceback.print_exc()
+            _fail(session_factory, job_id, claim, f"{type(exc).__name__}: {exc}", permanent=False)
+            return True
+
+        finished = db.execute(_owned(job_id, claim).values(
+            status=JobStatus.succeeded, result=result, error=None, locked_at=None, finished_at=datetime.utcnow(),
+        ))
+        if not finished.rowcount:
+            # Presumed dead and claimed again: the new owner's run is the one that counts
+            db.rollback()
+            print(f"[jobs] {kind} #{job_id} was claimed again; discarding this attempt's result")
+            return True
+        db.commit()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Handlers
+# ---------------------------------------------------------------------------
+
+@handler("import_campaign")
+def _import_campaign(db: Session, job: Job) -> dict:
+    data = ImportCampaign.model_validate(job.payload["campaign"])
+    try:
+        campaign = import_campaign(db, data, owner_id=job.owner_id)
+    except ArchiveError as exc:
+        raise JobFailed(str(exc)) from exc
+    return {"campaign_id": campaign.id}
+
+
+@handler("export_campaign")
+def _export_campaign(db: Session, job: Job) -> dict:
+    campaign = db.get(Campaign, job.payload["campaign_id"])
+    if campaign is None:
+        raise JobFailed("Campaign not found")
+    return export_campaign(db, campaign)
+
+
+@handler("rebuild_analytics")
+def _rebuild_analytics(db: Session, job: Job) -> None:
+    analytics.rebuild(db)
+
+
+@handler("purge_campaign")
+def _purge_campaign(db: Session, job: Job) -> None:
+    """Delete a hidden ('deleting') campaign: trades and events in batches, then the rest by cascade.
+
+    Each batch is committed on its own, so no single transaction locks the
+    whole campaign; a retried job continues where the last attempt stopped.
+    """
+    campaign_id = job.payload["campaign_id"]
+    batches = (
+        (RangerTrade, select(RangerTrade.id).join(Ranger, RangerTrade.ranger_id == Ranger.id)
+            .where(Ranger.campaign_id == campaign_id)),
+        (NotableEvent, select(NotableEvent.id).where(NotableEvent.campaign_id == campaign_id)),
+    )
+    for model, ids in batches:
+        while db.execute(
+            delete(model)
+            .where(model.id.in_(ids.limit(settings.purge_batch_size)))
+            .execution_options(synchronize_session=False)
+        ).rowcount:
+            db.commit()
+    db.execute(delete(Campaign).where(Campaign.id == campaign_id))
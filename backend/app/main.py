@@ -3,23 +3,30 @@ from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import slow_queries
+from app.admission import AdmissionMiddleware
 from app.auth import get_current_user
+from app.compression import CompressionMiddleware
 from app.config import settings
-from app.database import engine, Base, SessionLocal
-import app.models  # noqa: F401 — registers all models with Base
-from app.seed import seed_reference_data
-from app.routers import access, auth, campaigns, cards, days, events, import_export, missions, rangers, rewards, storylines
+from app.database import PrimaryPinMiddleware
+from app.idempotency import IdempotencyMiddleware
+from app.metrics import MetricsMiddleware, metrics_response
+from app.profiling import ProfilingMiddleware
+from app.routers import (
+    access, admin, analytics, auth, campaigns, cards, days, events, import_export, jobs, missions, rangers, reference,
+    rewards, search, session, storylines, timeline,
+)
+from app.startup import prepare_database, warm_reference_cache
+from app.tracing import TracingMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
-    try:
-        seed_reference_data(db)
-    finally:
-        db.close()
+    if settings.run_startup_tasks:
+        prepare_database()
+    warm_reference_cache()
     yield
+    slow_queries.flush()
 
 
 app = FastAPI(
@@ -27,17 +34,29 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(IdempotencyMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(PrimaryPinMiddleware)
+app.add_middleware(AdmissionMiddleware)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(ProfilingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PATCH", "DELETE"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "Idempotency-Key", "X-Admin-Token", "X-Profile"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed", "X-Trace-Id", "X-Profile-Id"],
 )
 
 # Auth router — no authentication required (login/register are public)
 app.include_router(auth.router)
 
+# Operator endpoints — authenticated by X-Admin-Token instead of a user JWT
+app.include_router(admin.router)
+
 # All other routers require a valid JWT
 _auth = [Depends(get_current_user)]
 app.include_router(storylines.router, dependencies=_auth)
@@ -46,12 +65,23 @@ app.include_router(days.router, dependencies=_auth)
 app.include_router(rangers.router, dependencies=_auth)
 app.include_router(missions.router, dependencies=_auth)
 app.include_router(events.router, dependencies=_auth)
+app.include_router(timeline.router, dependencies=_auth)
+app.include_router(session.router, dependencies=_auth)
 app.include_router(rewards.router, dependencies=_auth)
 app.include_router(cards.router, dependencies=_auth)
+app.include_router(reference.router, dependencies=_auth)
 app.include_router(import_export.router, dependencies=_auth)
 app.include_router(access.router, dependencies=_auth)
+app.include_router(analytics.router, dependencies=_auth)
+app.include_router(search.router, dependencies=_auth)
+app.include_router(jobs.router, dependencies=_auth)
 
 
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
+
+
+@app.get("/api/metrics", include_in_schema=False)
+def metrics():
+    return metrics_response()
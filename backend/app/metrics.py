@@ -0,0 +1,215 @@
+"""Prometheus metrics, served at GET /api/metrics.
+
+Request metrics are labelled by route template (e.g.
+/api/campaigns/{campaign_id}/rangers), never by raw path, so cardinality is
+bounded by the number of routes; requests that match no route share the
+label "unmatched".
+
+Under gunicorn, gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR before the
+app is imported; every worker then writes its samples to mmap files there
+and a scrape of any worker aggregates all of them (gauges as noted by
+their multiprocess_mode).  Without it the process's own registry is served.
+"""
+
+import os
+import time
+
+from anyio.to_thread import current_default_thread_limiter
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event, func, select
+from sqlalchemy.pool import Pool
+from starlette.responses import Response
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.models.job import Job, JobStatus
+
+# ---- Admission control (app/admission.py) ----
+
+ADMISSION_ADMITTED = Counter(
+    "admission_admitted_total", "Requests admitted by admission control", ["group"]
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total",
+    "Requests rejected by admission control (reason: rate_limited | overloaded)",
+    ["group", "reason"],
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests", "API requests currently being handled by this process",
+    multiprocess_mode="livesum",
+)
+
+# ---- HTTP ----
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "API request latency by route template", ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter("http_requests_total", "API responses by route template and status", ["method", "route", "status"])
+IN_FLIGHT = Gauge("http_requests_in_flight", "API requests being handled", multiprocess_mode="livesum")
+
+# ---- Worker threadpool (sync endpoints and dependencies) ----
+
+THREADPOOL_BUSY = Gauge(
+    "threadpool_busy_threads", "Threadpool threads in use, sampled at each request start",
+    multiprocess_mode="livesum",
+)
+THREADPOOL_SIZE = Gauge("threadpool_max_threads", "Threadpool capacity", multiprocess_mode="livesum")
+
+# ---- Database connection pool ----
+
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections", "Connections currently checked out of the pool", multiprocess_mode="livesum"
+)
+POOL_CHECKOUTS = Counter("db_pool_checkouts_total", "Connection checkouts from the pool")
+POOL_CONNECTS = Counter("db_pool_connections_opened_total", "New database connections opened by the pool")
+POOL_HOLD = Histogram(
+    "db_pool_checkout_duration_seconds", "How long a connection stays checked out",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 10),
+)
+
+# ---- In-process caches (app/reference_cache.py) ----
+
+CACHE_LOOKUPS = Counter("cache_lookups_total", "In-process cache lookups (result: hit | miss)", ["cache", "result"])
+
+
+# ---------------------------------------------------------------------------
+# Pool instrumentation — every engine's pool
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Pool, "connect")
+def _on_connect(dbapi_connection, connection_record):
+    POOL_CONNECTS.inc()
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_record.info["checked_out_at"] = time.perf_counter()
+    POOL_CHECKOUTS.inc()
+    POOL_CHECKED_OUT.inc()
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record):
+    started = connection_record.info.pop("checked_out_at", None)
+    if started is not None:
+        POOL_CHECKED_OUT.dec()
+        POOL_HOLD.observe(time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# Request instrumentation
+# ---------------------------------------------------------------------------
+
+def route_template(scope: Scope) -> str:
+    """Route path template for the request ("unmatched" if none).
+
+    Routed requests carry the matched route in scope; requests answered by a
+    middleware before routing (429, 503, idempotent replays) are matched here.
+    """
+    route = scope.get("route")
+    if route is None and "app" in scope:
+        for candidate in scope["app"].router.routes:
+            if candidate.matches(scope)[0] == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", "unmatched")
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        limiter = current_default_thread_limiter()
+        THREADPOOL_BUSY.set(limiter.borrowed_tokens)
+        THREADPOOL_SIZE.set(limiter.total_tokens)
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            route = route_template(scope)
+            REQUEST_DURATION.labels(scope["method"], route).observe(elapsed)
+            REQUESTS.labels(scope["method"], route, str(status)).inc()
+
+
+# ---------------------------------------------------------------------------
+# Exposition
+# ---------------------------------------------------------------------------
+
+class _AdmissionLimitsCollector:
+    """The configured admission limits, which apply per worker process."""
+
+    def collect(self):
+        from app.admission import max_in_flight   # app.admission imports this module
+
+        rate = GaugeMetricFamily(
+            "admission_rate_limit_tokens_per_second", "Configured token refill rate per caller", labels=["group"]
+        )
+        burst = GaugeMetricFamily("admission_rate_limit_burst", "Configured bucket size per caller", labels=["group"])
+        for group, limit in sorted(settings.rate_limits.items()):
+            rate.add_metric([group], limit.rate)
+            burst.add_metric([group], limit.burst)
+        yield rate
+        yield burst
+        yield GaugeMetricFamily(
+            "admission_max_in_flight_requests", "Configured in-flight request cap", value=max_in_flight()
+        )
+
+
+class _JobQueueCollector:
+    """Job queue depth, read from the jobs table at scrape time.
+
+    If the database cannot be queried the family is left out, so the rest of
+    the scrape still succeeds.
+    """
+
+    def collect(self):
+        from app import database   # looked up per scrape so tests can rebind SessionLocal
+
+        depth = GaugeMetricFamily("jobs_queue_depth", "Background jobs waiting or running", labels=["status"])
+        try:
+            with database.SessionLocal() as db:
+                counts = dict(db.execute(
+                    select(Job.status, func.count())
+                    .where(Job.status.in_([JobStatus.queued, JobStatus.running]))
+                    .group_by(Job.status)
+                ).all())
+        except Exception as exc:
+            print(f"[metrics] jobs_queue_depth skipped: {exc!r}")
+            return
+        for status in (JobStatus.queued, JobStatus.running):
+            depth.add_metric([status.value], counts.get(status.value, 0))
+        yield depth
+
+
+def metrics_response() -> Response:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    scraped = CollectorRegistry()
+    scraped.register(_AdmissionLimitsCollector())
+    scraped.register(_JobQueueCollector())
+    return Response(generate_latest(registry) + generate_latest(scraped), media_type=CONTENT_TYPE_LATEST)
@@ -13,3 +13,8 @@ from app.models.campaign import (  # noqa: F401
 from app.models.ranger import Ranger, RangerTrade  # noqa: F401
 from app.models.user import User  # noqa: F401
 from app.models.access import CampaignCollaborator  # noqa: F401
+from app.models.analytics import AnalyticsCounter, CardPickStat, TradePairStat  # noqa: F401
+from app.models.idempotency import IdempotencyKey  # noqa: F401
+from app.models.job import Job  # noqa: F401
+from app.models.reference import ReferenceDataState  # noqa: F401
+from app.models.slow_query import SlowQuery  # noqa: F401
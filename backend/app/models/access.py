@@ -10,7 +10,7 @@ class CampaignCollaborator(Base):
     __tablename__ = "campaign_collaborators"
 
     id = Column(Integer, primary_key=True)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     added_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
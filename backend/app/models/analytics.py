@@ -0,0 +1,50 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from app.database import Base
+
+
+class CardPickStat(Base):
+    """Server-wide count of rangers holding a card in a given deck slot.
+
+    Maintained incrementally by app.analytics as rangers are created,
+    imported and deleted — never recomputed at request time.
+    slot is one of: personality | background | specialty | role | outside_interest
+    """
+
+    __tablename__ = "card_pick_stats"
+
+    card_id = Column(Integer, ForeignKey("cards.id"), primary_key=True)
+    slot = Column(String, primary_key=True)
+    picks = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_card_pick_stats_slot_picks", "slot", "picks"),)
+
+
+class TradePairStat(Base):
+    """Server-wide count of non-reverted trades for each (original → reward) card pair."""
+
+    __tablename__ = "trade_pair_stats"
+
+    original_card_id = Column(Integer, ForeignKey("cards.id"), primary_key=True)
+    reward_card_id = Column(Integer, ForeignKey("cards.id"), primary_key=True)
+    trades = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_trade_pair_stats_trades", "trades"),)
+
+
+class AnalyticsCounter(Base):
+    """Named server-wide totals (rangers, trades, days_completed).
+
+    Each total is split over COUNTER_SHARDS rows and summed on read, so
+    concurrent writes bump different rows instead of queueing on one lock.
+    A shard's value may be negative; only the sum is meaningful.
+    """
+
+    __tablename__ = "analytics_counters"
+
+    name = Column(String, primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    value = Column(Integer, nullable=False, default=0)
+
+
+COUNTER_SHARDS = 16
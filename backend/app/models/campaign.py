@@ -1,16 +1,19 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 
 from app.database import Base
+from app.models.types import POSTGRESQL_ONLY
 
 
 class CampaignStatus(str, enum.Enum):
     active = "active"
     completed = "completed"
     archived = "archived"
+    deleting = "deleting"   # hidden; being purged by a background job (see app.jobs)
 
 
 class DayStatus(str, enum.Enum):
@@ -31,12 +34,21 @@ class Campaign(Base):
 
     storyline = relationship("Storyline", back_populates="campaigns")
     owner = relationship("User", foreign_keys=[owner_id])
-    collaborators = relationship("CampaignCollaborator", back_populates="campaign", cascade="all, delete-orphan")
-    days = relationship("CampaignDay", back_populates="campaign", order_by="CampaignDay.day_number", cascade="all, delete-orphan")
-    rangers = relationship("Ranger", back_populates="campaign", cascade="all, delete-orphan")
-    rewards = relationship("CampaignReward", back_populates="campaign", cascade="all, delete-orphan")
-    missions = relationship("Mission", back_populates="campaign", cascade="all, delete-orphan")
-    notable_events = relationship("NotableEvent", back_populates="campaign", cascade="all, delete-orphan")
+    # Children are removed by ON DELETE CASCADE; passive_deletes keeps the ORM
+    # from loading and deleting them row by row.
+    collaborators = relationship(
+        "CampaignCollaborator", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True,
+    )
+    days = relationship(
+        "CampaignDay", back_populates="campaign", order_by="CampaignDay.day_number",
+        cascade="all, delete-orphan", passive_deletes=True,
+    )
+    rangers = relationship("Ranger", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True)
+    rewards = relationship("CampaignReward", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True)
+    missions = relationship("Mission", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True)
+    notable_events = relationship(
+        "NotableEvent", back_populates="campaign", cascade="all, delete-orphan", passive_deletes=True,
+    )
 
 
 class CampaignReward(Base):
@@ -49,7 +61,7 @@ class CampaignReward(Base):
     __tablename__ = "campaign_rewards"
 
     id = Column(Integer, primary_key=True)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
     card_name = Column(String, nullable=True)
     card_id = Column(Integer, ForeignKey("cards.id"), nullable=True)
     quantity = Column(Integer, nullable=False, default=1)
@@ -68,7 +80,7 @@ class CampaignDay(Base):
     __tablename__ = "campaign_days"
 
     id = Column(Integer, primary_key=True)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
     day_number = Column(Integer, nullable=False)
     weather = Column(String, nullable=False)
     status = Column(String, nullable=False, default=DayStatus.upcoming)
@@ -91,13 +103,25 @@ class Mission(Base):
     __tablename__ = "missions"
 
     id = Column(Integer, primary_key=True)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
-    day_started_id = Column(Integer, ForeignKey("campaign_days.id"), nullable=True)
-    day_completed_id = Column(Integer, ForeignKey("campaign_days.id"), nullable=True)
+    day_started_id = Column(Integer, ForeignKey("campaign_days.id", ondelete="SET NULL"), nullable=True)
+    day_completed_id = Column(Integer, ForeignKey("campaign_days.id", ondelete="SET NULL"), nullable=True)
     progress = Column(Integer, nullable=False, default=0)
     max_progress = Column(Integer, nullable=False, default=0)
 
+    # Full-text search over the mission name (generated by Postgres; never loaded by default).
+    # PostgreSQL only: SQLite schemas omit the column and search falls back to LIKE.
+    search_vector = deferred(Column(
+        TSVECTOR, Computed("to_tsvector('english', name)", persisted=True), info={POSTGRESQL_ONLY: True},
+    ))
+
+    __table_args__ = (
+        Index("ix_missions_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+    # Don't fetch the generated column back on INSERT (it doesn't exist on SQLite)
+    __mapper_args__ = {"eager_defaults": False}
+
     campaign = relationship("Campaign", back_populates="missions")
     day_started = relationship("CampaignDay", foreign_keys=[day_started_id], back_populates="missions_started")
     day_completed = relationship("CampaignDay", foreign_keys=[day_completed_id], back_populates="missions_completed")
@@ -107,10 +131,23 @@ class NotableEvent(Base):
     __tablename__ = "notable_events"
 
     id = Column(Integer, primary_key=True)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
-    day_id = Column(Integer, ForeignKey("campaign_days.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
+    day_id = Column(Integer, ForeignKey("campaign_days.id", ondelete="CASCADE"), nullable=False)
     text = Column(String, nullable=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    # Full-text search over the event text (generated by Postgres; never loaded by default).
+    # PostgreSQL only, like Mission.search_vector.
+    search_vector = deferred(Column(
+        TSVECTOR, Computed("to_tsvector('english', text)", persisted=True), info={POSTGRESQL_ONLY: True},
+    ))
+
+    __table_args__ = (
+        Index("ix_notable_events_search_vector", "search_vector", postgresql_using="gin").ddl_if(dialect="postgresql"),
+        # Day-filtered, chronological listing (GET /events)
+        Index("ix_notable_events_campaign_day_created", "campaign_id", "day_id", "created_at", "id"),
+    )
+    __mapper_args__ = {"eager_defaults": False}
+
     campaign = relationship("Campaign", back_populates="notable_events")
     day = relationship("CampaignDay", back_populates="notable_events")
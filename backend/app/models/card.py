@@ -1,9 +1,9 @@
 import enum
 
 from sqlalchemy import Boolean, Column, Integer, String
-from sqlalchemy.dialects.postgresql import JSONB
 
 from app.database import Base
+from app.models.types import JSONDocument
 
 
 class CardType(str, enum.Enum):
@@ -28,7 +28,7 @@ class Card(Base):
     cost = Column(Integer, nullable=True)        # 0–3; NULL = variable (X cost)
 
     # Type tags parsed from printed card text (e.g. ["Gear", "Tool", "Tech"])
-    tags = Column(JSONB, nullable=False, default=list)
+    tags = Column(JSONDocument, nullable=False, default=list)
 
     # Expert cards cannot be chosen as outside interest
     is_expert = Column(Boolean, nullable=False, default=False)
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    """Outcome of a mutating request sent with an Idempotency-Key header.
+
+    Written by app.idempotency.IdempotencyMiddleware.  status_code is NULL
+    while the first request is still in flight; once it finishes the
+    response is stored so retries with the same key are answered from here.
+    Rows expire after settings.idempotency_ttl_hours.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    owner = Column(String, primary_key=True)      # JWT subject (username)
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)   # sha256 of method, path and body
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String, nullable=True)
+    body = Column(LargeBinary, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (Index("ix_idempotency_keys_created_at", "created_at"),)
@@ -0,0 +1,43 @@
+import enum
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+
+from app.database import Base
+from app.models.types import JSONDocument
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
+
+class Job(Base):
+    """A unit of background work, run by app.worker (see app.jobs).
+
+    Workers claim queued rows with SELECT … FOR UPDATE SKIP LOCKED, so any
+    number of them can share the table without a broker.  A failed attempt
+    goes back to 'queued' with run_after pushed out (exponential backoff)
+    until max_attempts is reached.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)              # key in app.jobs.HANDLERS
+    payload = Column(JSONDocument, nullable=False, default=dict)
+    status = Column(String, nullable=False, default=JobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = Column(DateTime, nullable=True)        # lease, renewed while running; a stale lock means a dead worker
+    result = Column(JSONDocument, nullable=True)
+    error = Column(Text, nullable=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=True)   # None = system job
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Claim query: oldest runnable job first
+    __table_args__ = (Index("ix_jobs_status_run_after", "status", "run_after"),)
@@ -1,16 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
+from app.models.types import JSONDocument
 
 
 class Ranger(Base):
     """A player character belonging to a campaign.
 
-    Deck foundation fields store lists of card IDs (JSONB arrays).
+    Deck foundation fields store lists of card IDs (JSON arrays; JSONB on PostgreSQL).
     The current decklist is derived at read time:
         starting deck  −  traded-away originals  +  received rewards (non-reverted trades)
     """
@@ -18,7 +18,7 @@ class Ranger(Base):
     __tablename__ = "rangers"
 
     id = Column(Integer, primary_key=True)
-    campaign_id = Column(Integer, ForeignKey("campaigns.id"), nullable=False)
+    campaign_id = Column(Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=False)
     name = Column(String, nullable=False)
 
     # Aspect card (chosen first; determines the four stat ratings)
@@ -30,15 +30,15 @@ class Ranger(Base):
 
     # Deck foundation — set at creation, never changed
     # Each personality card is included ×2 in the deck (4 cards → 8 in deck)
-    personality_card_ids = Column(JSONB, nullable=False)   # [id, id, id, id]
+    personality_card_ids = Column(JSONDocument, nullable=False)  # [id, id, id, id]
 
     # Background set name and the 5 chosen cards (×2 each → 10 in deck)
     background_set = Column(String, nullable=False)        # Artisan | Forager | Shepherd | Traveler
-    background_card_ids = Column(JSONB, nullable=False)    # [id, id, id, id, id]
+    background_card_ids = Column(JSONDocument, nullable=False)   # [id, id, id, id, id]
 
     # Specialty set name and the 5 chosen cards (×2 each → 10 in deck)
     specialty_set = Column(String, nullable=False)         # Artificer | Conciliator | Explorer | Shaper
-    specialty_card_ids = Column(JSONB, nullable=False)     # [id, id, id, id, id]
+    specialty_card_ids = Column(JSONDocument, nullable=False)    # [id, id, id, id, id]
 
     # Role card starts in play, NOT in deck
     role_card_id = Column(Integer, ForeignKey("cards.id"), nullable=False)
@@ -51,7 +51,7 @@ class Ranger(Base):
     campaign = relationship("Campaign", back_populates="rangers")
     role_card = relationship("Card", foreign_keys=[role_card_id])
     outside_interest_card = relationship("Card", foreign_keys=[outside_interest_card_id])
-    trades = relationship("RangerTrade", back_populates="ranger", cascade="all, delete-orphan")
+    trades = relationship("RangerTrade", back_populates="ranger", cascade="all, delete-orphan", passive_deletes=True)
 
 
 class RangerTrade(Base):
@@ -66,13 +66,16 @@ class RangerTrade(Base):
     __tablename__ = "ranger_trades"
 
     id = Column(Integer, primary_key=True)
-    ranger_id = Column(Integer, ForeignKey("rangers.id"), nullable=False)
-    day_id = Column(Integer, ForeignKey("campaign_days.id"), nullable=False)
+    ranger_id = Column(Integer, ForeignKey("rangers.id", ondelete="CASCADE"), nullable=False)
+    day_id = Column(Integer, ForeignKey("campaign_days.id", ondelete="CASCADE"), nullable=False)
     original_card_id = Column(Integer, ForeignKey("cards.id"), nullable=False)
     reward_card_id = Column(Integer, ForeignKey("cards.id"), nullable=False)
     reverted = Column(Boolean, nullable=False, default=False)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
+    # Deck history: a ranger's trades up to / on a given day
+    __table_args__ = (Index("ix_ranger_trades_ranger_day", "ranger_id", "day_id"),)
+
     ranger = relationship("Ranger", back_populates="trades")
     day = relationship("CampaignDay", back_populates="trades")
     original_card = relationship("Card", foreign_keys=[original_card_id])
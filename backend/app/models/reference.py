@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String
+
+from app.database import Base
+
+
+class ReferenceDataState(Base):
+    """Content hash of the reference data last applied by app.seed.seed_reference_data.
+
+    Lets every boot after the first skip the sync with one primary-key lookup.
+    """
+
+    __tablename__ = "reference_data_state"
+
+    name = Column(String, primary_key=True)        # "seed"
+    content_hash = Column(String(64), nullable=False)
+    applied_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+
+from app.database import Base
+
+
+class SlowQuery(Base):
+    """Statements slower than settings.slow_query_ms, grouped by fingerprint.
+
+    Maintained by app.slow_queries; one row per normalized statement shape
+    (literals, parameters and IN-list lengths stripped), accumulated across
+    all processes.
+    """
+
+    __tablename__ = "slow_queries"
+
+    fingerprint = Column(String(16), primary_key=True)
+    statement = Column(Text, nullable=False)          # normalized
+    calls = Column(Integer, nullable=False, default=0)
+    total_ms = Column(Float, nullable=False, default=0)
+    max_ms = Column(Float, nullable=False, default=0)
+    first_seen = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_seen = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_plan = Column(Text, nullable=True)           # EXPLAIN output of the latest slow run, if captured
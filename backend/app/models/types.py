@@ -0,0 +1,24 @@
+"""Column types shared by models that must work on both PostgreSQL and SQLite.
+
+PostgreSQL is the production database; SQLite backs the test suite and
+single-user self-hosting (see app.database.create_db_engine).
+"""
+
+from sqlalchemy import JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+
+# JSONB on PostgreSQL, JSON text elsewhere
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+# Column.info flag for columns that exist only in PostgreSQL schemas (generated
+# tsvectors).  Such columns must be deferred and only queried on PostgreSQL.
+POSTGRESQL_ONLY = "postgresql_only"
+
+
+@compiles(CreateColumn, "sqlite")
+def _skip_postgresql_only_columns(element, compiler, **kw):
+    if element.element.info.get(POSTGRESQL_ONLY):
+        return None
+    return compiler.visit_create_column(element, **kw)
@@ -0,0 +1,151 @@
+"""Opt-in sampling profiler for single requests.
+
+An operator profiles one request by sending it with the admin token and a
+profile flag:
+
+    curl -H "X-Admin-Token: $ADMIN_TOKEN" -H "X-Profile: 1" .../api/campaigns/7/rangers
+    (or ?profile=1 instead of the X-Profile header)
+
+While that request runs, a sampler thread records the Python stack of the
+event-loop thread and of every busy threadpool thread (where sync
+endpoints and dependencies run) every settings.profile_interval_ms.  The
+stacks are written in collapsed ("folded") format, one `frame;frame;…
+count` line per distinct stack, which flamegraph.pl, inferno and
+speedscope render directly.  The file name is returned in X-Profile-Id,
+and profiles are listed and downloaded at /api/admin/profiles.
+
+Sampling is process-wide: other requests handled by the same worker at the
+same time show up too, so profile on a quiet worker for clean results.
+Requests without the flag pay only for one header lookup.
+"""
+
+import hmac
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.metrics import route_template
+
+PROFILE_SUFFIX = ".folded"
+_SAFE = re.compile(r"[^A-Za-z0-9]+")
+_WORKER_THREAD = "AnyIO worker thread"
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{code.co_qualname}:{code.co_firstlineno}"
+
+
+def _is_idle(frame) -> bool:
+    # A threadpool worker waiting for work: Queue.get → Condition.wait
+    caller = frame.f_back
+    return (
+        frame.f_code.co_name == "wait" and frame.f_code.co_filename.endswith("threading.py")
+        and caller is not None and caller.f_code.co_name == "get" and caller.f_code.co_filename.endswith("queue.py")
+    )
+
+
+class Sampler(threading.Thread):
+    """Collects stack samples of the given loop thread and busy worker threads until stopped."""
+
+    def __init__(self, loop_thread: int, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.loop_thread = loop_thread
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            workers = {t.ident for t in threading.enumerate() if t.name == _WORKER_THREAD}
+            for ident, frame in sys._current_frames().items():
+                if ident != self.loop_thread and ident not in workers:
+                    continue
+                if _is_idle(frame):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_dir() -> Path:
+    return Path(settings.profile_dir)
+
+
+def _write(scope: Scope, sampler: Sampler, started: datetime) -> str:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    route = _SAFE.sub("_", route_template(scope)).strip("_")
+    name = f"{started:%Y%m%dT%H%M%S%f}-{scope['method']}-{route}-{os.getpid()}{PROFILE_SUFFIX}"
+    (directory / name).write_text(sampler.folded())
+
+    # Keep the newest settings.profile_keep files (names start with the timestamp)
+    profiles = sorted(directory.glob(f"*{PROFILE_SUFFIX}"), key=lambda p: p.name, reverse=True)
+    for old in profiles[settings.profile_keep:]:
+        old.unlink(missing_ok=True)
+    return name
+
+
+def _requested(scope: Scope) -> bool:
+    headers = Headers(scope=scope)
+    if headers.get("x-profile") != "1" and not (
+        b"profile=" in scope["query_string"] and QueryParams(scope["query_string"]).get("profile") == "1"
+    ):
+        return False
+    token = headers.get("x-admin-token")
+    return bool(settings.admin_token) and token is not None and hmac.compare_digest(token, settings.admin_token)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        started = datetime.now(timezone.utc)
+        sampler = Sampler(threading.get_ident(), settings.profile_interval_ms / 1000)
+        pending: list[Message] = []
+
+        async def send_wrapper(message: Message) -> None:
+            # Hold the response until the profile is written, so X-Profile-Id can be set
+            pending.append(message)
+
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            sampler.stop()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        name = _write(scope, sampler, started)
+        print(f"[profile] {scope['method']} {scope['path']}: {sampler.samples} samples "
+              f"in {elapsed_ms:.0f} ms → {name}")
+
+        for message in pending:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-Id"] = name
+            await send(message)
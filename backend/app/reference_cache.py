@@ -0,0 +1,156 @@
+"""In-process cache of reference data (card library and storylines).
+
+Cards and storylines only change when the seed data changes, so they are
+loaded once per process.  Cards are kept as immutable CardRef snapshots
+together with per-slot indexes; both full listings are also kept as
+pre-rendered, precompressed JSON payloads, and combined into a
+content-hashed ReferenceBundle that is published as a static file (see
+app/bundle.py).  Request handlers read from the cache instead of querying
+the tables; call invalidate() after reference data is rewritten.
+"""
+
+import hashlib
+import threading
+
+import orjson
+from sqlalchemy.orm import Session, selectinload
+
+from app.compression import CompressedPayload
+from app.metrics import CACHE_LOOKUPS
+from app.models.card import Card
+from app.models.storyline import Storyline
+from app.schemas.ranger import CardRef
+from app.schemas.storyline import StorylineResponse
+from app.serialization import Serializer
+
+
+class CardLibrary:
+    """Snapshot of the card table, indexed for the ranger builder.
+
+    by_id    : card id → CardRef
+    by_slot  : (card_type, source_set) → cards ordered by name
+    by_type  : card_type → cards ordered by (source_set, name)
+    outside_interest : every card legal as an outside interest
+                       (non-expert background/specialty), ordered by (source_set, name)
+    payload  : the full library as a rendered GET /api/cards response
+    """
+
+    def __init__(self, cards: list[Card]):
+        refs = sorted(
+            (CardRef.model_validate(c) for c in cards),
+            key=lambda c: (c.source_set, c.name),
+        )
+        self.by_id: dict[int, CardRef] = {c.id: c for c in refs}
+
+        by_slot: dict[tuple[str, str], list[CardRef]] = {}
+        by_type: dict[str, list[CardRef]] = {}
+        for c in refs:
+            by_slot.setdefault((c.card_type, c.source_set), []).append(c)
+            by_type.setdefault(c.card_type, []).append(c)
+        self.by_slot: dict[tuple[str, str], tuple[CardRef, ...]] = {k: tuple(v) for k, v in by_slot.items()}
+        self.by_type: dict[str, tuple[CardRef, ...]] = {k: tuple(v) for k, v in by_type.items()}
+
+        self.outside_interest: tuple[CardRef, ...] = tuple(
+            c for c in refs
+            if c.card_type in ("background", "specialty") and not c.is_expert
+        )
+
+        self.payload = CompressedPayload(orjson.dumps([c.model_dump() for c in refs]))
+
+    def slot(self, card_type: str, source_set: str | None = None) -> tuple[CardRef, ...]:
+        """Cards of a type, optionally restricted to one source set."""
+        if source_set is None:
+            return self.by_type.get(card_type, ())
+        return self.by_slot.get((card_type, source_set), ())
+
+
+class ReferenceBundle:
+    """Cards and storylines as one JSON document named by its content hash.
+
+    The hash changes only when reference data does (i.e. with a release), so
+    the document can be cached by clients and proxies forever.
+    """
+
+    def __init__(self, library: CardLibrary, storylines: CompressedPayload):
+        body = b'{"cards":' + library.payload.body + b',"storylines":' + storylines.body + b"}"
+        self.hash = hashlib.sha256(body).hexdigest()[:16]
+        self.filename = f"reference.{self.hash}.json"
+        self.payload = CompressedPayload(body)
+
+
+_storylines = Serializer(list[StorylineResponse])
+
+_library: CardLibrary | None = None
+_storylines_payload: CompressedPayload | None = None
+_bundle: ReferenceBundle | None = None
+_lock = threading.Lock()
+
+
+def _lookup(cache: str):
+    return CACHE_LOOKUPS.labels(cache, "hit"), CACHE_LOOKUPS.labels(cache, "miss")
+
+
+_LIBRARY_HIT, _LIBRARY_MISS = _lookup("card_library")
+_STORYLINES_HIT, _STORYLINES_MISS = _lookup("storylines")
+_BUNDLE_HIT, _BUNDLE_MISS = _lookup("reference_bundle")
+
+
+def get_card_library(db: Session) -> CardLibrary:
+    """Return the cached card library, loading it with `db` on first use."""
+    global _library
+    library = _library
+    if library is not None:
+        _LIBRARY_HIT.inc()
+    else:
+        _LIBRARY_MISS.inc()
+        with _lock:
+            if _library is None:
+                _library = CardLibrary(db.query(Card).all())
+            library = _library
+    return library
+
+
+def get_storylines_payload(db: Session) -> CompressedPayload:
+    """Return the rendered GET /api/storylines response, loading it on first use."""
+    global _storylines_payload
+    payload = _storylines_payload
+    if payload is not None:
+        _STORYLINES_HIT.inc()
+    else:
+        _STORYLINES_MISS.inc()
+        with _lock:
+            if _storylines_payload is None:
+                storylines = (
+                    db.query(Storyline)
+                    .options(selectinload(Storyline.day_presets))
+                    .order_by(Storyline.name)
+                    .all()
+                )
+                _storylines_payload = CompressedPayload(orjson.dumps(_storylines.dump(storylines)))
+            payload = _storylines_payload
+    return payload
+
+
+def get_reference_bundle(db: Session) -> ReferenceBundle:
+    """Return the combined card/storyline bundle, building it on first use."""
+    global _bundle
+    bundle = _bundle
+    if bundle is not None:
+        _BUNDLE_HIT.inc()
+    else:
+        _BUNDLE_MISS.inc()
+        library, storylines = get_card_library(db), get_storylines_payload(db)
+        with _lock:
+            if _bundle is None:
+                _bundle = ReferenceBundle(library, storylines)
+            bundle = _bundle
+    return bundle
+
+
+def invalidate() -> None:
+    """Drop cached reference data so the next request reloads it."""
+    global _library, _storylines_payload, _bundle
+    with _lock:
+        _library = None
+        _storylines_payload = None
+        _bundle = None
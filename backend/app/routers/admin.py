@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from sqlalchemy.orm import Session
+
+from app import slow_queries
+from app.database import get_db
+from app.dependencies import require_admin
+from app.models.slow_query import SlowQuery
+from app.profiling import PROFILE_SUFFIX, profile_dir
+from app.schemas.admin import ProfileResponse, SlowQueryResponse
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+_ORDER = {
+    "total": SlowQuery.total_ms.desc(),
+    "max": SlowQuery.max_ms.desc(),
+    "calls": SlowQuery.calls.desc(),
+    "recent": SlowQuery.last_seen.desc(),
+}
+
+
+@router.get("/slow-queries", response_model=list[SlowQueryResponse])
+def list_slow_queries(
+    sort: Literal["total", "max", "calls", "recent"] = "total",
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """Statement fingerprints slower than settings.slow_query_ms, heaviest first."""
+    slow_queries.flush()   # include this process's unflushed samples
+    rows = db.query(SlowQuery).order_by(_ORDER[sort], SlowQuery.fingerprint).limit(limit).all()
+    return [
+        SlowQueryResponse(
+            fingerprint=r.fingerprint,
+            statement=r.statement,
+            calls=r.calls,
+            total_ms=round(r.total_ms, 2),
+            mean_ms=round(r.total_ms / r.calls, 2) if r.calls else 0.0,
+            max_ms=round(r.max_ms, 2),
+            first_seen=r.first_seen,
+            last_seen=r.last_seen,
+            last_plan=r.last_plan,
+        )
+        for r in rows
+    ]
+
+
+@router.get("/profiles", response_model=list[ProfileResponse])
+def list_profiles():
+    """Request profiles on this server, newest first (see app.profiling)."""
+    directory = profile_dir()
+    if not directory.is_dir():
+        return []
+    profiles = []
+    for path in directory.glob(f"*{PROFILE_SUFFIX}"):
+        stat = path.stat()
+        profiles.append(ProfileResponse(
+            id=path.name,
+            size=stat.st_size,
+            created_at=datetime.fromtimestamp(stat.st_mtime, timezone.utc),
+        ))
+    return sorted(profiles, key=lambda p: p.created_at, reverse=True)
+
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    """Download a profile in collapsed-stack format (flamegraph.pl, inferno, speedscope)."""
+    path = profile_dir() / profile_id
+    if path.suffix != PROFILE_SUFFIX or path.name != profile_id or not path.is_file():
+        raise HTTPException(404, "Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=profile_id)
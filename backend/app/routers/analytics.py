@@ -0,0 +1,74 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import jobs
+from app.analytics import SLOTS, counter_totals
+from app.auth import get_current_user
+from app.database import get_db
+from app.dependencies import require_admin
+from app.models.analytics import CardPickStat, TradePairStat
+from app.models.user import User
+from app.reference_cache import get_card_library
+from app.schemas.analytics import AnalyticsResponse, CardPickResponse, TradePairResponse
+from app.schemas.job import JobAccepted
+
+router = APIRouter(prefix="/api/analytics", tags=["analytics"])
+
+
+@router.get("", response_model=AnalyticsResponse)
+def get_analytics(limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_db)):
+    """Most-picked cards per slot, most common trades and overall totals.
+
+    Reads only the pre-aggregated tables maintained by app.analytics.
+    """
+    cards = get_card_library(db).by_id
+    counters = counter_totals(db)
+
+    # Top `limit` cards per slot in one query
+    rank = func.row_number().over(
+        partition_by=CardPickStat.slot,
+        order_by=(CardPickStat.picks.desc(), CardPickStat.card_id),
+    ).label("rank")
+    ranked = (
+        select(CardPickStat.slot, CardPickStat.card_id, CardPickStat.picks, rank)
+        .where(CardPickStat.picks > 0)
+        .subquery()
+    )
+    top_picks: dict[str, list[CardPickResponse]] = {slot: [] for slot in SLOTS}
+    for slot, card_id, picks, _ in db.execute(
+        select(ranked).where(ranked.c.rank <= limit).order_by(ranked.c.slot, ranked.c.rank)
+    ):
+        top_picks[slot].append(CardPickResponse(card=cards[card_id], picks=picks))
+
+    top_trades = [
+        TradePairResponse(original_card=cards[p.original_card_id], reward_card=cards[p.reward_card_id], trades=p.trades)
+        for p in (
+            db.query(TradePairStat)
+            .filter(TradePairStat.trades > 0)
+            .order_by(TradePairStat.trades.desc(), TradePairStat.original_card_id, TradePairStat.reward_card_id)
+            .limit(limit)
+        )
+    ]
+
+    trades = counters.get("trades", 0)
+    days_completed = counters.get("days_completed", 0)
+    return AnalyticsResponse(
+        rangers=counters.get("rangers", 0),
+        trades=trades,
+        days_completed=days_completed,
+        avg_trades_per_day=round(trades / days_completed, 2) if days_completed else 0.0,
+        top_picks=top_picks,
+        top_trades=top_trades,
+    )
+
+
+@router.post("/rebuild", status_code=202, response_model=JobAccepted, dependencies=[Depends(require_admin)])
+def rebuild_analytics(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Queue a full recomputation of the aggregates (repairs drift; see app.analytics.rebuild).
+
+    Operator only (X-Admin-Token): it rewrites every aggregate table server-wide.
+    """
+    job = jobs.enqueue(db, "rebuild_analytics", owner_id=current_user.id)
+    db.commit()
+    return JobAccepted(job_id=job.id)
@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload, noload, selectinload
 
+from app import analytics, jobs
 from app.auth import get_current_user
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db
 from app.dependencies import require_campaign_write
-from app.models.campaign import Campaign, CampaignDay, CampaignStatus, DayStatus
+from app.models.campaign import Campaign, CampaignDay, CampaignStatus, DayStatus, NotableEvent
+from app.models.ranger import Ranger, RangerTrade
 from app.models.storyline import Storyline, StorylineDayPreset
 from app.models.user import User
 from app.schemas.campaign import (
@@ -13,20 +17,67 @@ from app.schemas.campaign import (
     CampaignResponse,
     CampaignUpdate,
 )
+from app.schemas.job import JobAccepted
+from app.serialization import Serializer
 
 router = APIRouter(prefix="/api/campaigns", tags=["campaigns"])
 
+_campaigns = Serializer(list[CampaignResponse])
+_campaign_detail = Serializer(CampaignDetailResponse)
+
+
+# Collections of CampaignDetailResponse that can be requested via ?include=
+_DETAIL_SECTIONS = ("days", "missions", "rewards", "notable_events")
+
 
 def _active_day(campaign: Campaign) -> CampaignDay | None:
     return next((d for d in campaign.days if d.status == DayStatus.active), None)
 
 
+def _parse_include(include: str | None) -> set[str]:
+    """Parse a comma-separated ?include= value; None means every section."""
+    if include is None:
+        return set(_DETAIL_SECTIONS)
+    sections = {s.strip() for s in include.split(",") if s.strip()}
+    unknown = sections - set(_DETAIL_SECTIONS)
+    if unknown:
+        raise HTTPException(
+            400,
+            f"Unknown include section(s): {', '.join(sorted(unknown))} — choose from {', '.join(_DETAIL_SECTIONS)}",
+        )
+    return sections
+
+
+def _load_campaign_detail(campaign_id: int, sections: set[str], db: Session) -> Campaign | None:
+    """Load a campaign and the requested detail sections in a fixed number of queries.
+
+    The storyline is joined into the campaign query and each requested
+    collection is fetched with one SELECT ... IN; sections that were not
+    requested are never loaded.  At most five queries regardless of size.
+    """
+    options = [joinedload(Campaign.storyline)]
+    for name in _DETAIL_SECTIONS:
+        attr = getattr(Campaign, name)
+        options.append(selectinload(attr) if name in sections else noload(attr))
+    return (
+        db.query(Campaign)
+        .options(*options)
+        .filter(Campaign.id == campaign_id, Campaign.status != CampaignStatus.deleting)
+        .first()
+    )
+
+
 @router.get("", response_model=list[CampaignResponse])
-def list_campaigns(db: Session = Depends(get_db)):
-    campaigns = db.query(Campaign).order_by(Campaign.created_at.desc()).all()
+def list_campaigns(db: Session = Depends(get_read_db)):
+    campaigns = (
+        db.query(Campaign)
+        .filter(Campaign.status != CampaignStatus.deleting)
+        .order_by(Campaign.created_at.desc())
+        .all()
+    )
     for c in campaigns:
         c.current_day = _active_day(c)
-    return campaigns
+    return _campaigns.response(campaigns)
 
 
 @router.post("", response_model=CampaignDetailResponse, status_code=201)
@@ -74,12 +125,29 @@ def create_campaign(
 
 
 @router.get("/{campaign_id}", response_model=CampaignDetailResponse)
-def get_campaign(campaign_id: int, db: Session = Depends(get_db)):
-    campaign = db.get(Campaign, campaign_id)
+def get_campaign(campaign_id: int, include: str | None = None, db: Session = Depends(get_read_db)):
+    """Campaign detail.
+
+    ?include= takes a comma-separated subset of days, missions, rewards and
+    notable_events; sections left out are neither loaded nor serialized, so
+    their keys are absent from the response.  Omitting the parameter returns
+    every section.
+    """
+    sections = _parse_include(include)
+    campaign = _load_campaign_detail(campaign_id, sections, db)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
-    campaign.current_day = _active_day(campaign)
-    return campaign
+
+    if "days" in sections:
+        campaign.current_day = _active_day(campaign)
+    else:
+        campaign.current_day = (
+            db.query(CampaignDay)
+            .filter_by(campaign_id=campaign_id, status=DayStatus.active)
+            .first()
+        )
+
+    return _campaign_detail.response(campaign, exclude=set(_DETAIL_SECTIONS) - sections)
 
 
 @router.patch("/{campaign_id}", response_model=CampaignResponse)
@@ -103,11 +171,37 @@ def update_campaign(
     return campaign
 
 
-@router.delete("/{campaign_id}", status_code=204)
+def _purge_size(campaign_id: int, db: Session) -> int:
+    """Trades plus notable events: the rows that grow without bound in a long campaign."""
+    trades = (
+        select(func.count()).select_from(RangerTrade).join(Ranger, RangerTrade.ranger_id == Ranger.id)
+        .where(Ranger.campaign_id == campaign_id).scalar_subquery()
+    )
+    events = select(func.count()).where(NotableEvent.campaign_id == campaign_id).scalar_subquery()
+    return db.scalar(select(trades + events))
+
+
+@router.delete("/{campaign_id}", status_code=204, responses={202: {"model": JobAccepted}})
 def delete_campaign(
     campaign_id: int,
+    response: Response,
     campaign: Campaign = Depends(require_campaign_write),
+    current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
+    """Delete a campaign and everything in it.
+
+    Child rows go with it through ON DELETE CASCADE, so this is a single
+    DELETE.  A campaign with more than settings.campaign_purge_threshold
+    trades and events is instead hidden at once and purged in batches by a
+    background job; the response is then 202 with the job id.
+    """
+    analytics.record_campaign_removed(db, campaign_id)
+    if _purge_size(campaign_id, db) > settings.campaign_purge_threshold:
+        campaign.status = CampaignStatus.deleting
+        job = jobs.enqueue(db, "purge_campaign", {"campaign_id": campaign_id}, owner_id=current_user.id)
+        db.commit()
+        response.status_code = 202
+        return JobAccepted(job_id=job.id)
     db.delete(campaign)
     db.commit()
@@ -1,29 +1,38 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.card import Card
+from app.database import get_read_db
+from app.reference_cache import get_card_library
 from app.schemas.card import CardResponse
+from app.serialization import Serializer
 
 router = APIRouter(prefix="/api/cards", tags=["cards"])
 
+_cards = Serializer(list[CardResponse])
+
 
 @router.get("", response_model=list[CardResponse])
 def list_cards(
+    request: Request,
     card_type: str | None = None,
     source_set: str | None = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     """List cards, optionally filtered by card_type and/or source_set.
 
+    Served from the in-process card library; the unfiltered list is a
+    pre-rendered, precompressed payload.
+
     Examples:
       /api/cards?card_type=personality
       /api/cards?card_type=background&source_set=Artisan
       /api/cards?card_type=role&source_set=Explorer
     """
-    q = db.query(Card)
-    if card_type:
-        q = q.filter(Card.card_type == card_type)
-    if source_set:
-        q = q.filter(Card.source_set == source_set)
-    return q.order_by(Card.source_set, Card.name).all()
+    library = get_card_library(db)
+    if card_type is None and source_set is None:
+        return library.payload.response(request)
+    if card_type is not None:
+        cards = library.slot(card_type, source_set)
+    else:
+        cards = [c for c in library.by_id.values() if c.source_set == source_set]
+    return _cards.response(cards)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
+from app import analytics
 from app.database import get_db
 from app.dependencies import require_campaign_write
 from app.models.campaign import Campaign, CampaignDay, CampaignStatus, DayStatus
@@ -18,7 +19,7 @@ class DayCloseRequest(BaseModel):
 @router.get("/{day_id}", response_model=DayResponse)
 def get_day(campaign_id: int, day_id: int, db: Session = Depends(get_db)):
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(404, "Campaign not found")
     day = db.get(CampaignDay, day_id)
     if not day or day.campaign_id != campaign_id:
@@ -48,6 +49,7 @@ def close_day(
         raise HTTPException(400, f"Day {day.day_number} is not active (current status: {day.status})")
 
     day.status = DayStatus.completed
+    analytics.record_day_completed(db)
 
     next_day = (
         db.query(CampaignDay)
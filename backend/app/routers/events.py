@@ -1,20 +1,82 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.dependencies import require_campaign_write
-from app.models.campaign import Campaign, CampaignDay, NotableEvent
+from app.models.campaign import Campaign, CampaignDay, CampaignStatus, NotableEvent
 from app.schemas.event import EventCreate, EventResponse
+from app.serialization import Serializer
 
 router = APIRouter(prefix="/api/campaigns/{campaign_id}/events", tags=["events"])
 
+_events = Serializer(list[EventResponse])
+
+
+# ----- Keyset cursor -----
+
+def _encode_cursor(day_number: int, created_at: datetime, event_id: int) -> str:
+    raw = f"{day_number}|{created_at.isoformat()}|{event_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[int, datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        day_number, created_at, event_id = raw.split("|")
+        return int(day_number), datetime.fromisoformat(created_at), int(event_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
+
 
 @router.get("", response_model=list[EventResponse])
-def list_events(campaign_id: int, db: Session = Depends(get_db)):
+def list_events(
+    campaign_id: int,
+    day_id: int | None = None,
+    day_number: int | None = Query(None, ge=1),
+    after: str | None = None,
+    limit: int | None = Query(None, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+):
+    """Events ordered by (day number, created_at, id), optionally for a single day.
+
+    Without `limit` every matching event is returned.  With `limit`, the
+    X-Next-Cursor response header carries the cursor for the next page;
+    pass it back as `after`.  It is absent on the last page.
+
+    ix_notable_events_campaign_day_created serves the ordering only when
+    `day_id` is given; other listings sort on the joined day_number.
+    """
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(404, "Campaign not found")
-    return campaign.notable_events
+
+    sort_key = (CampaignDay.day_number, NotableEvent.created_at, NotableEvent.id)
+    q = (
+        db.query(NotableEvent, CampaignDay.day_number)
+        .join(CampaignDay, NotableEvent.day_id == CampaignDay.id)
+        .filter(NotableEvent.campaign_id == campaign_id)
+        .order_by(*sort_key)
+    )
+    if day_id is not None:
+        q = q.filter(NotableEvent.day_id == day_id)
+    if day_number is not None:
+        q = q.filter(CampaignDay.day_number == day_number)
+    if after is not None:
+        q = q.filter(tuple_(*sort_key) > tuple_(*_decode_cursor(after)))
+    if limit is not None:
+        q = q.limit(limit + 1)
+
+    rows = q.all()
+    headers = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last, last_day_number = rows[-1]
+        headers = {"X-Next-Cursor": _encode_cursor(last_day_number, last.created_at, last.id)}
+    return _events.response([e for e, _ in rows], headers=headers)
 
 
 @router.post("", response_model=EventResponse, status_code=201)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_user
+from app.database import get_db
+from app.models.job import Job
+from app.models.user import User
+from app.schemas.job import JobResponse
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),   # primary: status changes must be visible immediately
+):
+    """Status of a background job; the result is filled in once it has succeeded."""
+    job = db.get(Job, job_id)
+    if not job or job.owner_id != current_user.id:
+        raise HTTPException(404, "Job not found")
+    return job
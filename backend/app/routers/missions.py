@@ -3,11 +3,14 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.dependencies import require_campaign_write
-from app.models.campaign import Campaign, CampaignDay, DayStatus, Mission
+from app.models.campaign import Campaign, CampaignDay, CampaignStatus, DayStatus, Mission
 from app.schemas.mission import MissionCreate, MissionResponse, MissionUpdate
+from app.serialization import Serializer
 
 router = APIRouter(prefix="/api/campaigns/{campaign_id}/missions", tags=["missions"])
 
+_missions = Serializer(list[MissionResponse])
+
 
 def _active_day_id(campaign: Campaign) -> int | None:
     for day in campaign.days:
@@ -19,9 +22,9 @@ def _active_day_id(campaign: Campaign) -> int | None:
 @router.get("", response_model=list[MissionResponse])
 def list_missions(campaign_id: int, db: Session = Depends(get_db)):
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(404, "Campaign not found")
-    return campaign.missions
+    return _missions.response(campaign.missions)
 
 
 @router.post("", response_model=MissionResponse, status_code=201)
@@ -1,24 +1,38 @@
 from collections import Counter
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app import analytics
+from app.database import get_db, get_read_db
+from app.decks import current_decklist, deck_entries, starting_deck
 from app.dependencies import require_campaign_write
-from app.models.campaign import Campaign, CampaignDay, CampaignReward
-from app.models.card import Card
+from app.models.campaign import Campaign, CampaignDay, CampaignReward, CampaignStatus
 from app.models.ranger import Ranger, RangerTrade
+from app.reference_cache import get_card_library
 from app.schemas.ranger import (
     CardRef,
+    DeckDiffResponse,
     DeckEntry,
+    DeckResponse,
     RangerCreate,
+    RangerOptionsResponse,
     RangerResponse,
+    RangerSummary,
+    RangerValidationResponse,
     TradeCreate,
     TradeResponse,
 )
+from app.serialization import Serializer
+from app.tracing import traced
 
 router = APIRouter(prefix="/api/campaigns/{campaign_id}/rangers", tags=["rangers"])
 
+_rangers = Serializer(list[RangerResponse])
+_ranger_summaries = Serializer(list[RangerSummary])
+
 _VALID_BACKGROUNDS = ("Artisan", "Forager", "Shepherd", "Traveler")
 _VALID_SPECIALTIES = ("Artificer", "Conciliator", "Explorer", "Shaper")
 
@@ -29,7 +43,7 @@ _VALID_SPECIALTIES = ("Artificer", "Conciliator", "Explorer", "Shaper")
 
 def _get_campaign_or_404(campaign_id: int, db: Session) -> Campaign:
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(status_code=404, detail="Campaign not found")
     return campaign
 
@@ -41,149 +55,174 @@ def _get_ranger_or_404(campaign_id: int, ranger_id: int, db: Session) -> Ranger:
     return ranger
 
 
+@traced("decks")
 def _compute_decklist(ranger: Ranger, db: Session) -> list[DeckEntry]:
-    """Derive the ranger's current deck from starting cards plus trade history.
+    """Derive the ranger's current deck from starting cards plus trade history."""
+    return current_decklist(ranger, get_card_library(db).by_id)
+
+
+def _trade_delta(ranger_id: int, db: Session, *day_criteria) -> Counter:
+    """Net card change from the ranger's non-reverted trades on days matching day_criteria.
 
-    Starting deck: each selected card ×2.
-    Each non-reverted trade: −1 original, +1 reward.
+    Trades are aggregated per (original, reward) pair in SQL through the
+    (ranger_id, day_id) index joined to campaign_days, so the cost depends
+    on the number of distinct swaps, not on replaying every trade row.
     """
-    deck: Counter = Counter()
+    delta: Counter = Counter()
+    for original_id, reward_id, n in db.execute(
+        select(RangerTrade.original_card_id, RangerTrade.reward_card_id, func.count())
+        .join(CampaignDay, RangerTrade.day_id == CampaignDay.id)
+        .where(RangerTrade.ranger_id == ranger_id, RangerTrade.reverted.is_(False), *day_criteria)
+        .group_by(RangerTrade.original_card_id, RangerTrade.reward_card_id)
+    ):
+        delta[original_id] -= n
+        delta[reward_id] += n
+    return delta
 
-    for cid in ranger.personality_card_ids:
-        deck[cid] += 2
-    for cid in ranger.background_card_ids:
-        deck[cid] += 2
-    for cid in ranger.specialty_card_ids:
-        deck[cid] += 2
-    deck[ranger.outside_interest_card_id] += 2
 
-    for trade in ranger.trades:
-        if not trade.reverted:
-            deck[trade.original_card_id] -= 1
-            deck[trade.reward_card_id] += 1
+def _require_day_number(campaign_id: int, day_number: int, db: Session) -> None:
+    exists = db.query(CampaignDay.id).filter_by(campaign_id=campaign_id, day_number=day_number).first()
+    if not exists:
+        raise HTTPException(404, "Day not found")
 
-    live_ids = {cid for cid, qty in deck.items() if qty > 0}
-    card_map = {c.id: c for c in db.query(Card).filter(Card.id.in_(live_ids)).all()}
 
-    return [
-        DeckEntry(card=CardRef.model_validate(card_map[cid]), quantity=qty)
-        for cid, qty in sorted(deck.items(), key=lambda x: card_map[x[0]].name if x[0] in card_map else "")
-        if qty > 0
-    ]
+def _campaign_selections(campaign_id: int, db: Session) -> list[tuple]:
+    """Return the card selections of every ranger in the campaign.
+
+    Only the card-id columns are loaded — no full Ranger rows, no relationships.
+    """
+    return (
+        db.query(
+            Ranger.personality_card_ids,
+            Ranger.background_card_ids,
+            Ranger.specialty_card_ids,
+            Ranger.outside_interest_card_id,
+            Ranger.role_card_id,
+        )
+        .filter_by(campaign_id=campaign_id)
+        .all()
+    )
 
 
-def _campaign_cards_in_use(campaign_id: int, db: Session) -> set[int]:
+def _campaign_cards_in_use(selections: list[tuple]) -> set[int]:
     """Return all card IDs already selected by any ranger in the campaign."""
-    rangers = db.query(Ranger).filter_by(campaign_id=campaign_id).all()
     in_use: set[int] = set()
-    for r in rangers:
-        in_use.update(r.personality_card_ids)
-        in_use.update(r.background_card_ids)
-        in_use.update(r.specialty_card_ids)
-        in_use.add(r.outside_interest_card_id)
-        in_use.add(r.role_card_id)
+    for personality, background, specialty, outside_interest, role in selections:
+        in_use.update(personality)
+        in_use.update(background)
+        in_use.update(specialty)
+        in_use.add(outside_interest)
+        in_use.add(role)
     return in_use
 
 
-def _validate_ranger_cards(body: RangerCreate, db: Session, campaign_id: int) -> None:
-    """Validate all card selections against the card library and rules."""
+def _validate_ranger_cards(body: RangerCreate, db: Session, campaign: Campaign) -> list[str]:
+    """Validate all card selections against the card library and rules.
+
+    Selected cards are resolved against the cached card library and the
+    campaign's existing selections are loaded in one query; all rules from
+    RANGER_DECK_RULES.md are then evaluated in memory.  Returns every
+    violation found (empty = legal).
+    """
+    errors: list[str] = []
+
+    selected_ids = (
+        set(body.personality_card_ids)
+        | set(body.background_card_ids)
+        | set(body.specialty_card_ids)
+        | {body.role_card_id, body.outside_interest_card_id}
+    )
+    cards = get_card_library(db).by_id
+
+    def resolve(ids: list[int], label: str) -> list[CardRef]:
+        if any(cid not in cards for cid in ids):
+            errors.append(f"One or more {label} card IDs not found")
+        return [cards[cid] for cid in dict.fromkeys(ids) if cid in cards]
 
     # Personality: exactly 4, one per aspect
     if len(body.personality_card_ids) != 4:
-        raise HTTPException(400, "Exactly 4 personality cards required")
-
-    p_cards = db.query(Card).filter(Card.id.in_(body.personality_card_ids)).all()
-    if len(p_cards) != len(body.personality_card_ids):
-        raise HTTPException(400, "One or more personality card IDs not found")
+        errors.append("Exactly 4 personality cards required")
+    if len(set(body.personality_card_ids)) != len(body.personality_card_ids):
+        errors.append("Duplicate cards in personality selection")
 
     aspects_seen = set()
-    for c in p_cards:
+    personality_ok = True
+    for c in resolve(body.personality_card_ids, "personality"):
         if c.card_type != "personality":
-            raise HTTPException(400, f"'{c.name}' is not a personality card")
-        if c.source_set in aspects_seen:
-            raise HTTPException(400, f"Duplicate aspect {c.source_set} — choose one personality card per aspect")
-        aspects_seen.add(c.source_set)
+            errors.append(f"'{c.name}' is not a personality card")
+            personality_ok = False
+        elif c.source_set in aspects_seen:
+            errors.append(f"Duplicate aspect {c.source_set} — choose one personality card per aspect")
+            personality_ok = False
+        else:
+            aspects_seen.add(c.source_set)
 
-    if aspects_seen != {"AWA", "FIT", "FOC", "SPI"}:
-        raise HTTPException(400, "Must choose one personality card for each aspect: AWA, FIT, FOC, SPI")
+    if personality_ok and aspects_seen != {"AWA", "FIT", "FOC", "SPI"}:
+        errors.append("Must choose one personality card for each aspect: AWA, FIT, FOC, SPI")
 
     # Background: exactly 5, all from the chosen set
     if body.background_set not in _VALID_BACKGROUNDS:
-        raise HTTPException(400, f"background_set must be one of {_VALID_BACKGROUNDS}")
+        errors.append(f"background_set must be one of {_VALID_BACKGROUNDS}")
 
     if len(body.background_card_ids) != 5:
-        raise HTTPException(400, "Exactly 5 background cards required")
-
-    bg_cards = db.query(Card).filter(Card.id.in_(body.background_card_ids)).all()
-    if len(bg_cards) != len(body.background_card_ids):
-        raise HTTPException(400, "One or more background card IDs not found")
+        errors.append("Exactly 5 background cards required")
+    if len(set(body.background_card_ids)) != len(body.background_card_ids):
+        errors.append("Duplicate cards in background selection")
 
-    for c in bg_cards:
+    for c in resolve(body.background_card_ids, "background"):
         if c.card_type != "background" or c.source_set != body.background_set:
-            raise HTTPException(400, f"'{c.name}' is not a {body.background_set} background card")
+            errors.append(f"'{c.name}' is not a {body.background_set} background card")
 
     # Specialty: exactly 5, all from the chosen set, no role cards
     if body.specialty_set not in _VALID_SPECIALTIES:
-        raise HTTPException(400, f"specialty_set must be one of {_VALID_SPECIALTIES}")
+        errors.append(f"specialty_set must be one of {_VALID_SPECIALTIES}")
 
     if len(body.specialty_card_ids) != 5:
-        raise HTTPException(400, "Exactly 5 specialty cards required")
-
-    sp_cards = db.query(Card).filter(Card.id.in_(body.specialty_card_ids)).all()
-    if len(sp_cards) != len(body.specialty_card_ids):
-        raise HTTPException(400, "One or more specialty card IDs not found")
+        errors.append("Exactly 5 specialty cards required")
+    if len(set(body.specialty_card_ids)) != len(body.specialty_card_ids):
+        errors.append("Duplicate cards in specialty selection")
 
-    for c in sp_cards:
+    for c in resolve(body.specialty_card_ids, "specialty"):
         if c.card_type == "role":
-            raise HTTPException(400, f"'{c.name}' is a role card and cannot be added to the deck")
-        if c.card_type != "specialty" or c.source_set != body.specialty_set:
-            raise HTTPException(400, f"'{c.name}' is not a {body.specialty_set} specialty card")
+            errors.append(f"'{c.name}' is a role card and cannot be added to the deck")
+        elif c.card_type != "specialty" or c.source_set != body.specialty_set:
+            errors.append(f"'{c.name}' is not a {body.specialty_set} specialty card")
 
     # Role card: from the chosen specialty set
-    role_card = db.get(Card, body.role_card_id)
+    role_card = cards.get(body.role_card_id)
     if not role_card:
-        raise HTTPException(400, "Role card not found")
-    if role_card.card_type != "role" or role_card.source_set != body.specialty_set:
-        raise HTTPException(400, f"'{role_card.name}' is not a {body.specialty_set} role card")
-
-    # No duplicate card IDs within background or specialty selections
-    if len(set(body.background_card_ids)) != len(body.background_card_ids):
-        raise HTTPException(400, "Duplicate cards in background selection")
-    if len(set(body.specialty_card_ids)) != len(body.specialty_card_ids):
-        raise HTTPException(400, "Duplicate cards in specialty selection")
+        errors.append("Role card not found")
+    elif role_card.card_type != "role" or role_card.source_set != body.specialty_set:
+        errors.append(f"'{role_card.name}' is not a {body.specialty_set} role card")
 
     # Outside interest: any background or specialty card, not a role, not expert,
     # and not already chosen for background or specialty
     already_chosen = set(body.background_card_ids) | set(body.specialty_card_ids)
+    oi_card = cards.get(body.outside_interest_card_id)
     if body.outside_interest_card_id in already_chosen:
-        raise HTTPException(400, "Outside interest card is already chosen as a background or specialty card")
-
-    oi_card = db.get(Card, body.outside_interest_card_id)
-    if not oi_card:
-        raise HTTPException(400, "Outside interest card not found")
-    if oi_card.card_type not in ("background", "specialty"):
-        raise HTTPException(400, "Outside interest must be a background or specialty card")
-    if oi_card.is_expert:
-        raise HTTPException(400, f"'{oi_card.name}' has the Expert trait and cannot be chosen as outside interest")
-
-    # Campaign-wide uniqueness: no card can be held by more than one ranger
-    all_new_ids = (
-        set(body.personality_card_ids)
-        | set(body.background_card_ids)
-        | set(body.specialty_card_ids)
-        | {body.outside_interest_card_id, body.role_card_id}
-    )
-    in_use = _campaign_cards_in_use(campaign_id, db)
-    conflicts = all_new_ids & in_use
+        errors.append("Outside interest card is already chosen as a background or specialty card")
+    elif not oi_card:
+        errors.append("Outside interest card not found")
+    elif oi_card.card_type not in ("background", "specialty"):
+        errors.append("Outside interest must be a background or specialty card")
+    elif oi_card.is_expert:
+        errors.append(f"'{oi_card.name}' has the Expert trait and cannot be chosen as outside interest")
+
+    # Campaign-wide: ranger limit, and no card can be held by more than one ranger
+    selections = _campaign_selections(campaign.id, db)
+    max_rangers = campaign.storyline.max_rangers
+    if len(selections) >= max_rangers:
+        errors.append(f"Campaign already has the maximum of {max_rangers} rangers")
+
+    conflicts = selected_ids & _campaign_cards_in_use(selections)
     if conflicts:
-        names = [
-            c.name for c in db.query(Card).filter(Card.id.in_(conflicts)).all()
-        ]
-        raise HTTPException(
-            400,
+        names = sorted(cards[cid].name for cid in conflicts)
+        errors.append(
             f"The following cards are already selected by another ranger in this campaign: {', '.join(names)}"
         )
 
+    return errors
+
 
 def _adjust_pool(campaign_id: int, card_id: int, delta: int, db: Session) -> None:
     """Add or remove a card from the campaign rewards pool."""
@@ -200,12 +239,78 @@ def _adjust_pool(campaign_id: int, card_id: int, delta: int, db: Session) -> Non
 # Ranger endpoints
 # ---------------------------------------------------------------------------
 
-@router.get("", response_model=list[RangerResponse])
-def list_rangers(campaign_id: int, db: Session = Depends(get_db)):
+def _list_ranger_summaries(campaign_id: int, db: Session) -> list[RangerSummary]:
+    """One projected query: scalar columns plus a correlated trade count.
+
+    No JSONB card lists, no relationships, no decklists; the role card comes
+    from the reference cache.
+    """
+    trade_count = (
+        select(func.count())
+        .where(RangerTrade.ranger_id == Ranger.id, RangerTrade.reverted.is_(False))
+        .correlate(Ranger)
+        .scalar_subquery()
+    )
+    rows = (
+        db.query(
+            Ranger.id,
+            Ranger.campaign_id,
+            Ranger.name,
+            Ranger.aspect_card_name,
+            Ranger.awa,
+            Ranger.fit,
+            Ranger.foc,
+            Ranger.spi,
+            Ranger.background_set,
+            Ranger.specialty_set,
+            Ranger.role_card_id,
+            trade_count.label("trade_count"),
+        )
+        .filter(Ranger.campaign_id == campaign_id)
+        .order_by(Ranger.id)
+        .all()
+    )
+    cards = get_card_library(db).by_id
+    return [
+        RangerSummary(
+            id=r.id,
+            campaign_id=r.campaign_id,
+            name=r.name,
+            aspect_card_name=r.aspect_card_name,
+            awa=r.awa,
+            fit=r.fit,
+            foc=r.foc,
+            spi=r.spi,
+            background_set=r.background_set,
+            specialty_set=r.specialty_set,
+            role_card=cards[r.role_card_id],
+            trade_count=r.trade_count,
+        )
+        for r in rows
+    ]
+
+
+@router.get("", response_model=list[RangerResponse] | list[RangerSummary])
+def list_rangers(
+    campaign_id: int,
+    view: Literal["full", "summary"] = "full",
+    db: Session = Depends(get_read_db),
+):
+    """Rangers in the campaign.
+
+    view=summary returns names, stats, role card and trade count only —
+    one narrow query, for screens that don't show decks.
+    """
+    if view == "summary":
+        summaries = _list_ranger_summaries(campaign_id, db)
+        if not summaries:
+            _get_campaign_or_404(campaign_id, db)
+        return _ranger_summaries.response(summaries)
+
     campaign = _get_campaign_or_404(campaign_id, db)
     for ranger in campaign.rangers:
         ranger.current_decklist = _compute_decklist(ranger, db)
-    return campaign.rangers
+    return _rangers.response(campaign.rangers)
 
 
 @router.post("", response_model=RangerResponse, status_code=201)
@@ -215,13 +320,9 @@ def create_ranger(
     campaign: Campaign = Depends(require_campaign_write),
     db: Session = Depends(get_db),
 ):
-    if len(campaign.rangers) >= campaign.storyline.max_rangers:
-        raise HTTPException(
-            400,
-            f"Campaign already has the maximum of {campaign.storyline.max_rangers} rangers"
-        )
-
-    _validate_ranger_cards(body, db, campaign_id)
+    errors = _validate_ranger_cards(body, db, campaign)
+    if errors:
+        raise HTTPException(400, "; ".join(errors))
 
     ranger = Ranger(
         campaign_id=campaign_id,
@@ -240,6 +341,7 @@ def create_ranger(
         outside_interest_card_id=body.outside_interest_card_id,
     )
     db.add(ranger)
+    analytics.record_ranger(db, ranger)
     db.commit()
     db.refresh(ranger)
 
@@ -247,13 +349,104 @@ def create_ranger(
     return ranger
 
 
+@router.post("/validate", response_model=RangerValidationResponse)
+def validate_ranger(
+    campaign_id: int,
+    body: RangerCreate,
+    campaign: Campaign = Depends(require_campaign_write),
+    db: Session = Depends(get_db),
+):
+    """Dry-run ranger creation: report every rule violation without creating anything."""
+    errors = _validate_ranger_cards(body, db, campaign)
+    return RangerValidationResponse(valid=not errors, errors=errors)
+
+
+@router.get("/options", response_model=RangerOptionsResponse)
+def ranger_options(
+    campaign_id: int,
+    background_set: str | None = None,
+    specialty_set: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    """Cards a new ranger may still choose, grouped by slot.
+
+    Cards already held by another ranger in the campaign are excluded.
+    Background, specialty and role lists are empty until their set is given.
+    """
+    _get_campaign_or_404(campaign_id, db)
+    if background_set is not None and background_set not in _VALID_BACKGROUNDS:
+        raise HTTPException(400, f"background_set must be one of {_VALID_BACKGROUNDS}")
+    if specialty_set is not None and specialty_set not in _VALID_SPECIALTIES:
+        raise HTTPException(400, f"specialty_set must be one of {_VALID_SPECIALTIES}")
+
+    library = get_card_library(db)
+    in_use = _campaign_cards_in_use(_campaign_selections(campaign_id, db))
+
+    def available(cards) -> list[CardRef]:
+        return [c for c in cards if c.id not in in_use]
+
+    return RangerOptionsResponse(
+        personality=available(library.slot("personality")),
+        background=available(library.slot("background", background_set)) if background_set else [],
+        specialty=available(library.slot("specialty", specialty_set)) if specialty_set else [],
+        role=available(library.slot("role", specialty_set)) if specialty_set else [],
+        outside_interest=available(library.outside_interest),
+    )
+
+
 @router.get("/{ranger_id}", response_model=RangerResponse)
-def get_ranger(campaign_id: int, ranger_id: int, db: Session = Depends(get_db)):
+def get_ranger(campaign_id: int, ranger_id: int, db: Session = Depends(get_read_db)):
     ranger = _get_ranger_or_404(campaign_id, ranger_id, db)
     ranger.current_decklist = _compute_decklist(ranger, db)
     return ranger
 
 
+@router.get("/{ranger_id}/deck", response_model=DeckResponse)
+def get_ranger_deck(
+    campaign_id: int,
+    ranger_id: int,
+    as_of_day: int | None = Query(None, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """The ranger's deck at the end of day `as_of_day` (0 = starting deck), or the current deck."""
+    ranger = _get_ranger_or_404(campaign_id, ranger_id, db)
+    deck = starting_deck(ranger)
+    if as_of_day is None:
+        deck.update(_trade_delta(ranger_id, db))
+    elif as_of_day > 0:
+        _require_day_number(campaign_id, as_of_day, db)
+        deck.update(_trade_delta(ranger_id, db, CampaignDay.day_number <= as_of_day))
+
+    cards = deck_entries(deck, get_card_library(db).by_id)
+    return DeckResponse(
+        ranger_id=ranger_id,
+        as_of_day=as_of_day,
+        size=sum(e.quantity for e in cards),
+        cards=cards,
+    )
+
+
+@router.get("/{ranger_id}/deck/diff", response_model=DeckDiffResponse)
+def get_ranger_deck_diff(
+    campaign_id: int,
+    ranger_id: int,
+    day: int = Query(..., ge=1),
+    db: Session = Depends(get_read_db),
+):
+    """Cards gained and lost through the ranger's trades on campaign day `day`."""
+    _get_ranger_or_404(campaign_id, ranger_id, db)
+    _require_day_number(campaign_id, day, db)
+    delta = _trade_delta(ranger_id, db, CampaignDay.day_number == day)
+
+    cards = get_card_library(db).by_id
+    return DeckDiffResponse(
+        ranger_id=ranger_id,
+        day_number=day,
+        added=deck_entries(Counter({cid: n for cid, n in delta.items() if n > 0}), cards),
+        removed=deck_entries(Counter({cid: -n for cid, n in delta.items() if n < 0}), cards),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Trade endpoints
 # ---------------------------------------------------------------------------
@@ -292,6 +485,7 @@ def create_trade(
         reward_card_id=body.reward_card_id,
     )
     db.add(trade)
+    analytics.record_trade(db, body.original_card_id, body.reward_card_id)
 
     # Reward leaves pool; original enters pool
     _adjust_pool(campaign_id, body.reward_card_id, -1, db)
@@ -319,6 +513,7 @@ def revert_trade(
         raise HTTPException(400, "Trade is already reverted")
 
     trade.reverted = True
+    analytics.record_trade(db, trade.original_card_id, trade.reward_card_id, sign=-1)
 
     # Original returns to deck (leave pool); reward returns to pool
     _adjust_pool(campaign_id, trade.original_card_id, -1, db)
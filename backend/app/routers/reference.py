@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.bundle import bundle_url
+from app.database import get_read_db
+from app.reference_cache import get_reference_bundle
+from app.schemas.reference import ReferenceBundleInfo
+
+router = APIRouter(prefix="/api/reference", tags=["reference"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+@router.get("", response_model=ReferenceBundleInfo)
+def get_reference_info(db: Session = Depends(get_read_db)):
+    """Hash and URL of the current card/storyline bundle.
+
+    The bundle's content never changes under a given URL, so clients only
+    download it again when the hash differs from the one they hold.
+    """
+    bundle = get_reference_bundle(db)
+    return ReferenceBundleInfo(hash=bundle.hash, url=bundle_url(bundle))
+
+
+@router.get("/{filename}", include_in_schema=False)
+def get_reference_bundle_file(filename: str, request: Request, db: Session = Depends(get_read_db)):
+    """Serve the bundle from the API when it is not published as a static file."""
+    bundle = get_reference_bundle(db)
+    if filename != bundle.filename:
+        raise HTTPException(404, "Unknown reference bundle")
+    return bundle.payload.response(request, headers={"Cache-Control": IMMUTABLE})
@@ -3,18 +3,21 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.dependencies import require_campaign_write
-from app.models.campaign import Campaign, CampaignReward
+from app.models.campaign import Campaign, CampaignReward, CampaignStatus
 from app.schemas.reward import RewardAdd, RewardResponse
+from app.serialization import Serializer
 
 router = APIRouter(prefix="/api/campaigns/{campaign_id}/rewards", tags=["rewards"])
 
+_rewards = Serializer(list[RewardResponse])
+
 
 @router.get("", response_model=list[RewardResponse])
 def list_rewards(campaign_id: int, db: Session = Depends(get_db)):
     campaign = db.get(Campaign, campaign_id)
-    if not campaign:
+    if not campaign or campaign.status == CampaignStatus.deleting:
         raise HTTPException(404, "Campaign not found")
-    return (
+    return _rewards.response(
         db.query(CampaignReward)
         .filter_by(campaign_id=campaign_id)
         .order_by(CampaignReward.card_name)
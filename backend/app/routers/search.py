@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.auth import get_current_user
+from app.database import get_db
+from app.dependencies import accessible_campaign_ids
+from app.models.campaign import Campaign, CampaignDay, Mission, NotableEvent
+from app.models.user import User
+from app.schemas.search import SearchResponse, SearchResult
+from app.serialization import Serializer
+
+router = APIRouter(prefix="/api/search", tags=["search"])
+
+_search = Serializer(SearchResponse)
+
+_HEADLINE_OPTIONS = "StartSel=**, StopSel=**, MaxWords=35, MinWords=15, MaxFragments=2"
+
+
+def _full_text(q: str):
+    """Match, rank and snippet builders using the generated tsvector columns (PostgreSQL)."""
+    tsquery = func.websearch_to_tsquery("english", q)
+    return (
+        lambda model, body: model.search_vector.op("@@")(tsquery),
+        lambda model: func.ts_rank(model.search_vector, tsquery),
+        lambda body: func.ts_headline("english", body, tsquery, _HEADLINE_OPTIONS),
+    )
+
+
+def _substring(q: str):
+    """Fallback for SQLite: every word of q must occur in the text; unranked, the whole text as snippet."""
+    words = q.replace('"', " ").split()
+    return (
+        lambda model, body: and_(*(body.icontains(w, autoescape=True) for w in words)),
+        lambda model: literal(0.0),
+        lambda body: body,
+    )
+
+
+@router.get("", response_model=SearchResponse)
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Full-text search over notable event text and mission names.
+
+    Only campaigns the caller can access are searched.  q accepts web-search
+    syntax ("quoted phrases", OR, -excluded).  Matches are ranked with
+    ts_rank against the GIN-indexed tsvector columns; snippets are only
+    generated for the returned page.  On SQLite, results are plain
+    case-insensitive substring matches on every word.
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+    match, rank, snippet = _full_text(q) if postgres else _substring(q)
+    visible = accessible_campaign_ids(current_user)
+
+    events = (
+        select(
+            literal("event").label("kind"),
+            NotableEvent.id.label("id"),
+            NotableEvent.campaign_id.label("campaign_id"),
+            CampaignDay.day_number.label("day_number"),
+            NotableEvent.text.label("body"),
+            rank(NotableEvent).label("rank"),
+        )
+        .join(CampaignDay, NotableEvent.day_id == CampaignDay.id)
+        .where(match(NotableEvent, NotableEvent.text), NotableEvent.campaign_id.in_(visible))
+    )
+    missions = (
+        select(
+            literal("mission").label("kind"),
+            Mission.id.label("id"),
+            Mission.campaign_id.label("campaign_id"),
+            CampaignDay.day_number.label("day_number"),
+            Mission.name.label("body"),
+            rank(Mission).label("rank"),
+        )
+        .outerjoin(CampaignDay, Mission.day_started_id == CampaignDay.id)
+        .where(match(Mission, Mission.name), Mission.campaign_id.in_(visible))
+    )
+
+    matches = union_all(events, missions).subquery()
+    page = (
+        select(matches)
+        .order_by(matches.c.rank.desc(), matches.c.kind, matches.c.id)
+        .limit(limit + 1)
+        .offset(offset)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            page.c.kind,
+            page.c.id,
+            page.c.campaign_id,
+            Campaign.name,
+            page.c.day_number,
+            page.c.rank,
+            snippet(page.c.body),
+        )
+        .join(Campaign, Campaign.id == page.c.campaign_id)
+        .order_by(page.c.rank.desc(), page.c.kind, page.c.id)
+    ).all()
+
+    results = [
+        SearchResult(
+            kind=kind,
+            id=id_,
+            campaign_id=campaign_id,
+            campaign_name=campaign_name,
+            day_number=day_number,
+            rank=rank,
+            snippet=snippet,
+        )
+        for kind, id_, campaign_id, campaign_name, day_number, rank, snippet in rows[:limit]
+    ]
+    next_offset = offset + limit if len(rows) > limit else None
+    return _search.response(SearchResponse(results=results, next_offset=next_offset))
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.database import get_read_db
+from app.decks import current_decklist
+from app.models.campaign import Campaign, CampaignStatus, DayStatus, NotableEvent
+from app.models.ranger import Ranger
+from app.reference_cache import get_card_library
+from app.schemas.ranger import CardRef, RangerResponse, TradeResponse
+from app.schemas.reward import RewardResponse
+from app.schemas.session import SessionResponse
+from app.serialization import Serializer
+
+router = APIRouter(prefix="/api/campaigns/{campaign_id}/session", tags=["session"])
+
+_session = Serializer(SessionResponse)
+
+
+def _ranger(ranger: Ranger, cards: dict[int, CardRef]) -> RangerResponse:
+    """RangerResponse with every card taken from the reference cache (no card queries)."""
+    trades = sorted(ranger.trades, key=lambda t: (t.created_at, t.id))
+    return RangerResponse(
+        id=ranger.id,
+        campaign_id=ranger.campaign_id,
+        name=ranger.name,
+        aspect_card_name=ranger.aspect_card_name,
+        awa=ranger.awa,
+        fit=ranger.fit,
+        foc=ranger.foc,
+        spi=ranger.spi,
+        background_set=ranger.background_set,
+        specialty_set=ranger.specialty_set,
+        personality_card_ids=ranger.personality_card_ids,
+        background_card_ids=ranger.background_card_ids,
+        specialty_card_ids=ranger.specialty_card_ids,
+        role_card=cards[ranger.role_card_id],
+        outside_interest_card=cards[ranger.outside_interest_card_id],
+        trades=[
+            TradeResponse(
+                id=t.id,
+                day_id=t.day_id,
+                original_card=cards[t.original_card_id],
+                reward_card=cards[t.reward_card_id],
+                reverted=t.reverted,
+                created_at=t.created_at,
+            )
+            for t in trades
+        ],
+        current_decklist=current_decklist(ranger, cards),
+    )
+
+
+@router.get("", response_model=SessionResponse)
+def get_session(campaign_id: int, db: Session = Depends(get_read_db)):
+    """Bootstrap a play session: campaign detail, rangers with decks, rewards and the current day's events.
+
+    Fixed query plan, independent of campaign size: the campaign joined to
+    its storyline, then one SELECT ... IN each for days, missions, rewards,
+    rangers and the rangers' trades, and one SELECT for the current day's
+    events (ix_notable_events_campaign_day_created).  Earlier days' events
+    are not included; page through them with GET .../events.  Cards come
+    from the reference cache.
+    """
+    campaign = (
+        db.query(Campaign)
+        .options(
+            joinedload(Campaign.storyline),
+            selectinload(Campaign.days),
+            selectinload(Campaign.missions),
+            selectinload(Campaign.rewards),
+            selectinload(Campaign.rangers).selectinload(Ranger.trades),
+        )
+        .filter(Campaign.id == campaign_id, Campaign.status != CampaignStatus.deleting)
+        .first()
+    )
+    if not campaign:
+        raise HTTPException(404, "Campaign not found")
+
+    cards = get_card_library(db).by_id
+    current_day = next((d for d in campaign.days if d.status == DayStatus.active), None)
+    events = []
+    if current_day is not None:
+        events = (
+            db.query(NotableEvent)
+            .filter(NotableEvent.campaign_id == campaign_id, NotableEvent.day_id == current_day.id)
+            .order_by(NotableEvent.created_at, NotableEvent.id)
+            .all()
+        )
+    return _session.response(dict(
+        id=campaign.id,
+        name=campaign.name,
+        status=campaign.status,
+        created_at=campaign.created_at,
+        owner_id=campaign.owner_id,
+        storyline=campaign.storyline,
+        current_day=current_day,
+        days=campaign.days,
+        missions=sorted(campaign.missions, key=lambda m: m.id),
+        rewards=sorted(
+            (
+                RewardResponse(
+                    id=r.id,
+                    card_id=r.card_id,
+                    card_name=r.card_name or (cards[r.card_id].name if r.card_id else None),
+                    quantity=r.quantity,
+                )
+                for r in campaign.rewards
+            ),
+            key=lambda r: r.card_name or "",
+        ),
+        notable_events=events,
+        rangers=[_ranger(r, cards) for r in sorted(campaign.rangers, key=lambda r: r.id)],
+    ))
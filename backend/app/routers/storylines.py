@@ -1,13 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models.storyline import Storyline
+from app.database import get_read_db
+from app.reference_cache import get_storylines_payload
 from app.schemas.storyline import StorylineResponse
 
 router = APIRouter(prefix="/api/storylines", tags=["storylines"])
 
 
 @router.get("", response_model=list[StorylineResponse])
-def list_storylines(db: Session = Depends(get_db)):
-    return db.query(Storyline).order_by(Storyline.name).all()
+def list_storylines(request: Request, db: Session = Depends(get_read_db)):
+    """List storylines with their day presets (served from the reference cache)."""
+    return get_storylines_payload(db).response(request)
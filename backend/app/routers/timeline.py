@@ -0,0 +1,147 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.campaign import Campaign, CampaignDay, CampaignStatus, DayStatus, Mission, NotableEvent
+from app.models.ranger import Ranger, RangerTrade
+from app.reference_cache import get_card_library
+from app.schemas.timeline import (
+    TimelineDay,
+    TimelineEvent,
+    TimelineMission,
+    TimelineResponse,
+    TimelineTrade,
+)
+from app.serialization import Serializer
+
+router = APIRouter(prefix="/api/campaigns/{campaign_id}/timeline", tags=["timeline"])
+
+_timeline = Serializer(TimelineResponse)
+
+
+def _count_by(column, *criteria):
+    """Subquery: (day_id, n) grouped by the given day foreign key column."""
+    return (
+        select(column.label("day_id"), func.count().label("n"))
+        .where(*criteria)
+        .group_by(column)
+        .subquery()
+    )
+
+
+def _mission(m: Mission) -> TimelineMission:
+    return TimelineMission(id=m.id, name=m.name, progress=m.progress, max_progress=m.max_progress)
+
+
+@router.get("", response_model=TimelineResponse)
+def get_timeline(
+    campaign_id: int,
+    day_from: int = Query(1, ge=1),
+    day_to: int | None = Query(None, ge=1),
+    limit: int = Query(10, ge=1, le=31),
+    include_upcoming: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Day-ordered campaign history: weather/location, events, trades and missions per day.
+
+    Pages through days in day_number order; follow next_day_number (as
+    day_from) until it is null.  Per-day counts come from one grouped
+    query; the day's items from one query per source, so a page costs a
+    fixed five queries.
+    """
+    campaign = db.get(Campaign, campaign_id)
+    if not campaign or campaign.status == CampaignStatus.deleting:
+        raise HTTPException(404, "Campaign not found")
+
+    # 1. Days in range with per-day counts (grouped aggregation, one statement)
+    events_n = _count_by(NotableEvent.day_id, NotableEvent.campaign_id == campaign_id)
+    trades_n = _count_by(
+        RangerTrade.day_id,
+        RangerTrade.ranger_id.in_(select(Ranger.id).where(Ranger.campaign_id == campaign_id)),
+        RangerTrade.reverted.is_(False),
+    )
+    started_n = _count_by(Mission.day_started_id, Mission.campaign_id == campaign_id)
+    completed_n = _count_by(Mission.day_completed_id, Mission.campaign_id == campaign_id)
+
+    q = (
+        select(
+            CampaignDay,
+            func.coalesce(events_n.c.n, 0),
+            func.coalesce(trades_n.c.n, 0),
+            func.coalesce(started_n.c.n, 0),
+            func.coalesce(completed_n.c.n, 0),
+        )
+        .outerjoin(events_n, events_n.c.day_id == CampaignDay.id)
+        .outerjoin(trades_n, trades_n.c.day_id == CampaignDay.id)
+        .outerjoin(started_n, started_n.c.day_id == CampaignDay.id)
+        .outerjoin(completed_n, completed_n.c.day_id == CampaignDay.id)
+        .where(CampaignDay.campaign_id == campaign_id, CampaignDay.day_number >= day_from)
+        .order_by(CampaignDay.day_number)
+        .limit(limit + 1)
+    )
+    if day_to is not None:
+        q = q.where(CampaignDay.day_number <= day_to)
+    if not include_upcoming:
+        q = q.where(CampaignDay.status != DayStatus.upcoming)
+
+    rows = db.execute(q).all()
+    next_day_number = rows[limit][0].day_number if len(rows) > limit else None
+    rows = rows[:limit]
+
+    days: dict[int, TimelineDay] = {}
+    for day, n_events, n_trades, n_started, n_completed in rows:
+        days[day.id] = TimelineDay(
+            day_id=day.id,
+            day_number=day.day_number,
+            weather=day.weather,
+            status=day.status,
+            location=day.location,
+            path_terrain=day.path_terrain,
+            event_count=n_events,
+            trade_count=n_trades,
+            missions_started_count=n_started,
+            missions_completed_count=n_completed,
+        )
+    day_ids = list(days)
+
+    if day_ids:
+        # 2. Events
+        for e in (
+            db.query(NotableEvent)
+            .filter(NotableEvent.day_id.in_(day_ids))
+            .order_by(NotableEvent.created_at, NotableEvent.id)
+        ):
+            days[e.day_id].events.append(TimelineEvent(id=e.id, text=e.text, created_at=e.created_at))
+
+        # 3. Trades, with ranger names; cards come from the reference cache
+        cards = get_card_library(db).by_id
+        for t, ranger_name in (
+            db.query(RangerTrade, Ranger.name)
+            .join(Ranger, RangerTrade.ranger_id == Ranger.id)
+            .filter(RangerTrade.day_id.in_(day_ids))
+            .order_by(RangerTrade.created_at, RangerTrade.id)
+        ):
+            days[t.day_id].trades.append(TimelineTrade(
+                id=t.id,
+                ranger_id=t.ranger_id,
+                ranger_name=ranger_name,
+                original_card=cards[t.original_card_id],
+                reward_card=cards[t.reward_card_id],
+                reverted=t.reverted,
+                created_at=t.created_at,
+            ))
+
+        # 4. Missions started or completed on these days
+        for m in (
+            db.query(Mission)
+            .filter(Mission.campaign_id == campaign_id)
+            .filter(Mission.day_started_id.in_(day_ids) | Mission.day_completed_id.in_(day_ids))
+            .order_by(Mission.id)
+        ):
+            if m.day_started_id in days:
+                days[m.day_started_id].missions_started.append(_mission(m))
+            if m.day_completed_id in days:
+                days[m.day_completed_id].missions_completed.append(_mission(m))
+
+    return _timeline.response(TimelineResponse(days=list(days.values()), next_day_number=next_day_number))
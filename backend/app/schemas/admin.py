@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SlowQueryResponse(BaseModel):
+    fingerprint: str
+    statement: str                  # normalized: literals and parameters shown as ?
+    calls: int
+    total_ms: float
+    mean_ms: float
+    max_ms: float
+    first_seen: datetime
+    last_seen: datetime
+    last_plan: str | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProfileResponse(BaseModel):
+    """A collapsed-stack profile written by app.profiling."""
+    id: str                         # file name; download at /api/admin/profiles/{id}
+    size: int                       # bytes
+    created_at: datetime
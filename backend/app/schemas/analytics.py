@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+
+from app.schemas.ranger import CardRef
+
+
+class CardPickResponse(BaseModel):
+    card: CardRef
+    picks: int
+
+
+class TradePairResponse(BaseModel):
+    original_card: CardRef
+    reward_card: CardRef
+    trades: int
+
+
+class AnalyticsResponse(BaseModel):
+    """Server-wide stats across every campaign."""
+    rangers: int
+    trades: int                    # non-reverted
+    days_completed: int
+    avg_trades_per_day: float      # trades / days_completed
+    top_picks: dict[str, list[CardPickResponse]]   # slot → most-picked cards
+    top_trades: list[TradePairResponse]
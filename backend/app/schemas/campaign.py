@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.schemas.event import EventResponse
 from app.schemas.mission import MissionResponse
@@ -54,9 +54,16 @@ class CampaignResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+_OMITTED = "Absent from the response when ?include= leaves this section out."
+
+
 class CampaignDetailResponse(CampaignResponse):
-    """Full detail — includes days, missions, rewards, and notable events."""
-    days: list[DayResponse] = []
-    missions: list[MissionResponse] = []
-    rewards: list[RewardResponse] = []
-    notable_events: list[EventResponse] = []
+    """Full detail — includes days, missions, rewards, and notable events.
+
+    The four section keys are only present when selected by ?include=
+    (all of them when the parameter is omitted).
+    """
+    days: list[DayResponse] = Field([], description=_OMITTED)
+    missions: list[MissionResponse] = Field([], description=_OMITTED)
+    rewards: list[RewardResponse] = Field([], description=_OMITTED)
+    notable_events: list[EventResponse] = Field([], description=_OMITTED)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class JobAccepted(BaseModel):
+    """Returned with 202 when work is queued; poll GET /api/jobs/{job_id}."""
+    job_id: int
+
+
+class JobResponse(BaseModel):
+    id: int
+    kind: str
+    status: str                      # queued | running | succeeded | failed
+    attempts: int
+    max_attempts: int
+    result: dict[str, Any] | None = None
+    error: str | None = None         # last attempt's error
+    created_at: datetime
+    finished_at: datetime | None = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -59,6 +59,53 @@ class TradeCreate(BaseModel):
 
 # --- Responses ---
 
+class RangerOptionsResponse(BaseModel):
+    """Cards still available to a new ranger, grouped by deck slot."""
+    personality: list[CardRef] = []
+    background: list[CardRef] = []
+    specialty: list[CardRef] = []
+    role: list[CardRef] = []
+    outside_interest: list[CardRef] = []
+
+
+class RangerValidationResponse(BaseModel):
+    """Result of a dry-run ranger validation — every rule violation, not just the first."""
+    valid: bool
+    errors: list[str] = []
+
+
+class DeckResponse(BaseModel):
+    """A ranger's deck at the end of a campaign day (as_of_day=0: the starting deck)."""
+    ranger_id: int
+    as_of_day: int | None = None    # None = current deck
+    size: int
+    cards: list[DeckEntry]
+
+
+class DeckDiffResponse(BaseModel):
+    """Net deck change from the trades made on one campaign day."""
+    ranger_id: int
+    day_number: int
+    added: list[DeckEntry] = []     # quantity gained
+    removed: list[DeckEntry] = []   # quantity lost
+
+
+class RangerSummary(BaseModel):
+    """Name, stats and role of a ranger — no card lists, trades or decklist."""
+    id: int
+    campaign_id: int
+    name: str
+    aspect_card_name: str
+    awa: int
+    fit: int
+    foc: int
+    spi: int
+    background_set: str
+    specialty_set: str
+    role_card: CardRef
+    trade_count: int     # non-reverted trades
+
+
 class RangerResponse(BaseModel):
     id: int
     campaign_id: int
@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class ReferenceBundleInfo(BaseModel):
+    """Current version of the static card/storyline bundle."""
+    hash: str
+    url: str      # fetch once per hash; the response is immutable
@@ -8,7 +8,8 @@ class RewardAdd(BaseModel):
 
 class RewardResponse(BaseModel):
     id: int
-    card_name: str
+    card_name: str | None = None   # None for pool entries linked by card_id (traded cards)
+    card_id: int | None = None
     quantity: int
 
     model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,18 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchResult(BaseModel):
+    kind: Literal["event", "mission"]
+    id: int
+    campaign_id: int
+    campaign_name: str
+    day_number: int | None = None   # event day, or the day a mission was started
+    rank: float
+    snippet: str                    # matched terms wrapped in ** … **
+
+
+class SearchResponse(BaseModel):
+    results: list[SearchResult]
+    next_offset: int | None = None
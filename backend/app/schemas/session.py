@@ -0,0 +1,16 @@
+from pydantic import Field
+
+from app.schemas.campaign import CampaignDetailResponse
+from app.schemas.event import EventResponse
+from app.schemas.ranger import RangerResponse
+
+
+class SessionResponse(CampaignDetailResponse):
+    """Everything the campaign hub and day-close pages need to render, in one response.
+
+    Campaign detail (current day, days, missions, rewards pool) plus every
+    ranger with trades and current deck.  notable_events holds only the
+    current day's events, in creation order (empty when no day is active).
+    """
+    notable_events: list[EventResponse] = Field([], description="The current day's events only, in creation order.")
+    rangers: list[RangerResponse] = []
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.ranger import CardRef
+
+
+class TimelineEvent(BaseModel):
+    id: int
+    text: str
+    created_at: datetime
+
+
+class TimelineTrade(BaseModel):
+    id: int
+    ranger_id: int
+    ranger_name: str
+    original_card: CardRef
+    reward_card: CardRef
+    reverted: bool
+    created_at: datetime
+
+
+class TimelineMission(BaseModel):
+    id: int
+    name: str
+    progress: int
+    max_progress: int
+
+
+class TimelineDay(BaseModel):
+    """Everything that happened on one campaign day."""
+    day_id: int
+    day_number: int
+    weather: str
+    status: str
+    location: str | None = None
+    path_terrain: str | None = None
+    event_count: int = 0
+    trade_count: int = 0            # non-reverted trades
+    missions_started_count: int = 0
+    missions_completed_count: int = 0
+    events: list[TimelineEvent] = []
+    trades: list[TimelineTrade] = []
+    missions_started: list[TimelineMission] = []
+    missions_completed: list[TimelineMission] = []
+
+
+class TimelineResponse(BaseModel):
+    days: list[TimelineDay]
+    next_day_number: int | None = None   # pass as day_from to fetch the next page
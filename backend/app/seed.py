@@ -1,12 +1,22 @@
 """Seed reference data: card library and storylines.
 
-This runs once at startup. If the data is already present it does nothing,
-so it is safe to call on every boot.
+The definitions below are the source of truth.  seed_reference_data() runs
+at every startup and syncs them into the database: new and corrected cards
+and storylines are upserted in one transaction, keeping existing IDs.  A
+content hash of the definitions is stored in reference_data_state, so when
+nothing has changed the sync costs a single lookup.
 """
 
-from sqlalchemy.orm import Session
+import hashlib
+from datetime import datetime
 
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import upsert
 from app.models.card import Card
+from app.models.reference import ReferenceDataState
 from app.models.storyline import Storyline, StorylineDayPreset
 
 
@@ -202,43 +212,120 @@ _LOTV_WEATHER = (
 )
 
 
+STORYLINES = [
+    dict(
+        name="Lore of the Valley",
+        min_rangers=1,
+        max_rangers=4,
+        day_presets=[dict(day_number=day_num, weather=weather) for day_num, weather in _LOTV_WEATHER],
+    ),
+]
+
+
 # ---------------------------------------------------------------------------
-# Seed function
+# Sync
 # ---------------------------------------------------------------------------
 
-def seed_reference_data(db: Session) -> None:
-    """Insert cards and storylines if they don't already exist."""
-
-    # --- Cards ---
-    if db.query(Card).count() == 0:
-        db.bulk_insert_mappings(Card, ALL_CARDS)
-        db.flush()
-        print(f"[seed] Inserted {len(ALL_CARDS)} cards.")
-    else:
-        print("[seed] Cards already present, skipping.")
-
-    # --- Lore of the Valley storyline ---
-    if not db.query(Storyline).filter_by(name="Lore of the Valley").first():
-        storyline = Storyline(
-            name="Lore of the Valley",
-            min_rangers=1,
-            max_rangers=4,
-        )
-        db.add(storyline)
-        db.flush()
-
-        presets = [
-            StorylineDayPreset(
-                storyline_id=storyline.id,
-                day_number=day_num,
-                weather=weather,
-            )
-            for day_num, weather in _LOTV_WEATHER
-        ]
-        db.bulk_save_objects(presets)
-        db.flush()
-        print(f"[seed] Inserted storyline 'Lore of the Valley' with {len(presets)} day presets.")
-    else:
-        print("[seed] Storyline 'Lore of the Valley' already present, skipping.")
+_STATE_KEY = "seed"
+_SYNC_LOCK_ID = 4_102_025   # pg advisory lock: one process syncs at a time
+
+_CARD_FIELDS = ("card_type", "source_set", "aspect", "cost", "tags", "is_expert")
+_STORYLINE_FIELDS = ("min_rangers", "max_rangers")
+_PRESET_FIELDS = ("weather", "default_location", "default_path_terrain")
+
+
+def reference_hash() -> str:
+    """sha256 of the card and storyline definitions."""
+    content = orjson.dumps({"cards": ALL_CARDS, "storylines": STORYLINES}, option=orjson.OPT_SORT_KEYS)
+    return hashlib.sha256(content).hexdigest()
+
+
+def _apply(obj, values: dict, fields: tuple[str, ...]) -> bool:
+    """Copy differing fields onto obj; returns True if anything changed."""
+    changed = False
+    for field in fields:
+        if getattr(obj, field) != values.get(field):
+            setattr(obj, field, values.get(field))
+            changed = True
+    return changed
+
+
+def _sync_cards(db: Session) -> int:
+    """Upsert new and changed cards (matched by name); returns how many."""
+    existing = {
+        row.name: row
+        for row in db.execute(select(Card.name, *(getattr(Card, f) for f in _CARD_FIELDS)))
+    }
+    changed = [
+        c for c in ALL_CARDS
+        if c["name"] not in existing or any(getattr(existing[c["name"]], f) != c[f] for f in _CARD_FIELDS)
+    ]
+    if changed:
+        stmt = upsert(db, Card).values(changed)
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[Card.name],
+            set_={f: stmt.excluded[f] for f in _CARD_FIELDS},
+        ))
+
+    # Never deleted: rangers' decks and trades reference cards by id
+    retired = existing.keys() - {c["name"] for c in ALL_CARDS}
+    if retired:
+        print(f"[seed] {len(retired)} card(s) no longer defined, kept: {', '.join(sorted(retired))}")
+    return len(changed)
+
+
+def _sync_storylines(db: Session) -> int:
+    """Create or correct storylines and their day presets (matched by name / day); returns rows changed."""
+    changes = 0
+    existing = {
+        s.name: s
+        for s in db.query(Storyline).options(selectinload(Storyline.day_presets))
+    }
+    for spec in STORYLINES:
+        storyline = existing.get(spec["name"])
+        if storyline is None:
+            storyline = Storyline(name=spec["name"])
+            db.add(storyline)
+        changes += _apply(storyline, spec, _STORYLINE_FIELDS)
+
+        presets = {p.day_number: p for p in storyline.day_presets}
+        for preset in spec["day_presets"]:
+            current = presets.pop(preset["day_number"], None)
+            if current is None:
+                current = StorylineDayPreset(day_number=preset["day_number"])
+                storyline.day_presets.append(current)
+            changes += _apply(current, preset, _PRESET_FIELDS)
+        for stale in presets.values():
+            db.delete(stale)
+            changes += 1
+    db.flush()
+    return changes
+
+
+def seed_reference_data(db: Session) -> bool:
+    """Sync cards and storylines with the definitions above; returns True if anything was written."""
+    content_hash = reference_hash()
+    state = db.get(ReferenceDataState, _STATE_KEY)
+    if state is not None and state.content_hash == content_hash:
+        print("[seed] Reference data up to date.")
+        return False
+
+    # Another process may be syncing the same release; wait for it and re-check.
+    # (SQLite has no advisory locks, but it serialises writers on the whole file.)
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(_SYNC_LOCK_ID)))
+    state = db.get(ReferenceDataState, _STATE_KEY, populate_existing=True)
+    if state is not None and state.content_hash == content_hash:
+        db.commit()
+        return False
 
+    cards = _sync_cards(db)
+    storylines = _sync_storylines(db)
+    if state is None:
+        state = ReferenceDataState(name=_STATE_KEY)
+        db.add(state)
+    state.content_hash = content_hash
+    state.applied_at = datetime.utcnow()
     db.commit()
+    print(f"[seed] Reference data synced: {cards} card(s), {storylines} storyline row(s) changed.")
+    return True
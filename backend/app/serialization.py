@@ -0,0 +1,40 @@
+"""Fast JSON response path for large payloads.
+
+FastAPI's default path hops to the threadpool to validate a sync endpoint's
+return value against response_model, serializes it, and renders it with the
+standard-library json module.  For the card library, ranger lists with
+nested decklists and the export document that dominates request CPU time.
+
+Endpoints that return big payloads instead build a module-level Serializer
+once (the pydantic TypeAdapter schema is compiled at import time) and return
+serializer.response(obj), which validates in place and renders with orjson.
+The declared response_model stays on the route for the OpenAPI docs; FastAPI
+skips it because a Response instance is returned.
+"""
+
+from typing import Any, Generic, TypeVar, get_origin
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.tracing import span
+
+T = TypeVar("T")
+
+
+class Serializer(Generic[T]):
+    """Precompiled validator/serializer for one response type."""
+
+    def __init__(self, type_: type[T]):
+        self.adapter: TypeAdapter[T] = TypeAdapter(type_)
+        self.name = getattr(type_, "__qualname__", None) if get_origin(type_) is None else repr(type_)
+
+    def dump(self, obj: Any, **dump_kwargs) -> Any:
+        """Validate `obj` (ORM instances allowed) and return JSON-ready python data."""
+        with span(f"serialize {self.name}", "serialize"):
+            value = self.adapter.validate_python(obj, from_attributes=True)
+            return self.adapter.dump_python(value, **dump_kwargs)
+
+    def response(self, obj: Any, status_code: int = 200, headers: dict[str, str] | None = None,
+                 **dump_kwargs) -> ORJSONResponse:
+        return ORJSONResponse(self.dump(obj, **dump_kwargs), status_code=status_code, headers=headers)
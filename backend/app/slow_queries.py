@@ -0,0 +1,261 @@
+"""Slow-query log with optional EXPLAIN capture.
+
+Every statement on any engine that takes longer than settings.slow_query_ms
+is reduced to a fingerprint: whitespace collapsed, literals and bind
+parameters replaced by ?, and IN-lists of any length folded to (?).  Each
+slow execution is
+
+  * written as one JSON line to settings.slow_query_log_file (rotating),
+    with parameter values redacted to their types, and
+  * added to the slow_queries table (calls, total and max time per
+    fingerprint), so the heaviest statement shapes across all workers are
+    visible at GET /api/admin/slow-queries.
+
+When EXPLAIN capture is on (settings.slow_query_explain; by default
+everywhere except app_env=production) the slow statement is explained on
+the connection that ran it, inside a savepoint that is rolled back: SELECTs
+with EXPLAIN (ANALYZE, BUFFERS), which runs them a second time, and writes
+with plain EXPLAIN, which does not.  EXPLAIN prints the bound values, so
+before the plan is logged or stored the literals in its condition lines are
+replaced by ? (see redact_plan); costs, row counts and timings are kept.
+
+Table updates are batched per process and flushed at most every
+settings.slow_query_flush_seconds on a separate connection to the primary
+(settings.database_url), whichever engine ran the statement; the read
+replica is read-only.  Failures are logged and never affect the request.
+An in-memory SQLite database cannot be reached from a second connection,
+so there slow statements are only written to the log file.
+"""
+
+import hashlib
+import logging
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+
+import orjson
+from sqlalchemy import case, event, func, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import create_db_engine, is_in_memory, upsert
+from app.models.slow_query import SlowQuery
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|(?<!:):\w+")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+# Plan lines that print expressions, e.g. "Index Cond: (id = 5)" or "Filter: (name = 'Bold'::text)"
+_PLAN_EXPRESSION = re.compile(r"^(\s*(?!Rows Removed)(?:[\w-]+ )*(?:Cond|Filter|Key|Output): )(.*)$", re.MULTILINE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(statement: str) -> str:
+    s = _STRING.sub("?", statement)
+    s = _PLACEHOLDER.sub("?", s)
+    s = _NUMBER.sub("?", s)
+    s = _WHITESPACE.sub(" ", s).strip()
+    return _IN_LIST.sub("(?)", s)
+
+
+def fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:16]
+
+
+def redact(parameters):
+    """Parameter values replaced by their type names."""
+    if isinstance(parameters, dict):
+        return {k: f"<{type(v).__name__}>" for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [redact(p) if isinstance(p, (dict, list, tuple)) else f"<{type(p).__name__}>" for p in parameters]
+    return None
+
+
+def redact_plan(plan: str) -> str:
+    """EXPLAIN output with string and numeric literals in expressions replaced by ?."""
+    return _PLAN_EXPRESSION.sub(lambda m: m[1] + _NUMBER.sub("?", _STRING.sub("?", m[2])), plan)
+
+
+def explain_enabled() -> bool:
+    if settings.slow_query_explain is not None:
+        return settings.slow_query_explain
+    return settings.app_env != "production"
+
+
+# ---------------------------------------------------------------------------
+# Log file
+# ---------------------------------------------------------------------------
+
+_logger = logging.getLogger("app.slow_queries")
+_logger.propagate = False
+_log_path: str | None = None
+
+
+def _log(entry: dict) -> None:
+    global _log_path
+    path = settings.slow_query_log_file
+    if not path:
+        return
+    if path != _log_path:
+        for handler in list(_logger.handlers):
+            _logger.removeHandler(handler)
+            handler.close()
+        _logger.addHandler(RotatingFileHandler(path, maxBytes=10 * 1024 * 1024, backupCount=5))
+        _logger.setLevel(logging.INFO)
+        _log_path = path
+    _logger.info(orjson.dumps(entry).decode())
+
+
+# ---------------------------------------------------------------------------
+# EXPLAIN
+# ---------------------------------------------------------------------------
+
+def _explain(conn, statement: str, parameters) -> str | None:
+    if conn.dialect.name != "postgresql":
+        return None
+    verb = statement.lstrip().split(None, 1)[0].upper()
+    if verb == "EXPLAIN":
+        return None
+    prefix = "EXPLAIN (ANALYZE, BUFFERS) " if verb in ("SELECT", "WITH") else "EXPLAIN "
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(prefix + statement, parameters)
+            plan = redact_plan("\n".join(row[0] for row in cursor.fetchall()))
+        finally:
+            # Never keep side effects (or an aborted state) from the EXPLAIN
+            cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+        return plan
+    except Exception as exc:
+        return f"(EXPLAIN failed: {type(exc).__name__}: {exc})"
+    finally:
+        cursor.close()
+
+
+# ---------------------------------------------------------------------------
+# Aggregation
+# ---------------------------------------------------------------------------
+
+@dataclass
+class _Pending:
+    statement: str
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    last_plan: str | None = None
+
+
+_pending: dict[str, _Pending] = {}     # fingerprint → stats since last flush
+_pending_lock = threading.Lock()
+_last_flush = 0.0
+_writers: dict[str, Engine] = {}
+
+
+def _writer() -> Engine:
+    # Separate, unpooled engine on the primary: flushing must not take a
+    # connection from the app pool.  Keyed by URL so tests can repoint it.
+    url = settings.database_url
+    engine = _writers.get(url)
+    if engine is None:
+        engine = _writers[url] = create_db_engine(url, poolclass=NullPool)
+    return engine
+
+
+def flush() -> None:
+    """Write accumulated stats to the slow_queries table."""
+    global _last_flush
+    with _pending_lock:
+        batch = dict(_pending)
+        _pending.clear()
+        _last_flush = time.monotonic()
+    if not batch:
+        return
+    now = datetime.utcnow()
+    writer = _writer()
+    stmt = upsert(writer, SlowQuery).values([
+        dict(
+            fingerprint=fp, statement=p.statement, calls=p.calls, total_ms=p.total_ms, max_ms=p.max_ms,
+            first_seen=now, last_seen=now, last_plan=p.last_plan,
+        )
+        for fp, p in batch.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SlowQuery.fingerprint],
+        set_={
+            "calls": SlowQuery.calls + stmt.excluded.calls,
+            "total_ms": SlowQuery.total_ms + stmt.excluded.total_ms,
+            "max_ms": case((stmt.excluded.max_ms > SlowQuery.max_ms, stmt.excluded.max_ms), else_=SlowQuery.max_ms),
+            "last_seen": stmt.excluded.last_seen,
+            "last_plan": func.coalesce(stmt.excluded.last_plan, SlowQuery.last_plan),
+        },
+    )
+    try:
+        with writer.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                conn.execute(text("SET LOCAL lock_timeout = '1s'"))
+            conn.execute(stmt)
+    except Exception as exc:
+        _logger.warning("slow query flush failed: %s", exc)
+        print(f"[slow_queries] Flush failed: {exc}")
+
+
+def _record(conn, statement: str, parameters, executemany: bool, elapsed_ms: float) -> None:
+    normalized = normalize(statement)
+    fp = fingerprint(normalized)
+    plan = None if executemany or not explain_enabled() else _explain(conn, statement, parameters)
+    _log({
+        "at": datetime.utcnow().isoformat(),
+        "fingerprint": fp,
+        "ms": round(elapsed_ms, 2),
+        "statement": statement,
+        "parameters": redact(parameters),
+        "plan": plan,
+    })
+
+    if is_in_memory(settings.database_url):
+        return
+    with _pending_lock:
+        p = _pending.get(fp)
+        if p is None:
+            p = _pending[fp] = _Pending(statement=normalized)
+        p.calls += 1
+        p.total_ms += elapsed_ms
+        p.max_ms = max(p.max_ms, elapsed_ms)
+        if plan is not None:
+            p.last_plan = plan
+        due = time.monotonic() - _last_flush >= settings.slow_query_flush_seconds
+    if due:
+        flush()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if settings.slow_query_ms is not None:
+        conn.info.setdefault("slow_query_starts", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(context):
+    starts = context.connection.info.get("slow_query_starts") if context.connection is not None else None
+    if starts:
+        starts.pop()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("slow_query_starts")
+    if not starts:
+        return
+    elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+    if settings.slow_query_ms is None or elapsed_ms < settings.slow_query_ms or conn.engine in _writers.values():
+        return
+    try:
+        _record(conn, statement, parameters, executemany, elapsed_ms)
+    except Exception as exc:
+        _logger.warning("slow query capture failed: %s", exc)
@@ -0,0 +1,128 @@
+"""One-time process startup work, shared by the app lifespan and gunicorn.conf.py.
+
+Under a single `uvicorn` process the lifespan runs both steps.  Under
+gunicorn (see gunicorn.conf.py) the master runs them once before forking,
+so the schema/seed/analytics work is not repeated per worker and the warmed
+reference cache is inherited copy-on-write; the workers' lifespan then
+skips prepare_database() and warm_reference_cache() finds the cache full
+and the bundle already published.
+"""
+
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import AddConstraint, CreateColumn, CreateIndex
+
+from app import reference_cache
+from app.analytics import ensure_analytics_built
+from app.bundle import publish_bundle
+from app.compression import available_encodings
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.models.analytics import AnalyticsCounter
+from app.models.campaign import Mission, NotableEvent
+import app.models  # noqa: F401 — registers all models with Base
+from app.reference_cache import get_card_library, get_reference_bundle, get_storylines_payload
+from app.seed import seed_reference_data
+
+
+# Added to tables that already existed in earlier releases.  create_all()
+# only creates missing tables, so upgrade_schema() adds these to old databases.
+_ADDED_COLUMNS = (
+    Mission.__table__.c.search_vector,
+    NotableEvent.__table__.c.search_vector,
+)
+_ADDED_INDEXES = (
+    "ix_missions_search_vector",
+    "ix_notable_events_search_vector",
+    "ix_notable_events_campaign_day_created",
+    "ix_ranger_trades_ranger_day",
+)
+
+
+def upgrade_schema(conn) -> None:
+    """Add the columns and indexes in _ADDED_COLUMNS/_ADDED_INDEXES where missing (idempotent).
+
+    PostgreSQL only; SQLite databases postdate all of them.
+    """
+    if conn.dialect.name != "postgresql":
+        return
+    for column in _ADDED_COLUMNS:
+        ddl = CreateColumn(column).compile(dialect=conn.dialect)
+        conn.execute(text(f"ALTER TABLE {column.table.name} ADD COLUMN IF NOT EXISTS {ddl}"))
+    indexes = {ix.name: ix for table in Base.metadata.tables.values() for ix in table.indexes}
+    for name in _ADDED_INDEXES:
+        conn.execute(CreateIndex(indexes[name], if_not_exists=True))
+
+
+def upgrade_foreign_keys(conn) -> int:
+    """Recreate foreign keys whose ON DELETE rule differs from the models; returns how many.
+
+    create_all() never alters existing tables, so databases created before
+    the campaign foreign keys gained ON DELETE CASCADE are fixed up here.
+    PostgreSQL only (SQLite cannot alter constraints, and its databases
+    postdate the change).
+    """
+    if conn.dialect.name != "postgresql":
+        return 0
+    reflected = inspect(conn).get_multi_foreign_keys()
+    changed = 0
+    for table in Base.metadata.sorted_tables:
+        current = {tuple(fk["constrained_columns"]): fk for fk in reflected.get((None, table.name), [])}
+        for fk in table.foreign_key_constraints:
+            existing = current.get(tuple(fk.column_keys))
+            if existing is None or (existing["options"].get("ondelete") or "").upper() == (fk.ondelete or "").upper():
+                continue
+            conn.execute(text(f'ALTER TABLE {table.name} DROP CONSTRAINT "{existing["name"]}"'))
+            conn.execute(AddConstraint(fk))
+            changed += 1
+    return changed
+
+
+def upgrade_analytics_counters(conn) -> bool:
+    """Drop an analytics_counters table from before it was sharded; returns True if dropped.
+
+    Its rows are derived, so create_all() recreates the table and
+    ensure_analytics_built() refills it from the domain tables.
+    """
+    inspector = inspect(conn)
+    table = AnalyticsCounter.__tablename__
+    if not inspector.has_table(table) or "shard" in {c["name"] for c in inspector.get_columns(table)}:
+        return False
+    AnalyticsCounter.__table__.drop(conn)
+    return True
+
+
+def prepare_database() -> None:
+    """Create or upgrade the schema, seed reference data and build analytics if needed."""
+    with engine.begin() as conn:
+        if upgrade_analytics_counters(conn):
+            print("[startup] Dropped unsharded analytics_counters; rebuilding analytics.")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        upgrade_schema(conn)
+        if changed := upgrade_foreign_keys(conn):
+            print(f"[startup] Recreated {changed} foreign key(s) with ON DELETE rules.")
+    db = SessionLocal()
+    try:
+        if seed_reference_data(db):
+            reference_cache.invalidate()
+        ensure_analytics_built(db)
+    finally:
+        db.close()
+
+
+def warm_reference_cache() -> None:
+    """Load the card library and storylines (with day presets), precompressing the payloads.
+
+    Also publishes the reference bundle to settings.bundle_dir, if set.
+    """
+    db = SessionLocal()
+    try:
+        bundle = get_reference_bundle(db)
+        payloads = [get_card_library(db).payload, get_storylines_payload(db), bundle.payload]
+    finally:
+        db.close()
+    for payload in payloads:
+        for encoding in available_encodings():
+            payload.variant(encoding)
+    if settings.bundle_dir:
+        publish_bundle(bundle, settings.bundle_dir)
@@ -0,0 +1,203 @@
+"""Request and SQL tracing in Chrome trace-event format.
+
+When settings.tracing_enabled, TracingMiddleware samples a fraction
+(settings.trace_sample_rate) of API requests.  For a sampled request every
+span below is recorded as a "complete" event and written out when the
+request finishes:
+
+    request      the whole request, named "<METHOD> <route template>"
+    dependency   auth / access-control dependencies (@traced)
+    sql          every statement on any engine (cursor execute → return)
+    decks        deck derivation (app.decks.current_decklist)
+    serialize    app.serialization.Serializer.dump
+
+settings.trace_output is "stdout" (one JSON event per line, for a log
+collector) or a file path.  The file is a JSON array without its closing
+bracket, which chrome://tracing, Perfetto and speedscope all load as-is,
+so traces can be inspected offline.  Each request gets its own track
+(tid) and its id is returned in the X-Trace-Id response header.
+
+Unsampled requests pay for one ContextVar lookup per span.
+"""
+
+import functools
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import orjson
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+_SQL_MAX_CHARS = 2000
+
+_PID = os.getpid()
+_ids = itertools.count(1)
+_write_lock = threading.Lock()
+
+
+def _reset_after_fork() -> None:
+    # gunicorn's preload_app imports this module in the master; without this
+    # every worker would report the master's pid and reuse the same trace ids.
+    global _PID, _ids, _write_lock
+    _PID = os.getpid()
+    _ids = itertools.count(1)
+    _write_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class Trace:
+    """Spans recorded for one sampled request."""
+
+    def __init__(self):
+        self.id = next(_ids)
+        self.events: list[dict] = []
+
+    def add(self, name: str, cat: str, start: float, end: float, args: dict | None = None) -> None:
+        self.events.append({
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round(start * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": _PID,
+            "tid": self.id,
+            "args": args or {},
+        })
+
+
+_current: ContextVar[Trace | None] = ContextVar("trace", default=None)
+
+
+def current_trace() -> Trace | None:
+    return _current.get()
+
+
+@contextmanager
+def span(name: str, cat: str, **args):
+    """Record the enclosed block as a span of the current trace, if any."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, cat, start, time.perf_counter(), args)
+
+
+def traced(cat: str, name: str | None = None):
+    """Decorator: record each call of a sync function as a span.
+
+    Safe on FastAPI dependencies — functools.wraps keeps the signature
+    FastAPI inspects for parameters.
+    """
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return fn(*args, **kwargs)
+            with span(label, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def export(trace: Trace) -> None:
+    lines = b"".join(orjson.dumps(e) + b",\n" for e in trace.events)
+    output = settings.trace_output
+    with _write_lock:
+        if output == "stdout":
+            sys.stdout.buffer.write(lines.replace(b",\n", b"\n"))
+            sys.stdout.flush()
+            return
+        with open(output, "ab") as f:
+            if f.tell() == 0:
+                f.write(b"[\n")
+            f.write(lines)
+
+
+# ---------------------------------------------------------------------------
+# SQL statements
+# ---------------------------------------------------------------------------
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("trace_starts", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _current.get()
+    starts = conn.info.get("trace_starts")
+    if trace is None or not starts:
+        return
+    start = starts.pop()
+    trace.add(
+        statement.split(None, 1)[0].upper() if statement else "SQL",
+        "sql",
+        start,
+        time.perf_counter(),
+        {"statement": statement[:_SQL_MAX_CHARS], "rows": cursor.rowcount},
+    )
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+class TracingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not settings.tracing_enabled
+            or not scope["path"].startswith("/api/")
+            or random.random() >= settings.trace_sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current.set(trace)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Trace-Id"] = f"{_PID}-{trace.id}"
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end = time.perf_counter()
+            _current.reset(token)
+            route = scope.get("route")
+            template = getattr(route, "path", scope["path"])
+            trace.add(f"{scope['method']} {template}", "request", start, end,
+                      {"path": scope["path"], "status": status})
+            export(trace)
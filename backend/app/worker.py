@@ -0,0 +1,41 @@
+"""Background job worker: `python -m app.worker`.
+
+Runs jobs from the jobs table until interrupted (see app/jobs.py).  Start
+as many as needed; they coordinate through row locks.  `--burst` drains
+the queue once and exits, which is handy for cron and for debugging.
+"""
+
+import argparse
+import signal
+import time
+
+from app import jobs
+from app.config import settings
+
+_stopping = False
+
+
+def _stop(signum, frame):
+    global _stopping
+    _stopping = True
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.worker", description=__doc__.splitlines()[0])
+    parser.add_argument("--burst", action="store_true", help="exit once the queue is empty")
+    args = parser.parse_args(argv)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    print(f"[worker] Started; handlers: {', '.join(sorted(jobs.HANDLERS))}")
+    while not _stopping:
+        if jobs.run_next():
+            continue
+        if args.burst:
+            break
+        time.sleep(settings.job_poll_seconds)
+    print("[worker] Stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: FastAPI default response path vs. the Serializer/orjson path.
+
+Builds synthetic payloads shaped like the real large responses — the full
+card library and a four-ranger campaign with 30 days of trades — and times
+both paths end to end (validation + serialization + rendering to bytes).
+No database is needed.
+
+Run from backend/:
+    python -m benchmarks.bench_serialization
+"""
+
+import asyncio
+import os
+import timeit
+from datetime import datetime
+from types import SimpleNamespace
+
+os.environ.setdefault("JWT_SECRET", "benchmark")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.schemas.card import CardResponse  # noqa: E402
+from app.schemas.ranger import RangerResponse  # noqa: E402
+from app.seed import ALL_CARDS  # noqa: E402
+from app.serialization import Serializer  # noqa: E402
+
+
+def _cards():
+    return [SimpleNamespace(id=i, **c) for i, c in enumerate(ALL_CARDS, start=1)]
+
+
+def _rangers(cards, trades_per_ranger=60):
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    rangers = []
+    for r in range(4):
+        deck = cards[r * 15:r * 15 + 15]
+        trades = [
+            SimpleNamespace(
+                id=r * 1000 + t, day_id=t % 30 + 1,
+                original_card=deck[t % len(deck)], reward_card=cards[(t * 7) % len(cards)],
+                reverted=t % 5 == 0, created_at=now,
+            )
+            for t in range(trades_per_ranger)
+        ]
+        rangers.append(SimpleNamespace(
+            id=r + 1, campaign_id=1, name=f"Ranger {r}", aspect_card_name="Sun Warden",
+            awa=2, fit=3, foc=2, spi=3, background_set="Artisan", specialty_set="Artificer",
+            personality_card_ids=[c.id for c in deck[:4]],
+            background_card_ids=[c.id for c in deck[4:9]],
+            specialty_card_ids=[c.id for c in deck[9:14]],
+            role_card=deck[14], outside_interest_card=deck[0], trades=trades,
+            current_decklist=[SimpleNamespace(card=c, quantity=2) for c in deck],
+        ))
+    return rangers
+
+
+def _default_path(type_):
+    field = create_model_field("Response", type_, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def run(obj):
+        content = loop.run_until_complete(serialize_response(field=field, response_content=obj))
+        return JSONResponse(content).body
+
+    return run
+
+
+def _fast_path(type_):
+    serializer = Serializer(type_)
+    return lambda obj: serializer.response(obj).body
+
+
+def main(number: int = 200) -> None:
+    cards = _cards()
+    cases = [
+        ("GET /api/cards", list[CardResponse], cards),
+        ("GET /rangers (4 rangers, 60 trades each)", list[RangerResponse], _rangers(cards)),
+    ]
+    for label, type_, obj in cases:
+        default, fast = _default_path(type_), _fast_path(type_)
+        assert len(default(obj)) > 0 and len(fast(obj)) > 0
+        t_default = min(timeit.repeat(lambda: default(obj), number=number, repeat=3)) / number
+        t_fast = min(timeit.repeat(lambda: fast(obj), number=number, repeat=3)) / number
+        print(
+            f"{label:45s} default {t_default * 1e3:7.3f} ms   "
+            f"fast {t_fast * 1e3:7.3f} ms   speedup {t_default / t_fast:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Production serving profile: gunicorn managing uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The app is imported once in the master (preload_app).  Before any worker
+is forked the master creates/seeds the schema, builds analytics and warms
+the reference cache (card library, storylines + day presets, precompressed
+payloads), then freezes the heap so the forked workers share those pages
+copy-on-write.  Workers skip the startup tasks in their own lifespan.
+
+Tuning via environment:
+    WEB_CONCURRENCY     number of workers (default: usable CPU cores)
+    GUNICORN_BIND       listen address (default 0.0.0.0:8000)
+    GUNICORN_TIMEOUT    seconds before a silent worker is killed and replaced (default 60)
+    GUNICORN_GRACEFUL_TIMEOUT   seconds a worker gets to finish in-flight requests on restart (default 30)
+    GUNICORN_MAX_REQUESTS       recycle a worker after this many requests, 0 = never (default 0)
+    PROMETHEUS_MULTIPROC_DIR    where workers share metrics samples (default /tmp/prometheus-multiproc)
+
+Send SIGHUP to the master for a graceful reload of all workers.
+"""
+
+import gc
+import os
+import shutil
+
+# Workers must not repeat the startup tasks the master runs in when_ready.
+# Set before the app (and app.config.settings) is imported by preload_app.
+os.environ["RUN_STARTUP_TASKS"] = "false"
+
+# Multi-process metrics (see app/metrics.py); must be set before prometheus_client
+# is imported.  Samples from a previous run are stale, so start empty.
+_metrics_dir = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+shutil.rmtree(_metrics_dir, ignore_errors=True)
+os.makedirs(_metrics_dir)
+
+
+def _default_workers() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        return os.cpu_count() or 1
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.environ.get("WEB_CONCURRENCY", _default_workers()))
+preload_app = True
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+forwarded_allow_ips = "*"   # behind nginx
+
+
+def when_ready(server):
+    """Runs in the master after the app is preloaded, before workers are spawned."""
+    from app.startup import prepare_database, warm_reference_cache
+
+    prepare_database()
+    warm_reference_cache()
+    server.log.info("Database prepared and reference cache warmed; forking %d workers", workers)
+
+    _dispose_engines()
+    # Move everything allocated so far out of the collector's reach so GC
+    # passes in the workers don't touch (and un-share) the inherited pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Connections opened by the master must never be used by a child
+    _dispose_engines(close=False)
+
+
+def child_exit(server, worker):
+    # Drop the dead worker's live gauges (in-flight requests, checked-out connections)
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def _dispose_engines(close: bool = True) -> None:
+    from app.database import engine, read_engine
+
+    engine.dispose(close=close)
+    if read_engine is not engine:
+        read_engine.dispose(close=close)
@@ -2,32 +2,46 @@
 Shared fixtures for the backend test suite.
 
 Tests run inside the backend container against a separate 'earthborne_test'
-database so the production data volume is never touched.
+database so the production data volume is never touched.  Without
+TEST_DATABASE_URL they run against an in-memory SQLite database, skipping
+the tests marked `postgres`.
 
 Run with:
     docker compose exec backend pytest tests/ -v
+    pytest tests/        # locally, no database server needed
 """
 
 import os
 
 import pytest
-from sqlalchemy import create_engine, text
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from starlette.testclient import TestClient
 
 import app.models  # noqa: F401 — registers all models with Base
 from app.auth import get_current_user, hash_password
-from app.database import Base, get_db
+from app.config import settings
+from app.database import Base, create_db_engine, get_db, get_read_db
 from app.main import app
 from app.models.card import Card
 from app.models.storyline import Storyline
 from app.models.user import User
 from app.seed import seed_reference_data
 
-TEST_DATABASE_URL = os.getenv(
-    "TEST_DATABASE_URL",
-    "postgresql://rangers:rangers@db:5432/earthborne_test",
-)
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "sqlite://")
+
+# Seeded by the engine fixture and kept between tests
+REFERENCE_TABLES = {"cards", "storylines", "storyline_day_presets", "reference_data_state"}
+
+
+def pytest_collection_modifyitems(config, items):
+    if make_url(TEST_DATABASE_URL).get_backend_name() == "postgresql":
+        return
+    skip = pytest.mark.skip(reason="needs PostgreSQL (set TEST_DATABASE_URL)")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
 
 
 # ---------------------------------------------------------------------------
@@ -36,7 +50,7 @@ TEST_DATABASE_URL = os.getenv(
 
 @pytest.fixture(scope="session")
 def engine():
-    eng = create_engine(TEST_DATABASE_URL)
+    eng = create_db_engine(TEST_DATABASE_URL)
     Base.metadata.create_all(bind=eng)
     _seed(eng)
     yield eng
@@ -82,7 +96,7 @@ def storyline_id(engine):
 @pytest.fixture
 def client(engine):
     """
-    TestClient with get_db overridden to use the test database.
+    TestClient with get_db/get_read_db overridden to use the test database.
     A new session is created for each request, mirroring production behaviour.
     """
     TestSession = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -107,6 +121,7 @@ def client(engine):
         return User(id=user_id, username=user_username, hashed_password="x")
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
     # Do NOT use TestClient as a context manager — that triggers lifespan,
     # which would run create_all + seed against the test DB a second time.
@@ -115,14 +130,42 @@ def client(engine):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def no_admission_limits(monkeypatch):
+    """Admission control is exercised in test_admission.py; keep it out of the way elsewhere."""
+    monkeypatch.setattr(settings, "admission_enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def no_slow_query_log(monkeypatch):
+    """The slow-query hook is exercised in test_slow_queries.py; fixture cleanup must not trigger it."""
+    monkeypatch.setattr(settings, "slow_query_ms", None)
+
+
 @pytest.fixture(autouse=True)
 def clean_campaigns(engine):
-    """Truncate all campaign-derived data and users after every test."""
+    """Delete everything except reference data (campaigns, analytics, idempotency keys, jobs, users …) after every test."""
     yield
-    with engine.connect() as conn:
-        conn.execute(text("TRUNCATE campaigns CASCADE"))
-        conn.execute(text("TRUNCATE users CASCADE"))
-        conn.commit()
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            if table.name not in REFERENCE_TABLES:
+                conn.execute(table.delete())
+
+
+@pytest.fixture
+def statements(engine):
+    """List that collects every SQL statement executed against the test DB.
+
+    Clear it right before the request under test to count its queries.
+    """
+    executed: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
 
 
 # ---------------------------------------------------------------------------
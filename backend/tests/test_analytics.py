@@ -0,0 +1,128 @@
+"""Tests for incrementally maintained server-wide analytics."""
+
+import pytest
+from sqlalchemy import func, inspect, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.analytics import counter_totals, rebuild, record_day_completed
+from app.database import create_db_engine
+from app.models.analytics import AnalyticsCounter
+from app.startup import upgrade_analytics_counters
+
+
+@pytest.fixture
+def ranger(client, campaign, ranger_payload):
+    r = client.post(f"/api/campaigns/{campaign['id']}/rangers", json=ranger_payload)
+    assert r.status_code == 201
+    return r.json()
+
+
+@pytest.fixture
+def trade(client, engine, campaign, ranger, card_ids):
+    with engine.connect() as conn:
+        conn.execute(
+            text("INSERT INTO campaign_rewards (campaign_id, card_id, quantity) VALUES (:cid, :card, 1)"),
+            {"cid": campaign["id"], "card": card_ids["Wrist-mounted Darter"]},
+        )
+        conn.commit()
+    day = next(d for d in campaign["days"] if d["status"] == "active")
+    r = client.post(
+        f"/api/campaigns/{campaign['id']}/rangers/{ranger['id']}/trades",
+        json={
+            "day_id": day["id"],
+            "original_card_id": card_ids["Universal Power Cells"],
+            "reward_card_id": card_ids["Wrist-mounted Darter"],
+        },
+    )
+    assert r.status_code == 201
+    return r.json()
+
+
+def _stats(client):
+    r = client.get("/api/analytics")
+    assert r.status_code == 200
+    return r.json()
+
+
+class TestAnalytics:
+    def test_empty(self, client):
+        data = _stats(client)
+        assert data["rangers"] == 0
+        assert data["trades"] == 0
+        assert data["avg_trades_per_day"] == 0.0
+        assert data["top_trades"] == []
+        assert data["top_picks"]["personality"] == []
+
+    def test_ranger_picks_counted(self, client, ranger):
+        data = _stats(client)
+        assert data["rangers"] == 1
+        personality = {p["card"]["name"]: p["picks"] for p in data["top_picks"]["personality"]}
+        assert personality == {"Insightful": 1, "Passionate": 1, "Meticulous": 1, "Persuasive": 1}
+        assert data["top_picks"]["role"][0]["card"]["name"] == "Masterful Engineer"
+
+    def test_trade_counted_and_reverted(self, client, campaign, ranger, trade):
+        data = _stats(client)
+        assert data["trades"] == 1
+        assert data["top_trades"][0]["original_card"]["name"] == "Universal Power Cells"
+        assert data["top_trades"][0]["reward_card"]["name"] == "Wrist-mounted Darter"
+
+        client.post(f"/api/campaigns/{campaign['id']}/rangers/{ranger['id']}/trades/{trade['id']}/revert")
+        data = _stats(client)
+        assert data["trades"] == 0
+        assert data["top_trades"] == []
+
+    def test_average_trades_per_day(self, client, campaign, trade):
+        day = next(d for d in campaign["days"] if d["status"] == "active")
+        client.post(
+            f"/api/campaigns/{campaign['id']}/days/{day['id']}/close",
+            json={"location": "Lone Tree Station", "path_terrain": "Woods"},
+        )
+        data = _stats(client)
+        assert data["days_completed"] == 1
+        assert data["avg_trades_per_day"] == 1.0
+
+    def test_campaign_delete_subtracts(self, client, campaign, trade):
+        client.delete(f"/api/campaigns/{campaign['id']}")
+        data = _stats(client)
+        assert data["rangers"] == 0
+        assert data["trades"] == 0
+        assert data["top_picks"]["personality"] == []
+
+    def test_rebuild_matches_incremental(self, client, engine, campaign, trade):
+        before = _stats(client)
+        db = sessionmaker(bind=engine)()
+        try:
+            rebuild(db)
+        finally:
+            db.close()
+        assert _stats(client) == before
+
+    def test_import_counted(self, client, campaign, trade):
+        exported = client.get(f"/api/campaigns/{campaign['id']}/export").json()
+        exported["campaign"]["rewards"] = []   # pool entries linked by card_id export without a name
+        client.delete(f"/api/campaigns/{campaign['id']}")
+        r = client.post("/api/campaigns/import", json=exported)
+        assert r.status_code == 201
+        data = _stats(client)
+        assert data["rangers"] == 1
+        assert data["trades"] == 1
+
+    def test_counters_are_sharded(self, engine):
+        db = sessionmaker(bind=engine)()
+        try:
+            for _ in range(50):
+                record_day_completed(db)
+            db.commit()
+            assert counter_totals(db)["days_completed"] == 50
+            rows = db.scalar(select(func.count()).where(AnalyticsCounter.name == "days_completed"))
+            assert rows > 1
+        finally:
+            db.close()
+
+    def test_unsharded_counters_table_is_replaced(self):
+        with create_db_engine("sqlite://").begin() as conn:
+            conn.execute(text("CREATE TABLE analytics_counters (name VARCHAR PRIMARY KEY, value INTEGER NOT NULL)"))
+            assert upgrade_analytics_counters(conn) is True
+            assert not inspect(conn).has_table("analytics_counters")
+            AnalyticsCounter.__table__.create(conn)
+            assert upgrade_analytics_counters(conn) is False
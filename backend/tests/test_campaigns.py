@@ -1,6 +1,13 @@
 """Tests for campaign CRUD endpoints."""
 
 import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import analytics, jobs
+from app.config import settings
+from app.models.campaign import CampaignDay, NotableEvent
+from app.models.ranger import Ranger
 
 
 class TestListCampaigns:
@@ -61,6 +68,40 @@ class TestGetCampaign:
         r = client.get("/api/campaigns/9999")
         assert r.status_code == 404
 
+    def test_include_subset(self, client, campaign):
+        r = client.get(f"/api/campaigns/{campaign['id']}", params={"include": "missions,notable_events"})
+        assert r.status_code == 200
+        data = r.json()
+        assert "missions" in data
+        assert "notable_events" in data
+        assert "days" not in data
+        assert "rewards" not in data
+        assert data["current_day"]["day_number"] == 1
+
+    def test_sections_are_optional_in_schema(self, client):
+        schema = client.get("/openapi.json").json()["components"]["schemas"]["CampaignDetailResponse"]
+        assert not {"days", "missions", "rewards", "notable_events"} & set(schema["required"])
+
+    def test_include_unknown_section(self, client, campaign):
+        r = client.get(f"/api/campaigns/{campaign['id']}", params={"include": "days,trades"})
+        assert r.status_code == 400
+
+    def test_fixed_query_count(self, client, campaign, statements):
+        """Detail loads in a fixed number of queries no matter how much data exists."""
+        day_id = campaign["current_day"]["id"]
+        for i in range(3):
+            client.post(f"/api/campaigns/{campaign['id']}/missions", json={"name": f"Mission {i}"})
+            client.post(f"/api/campaigns/{campaign['id']}/events", json={"day_id": day_id, "text": f"Event {i}"})
+            client.post(f"/api/campaigns/{campaign['id']}/rewards", json={"card_name": f"Card {i}"})
+
+        statements.clear()
+        client.get(f"/api/campaigns/{campaign['id']}")
+        assert len(statements) <= 5
+
+        statements.clear()
+        client.get(f"/api/campaigns/{campaign['id']}", params={"include": "missions"})
+        assert len(statements) <= 3
+
 
 class TestUpdateCampaign:
     def test_rename(self, client, campaign):
@@ -103,3 +144,62 @@ class TestDeleteCampaign:
         """Deleting a campaign should cascade to its days (no orphan errors)."""
         r = client.delete(f"/api/campaigns/{campaign['id']}")
         assert r.status_code == 204
+
+
+@pytest.fixture
+def populated(client, campaign, ranger_payload):
+    """The test campaign with a ranger and two notable events."""
+    cid = campaign["id"]
+    assert client.post(f"/api/campaigns/{cid}/rangers", json=ranger_payload).status_code == 201
+    for text in ("Crossed the river", "Met the biscuit crew"):
+        r = client.post(f"/api/campaigns/{cid}/events", json={"day_id": campaign["current_day"]["id"], "text": text})
+        assert r.status_code == 201
+    return campaign
+
+
+def _remaining(engine, campaign_id: int) -> int:
+    with engine.connect() as conn:
+        return sum(
+            conn.scalar(select(func.count()).where(model.campaign_id == campaign_id))
+            for model in (CampaignDay, Ranger, NotableEvent)
+        )
+
+
+class TestDeleteCascade:
+    def test_single_delete_statement(self, client, populated, engine, statements):
+        statements.clear()
+        assert client.delete(f"/api/campaigns/{populated['id']}").status_code == 204
+        deletes = [s for s in statements if s.startswith("DELETE")]
+        assert len(deletes) == 1
+        assert deletes[0].startswith("DELETE FROM campaigns")
+        assert _remaining(engine, populated["id"]) == 0
+        assert client.get("/api/analytics").json()["rangers"] == 0
+
+    def test_large_campaign_is_purged_in_background(self, client, populated, engine, monkeypatch):
+        monkeypatch.setattr(settings, "campaign_purge_threshold", 1)
+        monkeypatch.setattr(settings, "purge_batch_size", 1)
+        cid = populated["id"]
+        r = client.delete(f"/api/campaigns/{cid}")
+        assert r.status_code == 202
+        job_id = r.json()["job_id"]
+
+        # Hidden at once, and no longer counted
+        assert client.get(f"/api/campaigns/{cid}").status_code == 404
+        assert client.get(f"/api/campaigns/{cid}/events").status_code == 404
+        assert cid not in {c["id"] for c in client.get("/api/campaigns").json()}
+        assert client.get("/api/analytics").json()["rangers"] == 0
+        assert _remaining(engine, cid) > 0
+
+        sessions = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with sessions() as db:
+            analytics.rebuild(db)
+        assert client.get("/api/analytics").json()["rangers"] == 0
+
+        assert jobs.run_next(sessions) is True
+        assert client.get(f"/api/jobs/{job_id}").json()["status"] == "succeeded"
+        assert _remaining(engine, cid) == 0
+
+    def test_background_response_documented(self, client):
+        responses = client.get("/openapi.json").json()["paths"]["/api/campaigns/{campaign_id}"]["delete"]["responses"]
+        assert set(responses) >= {"202", "204"}
+        assert responses["202"]["content"]["application/json"]["schema"] == {"$ref": "#/components/schemas/JobAccepted"}
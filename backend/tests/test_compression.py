@@ -0,0 +1,98 @@
+"""Tests for response compression and precompressed reference payloads."""
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from app.compression import CompressionMiddleware, negotiate
+
+
+class TestNegotiate:
+    def test_prefers_brotli(self):
+        assert negotiate("gzip, deflate, br") == "br"
+
+    def test_gzip_only(self):
+        assert negotiate("gzip") == "gzip"
+
+    def test_respects_q_values(self):
+        assert negotiate("br;q=0.5, gzip;q=1.0") == "gzip"
+
+    def test_refused(self):
+        assert negotiate("br;q=0, gzip;q=0") is None
+
+    def test_identity(self):
+        assert negotiate("identity") is None
+        assert negotiate(None) is None
+
+
+class TestApiCompression:
+    def test_card_library_gzip(self, client):
+        r = client.get("/api/cards", headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+        assert r.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in r.headers["vary"]
+        assert len(r.json()) > 100
+
+    def test_card_library_brotli(self, client):
+        r = client.get("/api/cards", headers={"Accept-Encoding": "br"})
+        assert r.headers["content-encoding"] == "br"
+        assert len(r.json()) > 100
+
+    def test_uncompressed_when_not_accepted(self, client):
+        r = client.get("/api/cards", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in r.headers
+        assert len(r.json()) > 100
+
+    def test_filtered_list_compressed_by_middleware(self, client):
+        r = client.get("/api/cards", params={"card_type": "specialty"}, headers={"Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        assert all(c["card_type"] == "specialty" for c in r.json())
+
+    def test_small_response_not_compressed(self, client):
+        r = client.get("/api/campaigns", headers={"Accept-Encoding": "gzip"})
+        assert r.json() == []
+        assert "content-encoding" not in r.headers
+
+
+@pytest.fixture
+def bare_client():
+    big = {"items": ["x" * 50] * 100}
+
+    def full(request):
+        return JSONResponse(big)
+
+    def streamed(request):
+        async def chunks():
+            yield b'{"items": ['
+            yield b'"' + b"x" * 5000 + b'"'
+            yield b"]}"
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    def text(request):
+        return JSONResponse(big, media_type="text/plain")
+
+    app = Starlette(routes=[Route("/full", full), Route("/stream", streamed), Route("/text", text)])
+    app.add_middleware(CompressionMiddleware)
+    return TestClient(app)
+
+
+class TestMiddleware:
+    def test_compresses_complete_response(self, bare_client):
+        r = bare_client.get("/full", headers={"Accept-Encoding": "gzip"})
+        assert r.headers["content-encoding"] == "gzip"
+        assert int(r.headers["content-length"]) < len(r.content)
+
+    def test_skips_streaming_response(self, bare_client):
+        r = bare_client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers
+        assert r.content.startswith(b'{"items"')
+
+    def test_skips_content_type_not_allowed(self, bare_client):
+        r = bare_client.get("/text", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in r.headers
+
+    def test_gzip_round_trip(self, bare_client):
+        r = bare_client.get("/full", headers={"Accept-Encoding": "gzip"})
+        assert r.json()["items"][0] == "x" * 50
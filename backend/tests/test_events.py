@@ -1,6 +1,9 @@
 """Tests for notable event endpoints."""
 
 import pytest
+from sqlalchemy import inspect, text
+
+from app.startup import upgrade_schema
 
 
 @pytest.fixture
@@ -24,6 +27,55 @@ class TestListEvents:
         assert r.status_code == 200
         assert r.json() == []
 
+    def test_ordered_by_day_then_creation(self, client, campaign):
+        days = sorted(campaign["days"], key=lambda d: d["day_number"])
+        cid = campaign["id"]
+        for day, text in ((days[1], "second day"), (days[0], "first day, first"), (days[0], "first day, second")):
+            client.post(f"/api/campaigns/{cid}/events", json={"day_id": day["id"], "text": text})
+        r = client.get(f"/api/campaigns/{cid}/events")
+        assert [e["text"] for e in r.json()] == ["first day, first", "first day, second", "second day"]
+        assert "x-next-cursor" not in r.headers
+
+    def test_filter_by_day(self, client, campaign):
+        days = sorted(campaign["days"], key=lambda d: d["day_number"])
+        cid = campaign["id"]
+        client.post(f"/api/campaigns/{cid}/events", json={"day_id": days[0]["id"], "text": "one"})
+        client.post(f"/api/campaigns/{cid}/events", json={"day_id": days[1]["id"], "text": "two"})
+
+        by_id = client.get(f"/api/campaigns/{cid}/events", params={"day_id": days[1]["id"]}).json()
+        by_number = client.get(f"/api/campaigns/{cid}/events", params={"day_number": 2}).json()
+        assert [e["text"] for e in by_id] == ["two"]
+        assert by_number == by_id
+
+    def test_keyset_pagination(self, client, campaign, active_day_id):
+        cid = campaign["id"]
+        for i in range(5):
+            client.post(f"/api/campaigns/{cid}/events", json={"day_id": active_day_id, "text": f"event {i}"})
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"after": cursor} if cursor else {})}
+            r = client.get(f"/api/campaigns/{cid}/events", params=params)
+            assert r.status_code == 200
+            seen += [e["text"] for e in r.json()]
+            cursor = r.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+        assert seen == [f"event {i}" for i in range(5)]
+
+    def test_invalid_cursor(self, client, campaign):
+        r = client.get(f"/api/campaigns/{campaign['id']}/events", params={"after": "not-a-cursor"})
+        assert r.status_code == 400
+
+    @pytest.mark.postgres
+    def test_index_added_to_existing_database(self, engine):
+        with engine.connect() as conn, conn.begin() as tx:
+            conn.execute(text("DROP INDEX ix_notable_events_campaign_day_created"))
+            upgrade_schema(conn)
+            indexes = {ix["name"]: ix["column_names"] for ix in inspect(conn).get_indexes("notable_events")}
+            assert indexes["ix_notable_events_campaign_day_created"] == ["campaign_id", "day_id", "created_at", "id"]
+            tx.rollback()
+
 
 class TestCreateEvent:
     def test_creates_event(self, client, campaign, active_day_id):
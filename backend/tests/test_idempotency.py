@@ -0,0 +1,105 @@
+"""Tests for Idempotency-Key handling on mutating requests."""
+
+import threading
+import time
+from datetime import datetime
+
+import orjson
+import pytest
+from sqlalchemy import text
+
+from app.auth import create_access_token
+from app.config import settings
+from app.idempotency import _request_hash
+
+
+def _headers(key, username="testuser"):
+    return {"Authorization": f"Bearer {create_access_token(username)}", "Idempotency-Key": key}
+
+
+@pytest.fixture
+def rewards_url(campaign):
+    return f"/api/campaigns/{campaign['id']}/rewards"
+
+
+class TestIdempotency:
+    def test_retry_replays_stored_response(self, client, rewards_url):
+        body = {"card_name": "Wrist-mounted Darter", "quantity": 2}
+        first = client.post(rewards_url, json=body, headers=_headers("k1"))
+        second = client.post(rewards_url, json=body, headers=_headers("k1"))
+        assert first.status_code == second.status_code == 201
+        assert second.json() == first.json()
+        assert second.headers["idempotent-replayed"] == "true"
+        assert "idempotent-replayed" not in first.headers
+
+        rewards = client.get(rewards_url).json()
+        assert [r["quantity"] for r in rewards] == [2]
+
+    def test_without_key_applies_twice(self, client, rewards_url):
+        body = {"card_name": "Wrist-mounted Darter", "quantity": 2}
+        client.post(rewards_url, json=body)
+        client.post(rewards_url, json=body)
+        assert [r["quantity"] for r in client.get(rewards_url).json()] == [4]
+
+    def test_key_reused_for_different_request(self, client, rewards_url):
+        client.post(rewards_url, json={"card_name": "Wrist-mounted Darter", "quantity": 1}, headers=_headers("k1"))
+        r = client.post(rewards_url, json={"card_name": "Wrist-mounted Darter", "quantity": 5}, headers=_headers("k1"))
+        assert r.status_code == 422
+
+    def test_keys_are_per_user(self, client, rewards_url):
+        body = {"card_name": "Wrist-mounted Darter", "quantity": 1}
+        client.post(rewards_url, json=body, headers=_headers("k1", "testuser"))
+        r = client.post(rewards_url, json=body, headers=_headers("k1", "someone-else"))
+        assert "idempotent-replayed" not in r.headers
+        assert [r["quantity"] for r in client.get(rewards_url).json()] == [2]
+
+    def test_client_errors_are_replayed(self, client, rewards_url):
+        body = {"card_name": "  ", "quantity": 1}
+        first = client.post(rewards_url, json=body, headers=_headers("k1"))
+        second = client.post(rewards_url, json=body, headers=_headers("k1"))
+        assert first.status_code == second.status_code == 400
+        assert second.headers["idempotent-replayed"] == "true"
+
+
+class TestInFlightDuplicate:
+    @pytest.fixture
+    def pending(self, engine, rewards_url):
+        """A claimed, unfinished key for the request the test is about to send."""
+        body = orjson.dumps({"card_name": "Wrist-mounted Darter", "quantity": 1})
+        scope = {"method": "POST", "path": rewards_url, "query_string": b""}
+        with engine.connect() as conn:
+            conn.execute(
+                text(
+                    "INSERT INTO idempotency_keys (owner, key, request_hash, created_at) "
+                    "VALUES ('testuser', 'k1', :h, :t)"
+                ),
+                {"h": _request_hash(scope, body), "t": datetime.utcnow()},
+            )
+            conn.commit()
+        return body
+
+    def test_waits_for_original(self, client, engine, rewards_url, pending, monkeypatch):
+        monkeypatch.setattr(settings, "idempotency_wait_seconds", 5)
+
+        def finish():
+            time.sleep(0.3)
+            with engine.connect() as conn:
+                conn.execute(
+                    text("UPDATE idempotency_keys SET status_code = 201, content_type = 'application/json', body = :b"),
+                    {"b": b'{"from": "original"}'},
+                )
+                conn.commit()
+
+        t = threading.Thread(target=finish)
+        t.start()
+        r = client.post(rewards_url, content=pending, headers={**_headers("k1"), "Content-Type": "application/json"})
+        t.join()
+        assert r.status_code == 201
+        assert r.json() == {"from": "original"}
+        assert client.get(rewards_url).json() == []
+
+    def test_gives_up_with_409(self, client, rewards_url, pending, monkeypatch):
+        monkeypatch.setattr(settings, "idempotency_wait_seconds", 0.2)
+        r = client.post(rewards_url, content=pending, headers={**_headers("k1"), "Content-Type": "application/json"})
+        assert r.status_code == 409
+        assert r.headers["retry-after"] == "1"
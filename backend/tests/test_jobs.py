@@ -0,0 +1,228 @@
+"""Tests for the Postgres-backed background job queue."""
+
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import jobs
+from app.config import settings
+from app.models.job import Job
+from app.models.user import User
+
+
+@pytest.fixture
+def sessions(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def archive(client, campaign, ranger_payload):
+    cid = campaign["id"]
+    client.post(f"/api/campaigns/{cid}/rangers", json=ranger_payload)
+    client.post(f"/api/campaigns/{cid}/rewards", json={"card_name": "Wrist-mounted Darter", "quantity": 1})
+    return client.get(f"/api/campaigns/{cid}/export").json()
+
+
+@pytest.fixture
+def flaky(monkeypatch):
+    """Registers a 'flaky' job kind that raises until `calls` reaches `fail_times`."""
+    state = {"calls": 0, "fail_times": 1}
+
+    def run(db, job):
+        state["calls"] += 1
+        if state["calls"] <= state["fail_times"]:
+            raise RuntimeError("temporary outage")
+        return {"calls": state["calls"]}
+
+    monkeypatch.setitem(jobs.HANDLERS, "flaky", run)
+    return state
+
+
+def _enqueue(sessions, kind, payload=None):
+    with sessions() as db:
+        job = jobs.enqueue(db, kind, payload)
+        db.commit()
+        return job.id
+
+
+def _job(sessions, job_id) -> Job:
+    with sessions() as db:
+        job = db.get(Job, job_id)
+        db.expunge(job)
+        return job
+
+
+class TestJobEndpoints:
+    def test_background_import(self, client, archive, sessions):
+        r = client.post("/api/campaigns/import?background=true", json=archive)
+        assert r.status_code == 202
+        job_id = r.json()["job_id"]
+        assert client.get(f"/api/jobs/{job_id}").json()["status"] == "queued"
+
+        assert jobs.run_next(sessions) is True
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert job["status"] == "succeeded"
+        assert job["attempts"] == 1
+        imported = client.get(f"/api/campaigns/{job['result']['campaign_id']}/rangers").json()
+        assert [r["name"] for r in imported] == ["Aria"]
+
+    def test_invalid_import_fails_without_retry(self, client, archive, sessions):
+        archive["campaign"]["storyline_name"] = "Nowhere"
+        job_id = client.post("/api/campaigns/import?background=true", json=archive).json()["job_id"]
+        jobs.run_next(sessions)
+        job = client.get(f"/api/jobs/{job_id}").json()
+        assert job["status"] == "failed"
+        assert job["attempts"] == 1
+        assert "Nowhere" in job["error"]
+
+    def test_sync_import_still_supported(self, client, archive):
+        r = client.post("/api/campaigns/import", json=archive)
+        assert r.status_code == 201
+        assert "campaign_id" in r.json()
+
+    def test_background_export(self, client, campaign, archive, sessions):
+        r = client.post(f"/api/campaigns/{campaign['id']}/export")
+        assert r.status_code == 202
+        jobs.run_next(sessions)
+        result = client.get(f"/api/jobs/{r.json()['job_id']}").json()["result"]
+        assert result["campaign"] == archive["campaign"]
+
+    def test_analytics_rebuild(self, client, campaign, ranger_payload, engine, sessions, monkeypatch):
+        client.post(f"/api/campaigns/{campaign['id']}/rangers", json=ranger_payload)
+        with engine.connect() as conn:
+            for table in ("card_pick_stats", "trade_pair_stats", "analytics_counters"):
+                conn.execute(text(f"DELETE FROM {table}"))
+            conn.commit()
+        monkeypatch.setattr(settings, "admin_token", "s3cret")
+        r = client.post("/api/analytics/rebuild", headers={"X-Admin-Token": "s3cret"})
+        assert r.status_code == 202
+        jobs.run_next(sessions)
+        assert client.get("/api/analytics").json()["rangers"] == 1
+
+    def test_analytics_rebuild_requires_admin(self, client, sessions, monkeypatch):
+        assert client.post("/api/analytics/rebuild").status_code == 404   # no admin token configured
+        monkeypatch.setattr(settings, "admin_token", "s3cret")
+        assert client.post("/api/analytics/rebuild").status_code == 403
+        assert client.post("/api/analytics/rebuild", headers={"X-Admin-Token": "nope"}).status_code == 403
+        assert jobs.run_next(sessions) is False
+
+    def test_other_users_jobs_are_hidden(self, client, sessions):
+        job_id = _enqueue(sessions, "rebuild_analytics")   # system job, no owner
+        assert client.get(f"/api/jobs/{job_id}").status_code == 404
+        assert client.get("/api/jobs/999999").status_code == 404
+
+
+class TestWorker:
+    def test_empty_queue(self, engine, sessions):
+        assert jobs.run_next(sessions) is False
+
+    def test_retry_with_backoff(self, engine, sessions, flaky):
+        job_id = _enqueue(sessions, "flaky")
+        jobs.run_next(sessions)
+        job = _job(sessions, job_id)
+        assert job.status == "queued"
+        assert job.attempts == 1
+        assert job.error == "RuntimeError: temporary outage"
+        assert job.run_after > datetime.utcnow() + jobs.backoff(1) - timedelta(seconds=5)
+
+        # Not runnable until the backoff has elapsed
+        assert jobs.run_next(sessions) is False
+        with engine.connect() as conn:
+            conn.execute(
+                text("UPDATE jobs SET run_after = :t WHERE id = :id"),
+                {"id": job_id, "t": datetime.utcnow() - timedelta(hours=1)},
+            )
+            conn.commit()
+        jobs.run_next(sessions)
+        job = _job(sessions, job_id)
+        assert job.status == "succeeded"
+        assert job.attempts == 2
+        assert job.result == {"calls": 2}
+
+    def test_gives_up_after_max_attempts(self, engine, sessions, flaky, monkeypatch):
+        monkeypatch.setattr(settings, "job_max_attempts", 2)
+        monkeypatch.setattr(settings, "job_backoff_seconds", 0)
+        flaky["fail_times"] = 10
+        job_id = _enqueue(sessions, "flaky")
+        jobs.run_next(sessions)
+        jobs.run_next(sessions)
+        job = _job(sessions, job_id)
+        assert job.status == "failed"
+        assert job.attempts == 2
+        assert job.finished_at is not None
+
+    def test_backoff_is_exponential_and_capped(self, monkeypatch):
+        monkeypatch.setattr(settings, "job_backoff_seconds", 10)
+        monkeypatch.setattr(settings, "job_backoff_max_seconds", 60)
+        assert [jobs.backoff(n).total_seconds() for n in (1, 2, 3, 4)] == [10, 20, 40, 60]
+
+    @pytest.mark.postgres
+    def test_locked_job_is_skipped(self, engine, sessions):
+        job_id = _enqueue(sessions, "rebuild_analytics")
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id FROM jobs WHERE id = :id FOR UPDATE"), {"id": job_id})
+            assert jobs.run_next(sessions) is False
+            conn.rollback()
+        assert jobs.run_next(sessions) is True
+
+    def test_stale_running_job_is_reclaimed(self, engine, sessions):
+        job_id = _enqueue(sessions, "rebuild_analytics")
+        with engine.connect() as conn:
+            conn.execute(
+                text("UPDATE jobs SET status = 'running', attempts = 1, locked_at = :t WHERE id = :id"),
+                {"id": job_id, "t": datetime.utcnow() - timedelta(seconds=settings.job_lease_seconds + 60)},
+            )
+            conn.commit()
+        assert jobs.run_next(sessions) is True
+        job = _job(sessions, job_id)
+        assert job.status == "succeeded"
+        assert job.attempts == 2
+
+    @pytest.mark.postgres
+    def test_reclaimed_job_original_finishing_late_is_discarded(self, engine, sessions, monkeypatch):
+        """A worker presumed dead finishes after the job was claimed again: its writes and result are dropped."""
+        def run(db, job):
+            db.add(User(username=f"attempt-{job.attempts}", hashed_password="x"))
+            if job.attempts == 1:
+                # Lease lapses mid-run; another worker claims and completes the job
+                with engine.connect() as conn:
+                    conn.execute(
+                        text("UPDATE jobs SET locked_at = :t WHERE id = :id"),
+                        {"id": job.id, "t": datetime.utcnow() - timedelta(seconds=settings.job_lease_seconds + 60)},
+                    )
+                    conn.commit()
+                assert jobs.run_next(sessions) is True
+            return {"attempt": job.attempts}
+
+        monkeypatch.setitem(jobs.HANDLERS, "slow", run)
+        job_id = _enqueue(sessions, "slow")
+        assert jobs.run_next(sessions) is True
+        job = _job(sessions, job_id)
+        assert (job.status, job.attempts, job.result) == ("succeeded", 2, {"attempt": 2})
+        with sessions() as db:
+            assert db.scalars(select(User.username).where(User.username.like("attempt-%"))).all() == ["attempt-2"]
+
+    @pytest.mark.postgres
+    def test_lease_is_renewed_while_running(self, engine, sessions, monkeypatch):
+        monkeypatch.setattr(settings, "job_lease_seconds", 0.3)
+        seen = {}
+
+        def run(db, job):
+            claimed_at = job.locked_at
+            time.sleep(0.5)
+            with sessions() as other:
+                seen["renewed"] = other.get(Job, job.id).locked_at > claimed_at
+                seen["reclaimed"] = jobs._claim(sessions)
+
+        monkeypatch.setitem(jobs.HANDLERS, "slow", run)
+        job_id = _enqueue(sessions, "slow")
+        assert jobs.run_next(sessions) is True
+        assert seen == {"renewed": True, "reclaimed": None}
+        assert _job(sessions, job_id).status == "succeeded"
+
+    def test_unknown_kind_rejected(self, sessions):
+        with sessions() as db, pytest.raises(ValueError):
+            jobs.enqueue(db, "nope")
@@ -0,0 +1,90 @@
+"""Tests for the Prometheus metrics endpoint."""
+
+from prometheus_client.parser import text_string_to_metric_families
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app import database, jobs
+
+
+def _samples(client) -> dict:
+    r = client.get("/api/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    return {
+        (s.name, tuple(sorted(s.labels.items()))): s.value
+        for family in text_string_to_metric_families(r.text)
+        for s in family.samples
+    }
+
+
+def _value(samples, name, **labels):
+    return samples.get((name, tuple(sorted(labels.items()))), 0)
+
+
+class TestMetrics:
+    def test_requests_labelled_by_route_template(self, client, campaign):
+        route = "/api/campaigns/{campaign_id}"
+        before = _samples(client)
+        client.get(f"/api/campaigns/{campaign['id']}")
+        client.get(f"/api/campaigns/{campaign['id']}")
+        client.get("/api/campaigns/999999")
+        after = _samples(client)
+
+        def delta(name, **labels):
+            return _value(after, name, **labels) - _value(before, name, **labels)
+
+        assert delta("http_requests_total", method="GET", route=route, status="200") == 2
+        assert delta("http_requests_total", method="GET", route=route, status="404") == 1
+        assert delta("http_request_duration_seconds_count", method="GET", route=route) == 3
+        # Raw paths never become labels
+        assert not any(
+            dict(labels).get("route", "").endswith(str(campaign["id"])) for _, labels in after
+        )
+
+    def test_unmatched_paths_share_one_label(self, client):
+        before = _samples(client)
+        client.get("/api/no-such-thing/1")
+        client.get("/api/no-such-thing/2")
+        after = _samples(client)
+        key = ("http_requests_total", (("method", "GET"), ("route", "unmatched"), ("status", "404")))
+        assert after[key] - before.get(key, 0) == 2
+
+    def test_pool_threadpool_and_inflight(self, client, campaign):
+        samples = _samples(client)
+        assert _value(samples, "db_pool_checkouts_total") > 0
+        assert _value(samples, "db_pool_checkout_duration_seconds_count") > 0
+        assert _value(samples, "threadpool_max_threads") > 0
+        assert ("threadpool_busy_threads", ()) in samples
+        assert _value(samples, "http_requests_in_flight") == 1    # the scrape itself
+
+    def test_cache_lookups(self, client):
+        before = _samples(client)
+        client.get("/api/cards")
+        after = _samples(client)
+        assert (
+            _value(after, "cache_lookups_total", cache="card_library", result="hit")
+            + _value(after, "cache_lookups_total", cache="card_library", result="miss")
+            - _value(before, "cache_lookups_total", cache="card_library", result="hit")
+            - _value(before, "cache_lookups_total", cache="card_library", result="miss")
+        ) == 1
+
+    def test_job_queue_depth(self, client, engine, monkeypatch):
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(bind=engine))
+        with database.SessionLocal() as db:
+            jobs.enqueue(db, "rebuild_analytics")
+            jobs.enqueue(db, "rebuild_analytics")
+            db.commit()
+        samples = _samples(client)
+        assert _value(samples, "jobs_queue_depth", status="queued") == 2
+        assert _value(samples, "jobs_queue_depth", status="running") == 0
+
+    def test_job_queue_depth_skipped_when_database_fails(self, client, monkeypatch):
+        def unavailable():
+            raise OperationalError("SELECT", {}, Exception("connection refused"))
+
+        monkeypatch.setattr(database, "SessionLocal", unavailable)
+        r = client.get("/api/metrics")
+        assert r.status_code == 200
+        assert "jobs_queue_depth" not in r.text
+        assert "http_requests_total" in r.text
@@ -0,0 +1,96 @@
+"""Tests for the opt-in per-request profiler."""
+
+import os
+import time
+
+import pytest
+
+from app.config import settings
+from app.routers import rangers
+
+
+@pytest.fixture
+def profiles(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profile_interval_ms", 0.5)
+    return tmp_path
+
+
+@pytest.fixture
+def slow_rangers(client, campaign, ranger_payload, monkeypatch):
+    """A rangers list whose deck computation takes a measurable time."""
+    url = f"/api/campaigns/{campaign['id']}/rangers"
+    client.post(url, json=ranger_payload)
+    compute = rangers._compute_decklist
+
+    def slow_compute(ranger, db):
+        time.sleep(0.05)
+        return compute(ranger, db)
+
+    monkeypatch.setattr(rangers, "_compute_decklist", slow_compute)
+    return url
+
+
+ADMIN = {"X-Admin-Token": "s3cret"}
+
+
+class TestProfiler:
+    def test_profiles_flagged_request(self, client, slow_rangers, profiles):
+        r = client.get(slow_rangers, headers={**ADMIN, "X-Profile": "1"})
+        assert r.status_code == 200
+        assert len(r.json()) == 1
+        name = r.headers["x-profile-id"]
+        assert name.endswith(f"-GET-api_campaigns_campaign_id_rangers-{os.getpid()}.folded")
+
+        lines = (profiles / name).read_text().splitlines()
+        assert lines
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        sleeping = [line for line in lines if "app.routers.rangers.list_rangers" in line and "slow_compute" in line]
+        assert sleeping, "the endpoint's own frames must be sampled"
+
+    def test_query_flag(self, client, slow_rangers, profiles):
+        r = client.get(f"{slow_rangers}?profile=1", headers=ADMIN)
+        assert (profiles / r.headers["x-profile-id"]).is_file()
+
+    def test_requires_admin_token(self, client, slow_rangers, profiles):
+        for headers in ({"X-Profile": "1"}, {"X-Profile": "1", "X-Admin-Token": "wrong"}):
+            r = client.get(slow_rangers, headers=headers)
+            assert r.status_code == 200
+            assert "x-profile-id" not in r.headers
+        assert list(profiles.iterdir()) == []
+
+    def test_unflagged_requests_are_not_profiled(self, client, slow_rangers, profiles):
+        r = client.get(slow_rangers, headers=ADMIN)
+        assert "x-profile-id" not in r.headers
+        assert list(profiles.iterdir()) == []
+
+    def test_keeps_newest_profiles(self, client, campaign, profiles, monkeypatch):
+        monkeypatch.setattr(settings, "profile_keep", 2)
+        names = [
+            client.get(f"/api/campaigns/{campaign['id']}", headers={**ADMIN, "X-Profile": "1"}).headers["x-profile-id"]
+            for _ in range(3)
+        ]
+        assert sorted(p.name for p in profiles.iterdir()) == sorted(names[1:])
+
+
+class TestProfileEndpoints:
+    def test_list_and_download(self, client, slow_rangers, profiles):
+        name = client.get(slow_rangers, headers={**ADMIN, "X-Profile": "1"}).headers["x-profile-id"]
+        listing = client.get("/api/admin/profiles", headers=ADMIN).json()
+        assert [p["id"] for p in listing] == [name]
+        assert listing[0]["size"] == (profiles / name).stat().st_size
+
+        r = client.get(f"/api/admin/profiles/{name}", headers=ADMIN)
+        assert r.status_code == 200
+        assert r.text == (profiles / name).read_text()
+
+    def test_unknown_or_unsafe_ids(self, client, profiles):
+        (profiles.parent / "secret.folded").write_text("x")
+        assert client.get("/api/admin/profiles/nope.folded", headers=ADMIN).status_code == 404
+        assert client.get("/api/admin/profiles/..%2Fsecret.folded", headers=ADMIN).status_code == 404
+
+    def test_requires_admin(self, client, profiles):
+        assert client.get("/api/admin/profiles").status_code == 403
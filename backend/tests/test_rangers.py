@@ -9,6 +9,32 @@ class TestListRangers:
         assert r.status_code == 200
         assert r.json() == []
 
+    def test_summary_view(self, client, campaign, ranger_payload, card_ids):
+        client.post(f"/api/campaigns/{campaign['id']}/rangers", json=ranger_payload)
+        r = client.get(f"/api/campaigns/{campaign['id']}/rangers", params={"view": "summary"})
+        assert r.status_code == 200
+        [summary] = r.json()
+        assert summary["name"] == ranger_payload["name"]
+        assert summary["role_card"]["id"] == ranger_payload["role_card_id"]
+        assert summary["trade_count"] == 0
+        assert "current_decklist" not in summary
+        assert "trades" not in summary
+        assert "personality_card_ids" not in summary
+
+    def test_summary_is_one_query(self, client, campaign, ranger_payload, statements):
+        client.post(f"/api/campaigns/{campaign['id']}/rangers", json=ranger_payload)
+        statements.clear()
+        client.get(f"/api/campaigns/{campaign['id']}/rangers", params={"view": "summary"})
+        assert len(statements) == 1
+
+    def test_summary_campaign_not_found(self, client):
+        r = client.get("/api/campaigns/9999/rangers", params={"view": "summary"})
+        assert r.status_code == 404
+
+    def test_unknown_view(self, client, campaign):
+        r = client.get(f"/api/campaigns/{campaign['id']}/rangers", params={"view": "compact"})
+        assert r.status_code == 422
+
 
 class TestCreateRanger:
     def test_creates_ranger(self, client, campaign, ranger_payload):
@@ -120,3 +146,79 @@ class TestGetRanger:
     def test_not_found(self, client, campaign):
         r = client.get(f"/api/campaigns/{campaign['id']}/rangers/9999")
         assert r.status_code == 404
+
+
+class TestValidateRanger:
+    def test_valid_payload(self, client, campaign, ranger_payload):
+        r = client.post(f"/api/campaigns/{campaign['id']}/rangers/validate", json=ranger_payload)
+        assert r.status_code == 200
+        assert r.json() == {"valid": True, "errors": []}
+
+    def test_does_not_create_ranger(self, client, campaign, ranger_payload):
+        client.post(f"/api/campaigns/{campaign['id']}/rangers/validate", json=ranger_payload)
+        assert client.get(f"/api/campaigns/{campaign['id']}/rangers").json() == []
+
+    def test_reports_all_violations(self, client, campaign, ranger_payload, card_ids):
+        bad = dict(ranger_payload)
+        bad["background_card_ids"] = ranger_payload["background_card_ids"][:4]
+        bad["outside_interest_card_id"] = card_ids["Masterwork"]
+        r = client.post(f"/api/campaigns/{campaign['id']}/rangers/validate", json=bad)
+        assert r.status_code == 200
+        data = r.json()
+        assert data["valid"] is False
+        assert "Exactly 5 background cards required" in data["errors"]
+        assert any("Expert" in e for e in data["errors"])
+
+    def test_reports_cards_in_use(self, client, campaign, ranger_payload):
+        client.post(f"/api/campaigns/{campaign['id']}/rangers", json=ranger_payload)
+        r = client.post(f"/api/campaigns/{campaign['id']}/rangers/validate", json=ranger_payload)
+        data = r.json()
+        assert data["valid"] is False
+        assert any("already selected by another ranger" in e for e in data["errors"])
+
+    def test_campaign_not_found(self, client, ranger_payload):
+        r = client.post("/api/campaigns/9999/rangers/validate", json=ranger_payload)
+        assert r.status_code == 404
+
+
+class TestRangerOptions:
+    def test_groups_cards_by_slot(self, client, campaign):
+        r = client.get(
+            f"/api/campaigns/{campaign['id']}/rangers/options",
+            params={"background_set": "Artisan", "specialty_set": "Artificer"},
+        )
+        assert r.status_code == 200
+        data = r.json()
+        assert len(data["personality"]) == 16
+        assert {c["source_set"] for c in data["background"]} == {"Artisan"}
+        assert {c["card_type"] for c in data["specialty"]} == {"specialty"}
+        assert {c["card_type"] for c in data["role"]} == {"role"}
+        assert all(not c["is_expert"] for c in data["outside_interest"])
+
+    def test_sets_optional(self, client, campaign):
+        data = client.get(f"/api/campaigns/{campaign['id']}/rangers/options").json()
+        assert data["background"] == []
+        assert data["specialty"] == []
+        assert data["role"] == []
+
+    def test_excludes_cards_in_use(self, client, campaign, ranger_payload, card_ids):
+        client.post(f"/api/campaigns/{campaign['id']}/rangers", json=ranger_payload)
+        data = client.get(
+            f"/api/campaigns/{campaign['id']}/rangers/options",
+            params={"background_set": "Artisan", "specialty_set": "Artificer"},
+        ).json()
+        offered = {c["id"] for slot in data.values() for c in slot}
+        assert card_ids["Insightful"] not in offered
+        assert card_ids["Masterful Engineer"] not in offered
+        assert card_ids["Familiar Ground"] not in offered
+        assert card_ids["Wrist-mounted Darter"] in offered
+
+    def test_invalid_set(self, client, campaign):
+        r = client.get(
+            f"/api/campaigns/{campaign['id']}/rangers/options", params={"background_set": "BadSet"}
+        )
+        assert r.status_code == 400
+
+    def test_campaign_not_found(self, client):
+        r = client.get("/api/campaigns/9999/rangers/options")
+        assert r.status_code == 404
@@ -0,0 +1,76 @@
+"""Tests for read-replica session routing and the read-your-writes pin."""
+
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app import database
+from app.config import settings
+from app.database import PRIMARY_PIN_COOKIE, get_read_db
+
+
+class _Session:
+    def __init__(self, target):
+        self.target = target
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def replica_configured(monkeypatch):
+    monkeypatch.setattr(settings, "read_database_url", "postgresql://replica/earthborne")
+
+
+def _request(cookie: str | None = None) -> Request:
+    headers = [(b"cookie", f"{PRIMARY_PIN_COOKIE}={cookie}".encode())] if cookie is not None else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestPrimaryPinCookie:
+    def test_set_after_write(self, client, storyline_id, replica_configured):
+        r = client.post("/api/campaigns", json={"name": "Pinned", "storyline_id": storyline_id})
+        assert r.status_code == 201
+        assert PRIMARY_PIN_COOKIE in r.cookies
+        assert float(r.cookies[PRIMARY_PIN_COOKIE]) > time.time()
+
+    def test_not_set_on_read(self, client, replica_configured):
+        r = client.get("/api/campaigns")
+        assert PRIMARY_PIN_COOKIE not in r.cookies
+
+    def test_not_set_on_failed_write(self, client, replica_configured):
+        r = client.post("/api/campaigns", json={"name": "Bad", "storyline_id": 9999})
+        assert r.status_code == 404
+        assert PRIMARY_PIN_COOKIE not in r.cookies
+
+    def test_not_set_without_replica(self, client, storyline_id):
+        r = client.post("/api/campaigns", json={"name": "Plain", "storyline_id": storyline_id})
+        assert PRIMARY_PIN_COOKIE not in r.cookies
+
+
+class TestGetReadDb:
+    @pytest.fixture(autouse=True)
+    def factories(self, monkeypatch):
+        monkeypatch.setattr(database, "SessionLocal", lambda: _Session("primary"))
+        monkeypatch.setattr(database, "ReadSessionLocal", lambda: _Session("replica"))
+
+    def _session(self, request):
+        gen = get_read_db(request)
+        db = next(gen)
+        gen.close()
+        return db
+
+    def test_reads_from_replica(self):
+        assert self._session(_request()).target == "replica"
+
+    def test_pinned_client_reads_from_primary(self):
+        assert self._session(_request(str(time.time() + 5))).target == "primary"
+
+    def test_expired_pin_reads_from_replica(self):
+        assert self._session(_request(str(time.time() - 1))).target == "replica"
+
+    def test_garbage_cookie_reads_from_replica(self):
+        assert self._session(_request("nope")).target == "replica"
+
@@ -0,0 +1,66 @@
+"""Tests for the content-hashed reference bundle."""
+
+import gzip
+import hashlib
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.bundle import publish_bundle
+from app.config import settings
+from app.reference_cache import get_reference_bundle
+
+
+@pytest.fixture
+def bundle(engine):
+    db = sessionmaker(bind=engine)()
+    try:
+        return get_reference_bundle(db)
+    finally:
+        db.close()
+
+
+class TestReferenceBundle:
+    def test_advertises_api_fallback_by_default(self, client):
+        info = client.get("/api/reference").json()
+        assert len(info["hash"]) == 16
+        assert info["url"] == f"/api/reference/reference.{info['hash']}.json"
+
+    def test_bundle_contents_and_caching(self, client, card_ids):
+        info = client.get("/api/reference").json()
+        r = client.get(info["url"])
+        assert r.status_code == 200
+        assert r.headers["cache-control"] == "public, max-age=31536000, immutable"
+        assert hashlib.sha256(r.content).hexdigest()[:16] == info["hash"]
+
+        data = r.json()
+        assert data["cards"] == client.get("/api/cards").json()
+        assert data["storylines"] == client.get("/api/storylines").json()
+        assert len(data["cards"]) == len(card_ids)
+
+    def test_unknown_bundle_is_404(self, client):
+        assert client.get("/api/reference/reference.0000000000000000.json").status_code == 404
+
+    def test_published_url(self, client, monkeypatch, tmp_path):
+        monkeypatch.setattr(settings, "bundle_dir", str(tmp_path))
+        info = client.get("/api/reference").json()
+        assert info["url"] == f"/bundles/reference.{info['hash']}.json"
+
+
+class TestPublishBundle:
+    def test_writes_file_and_gzip(self, bundle, tmp_path):
+        path = publish_bundle(bundle, tmp_path / "bundles")
+        assert path.name == bundle.filename
+        assert path.read_bytes() == bundle.payload.body
+        assert gzip.decompress((path.parent / (path.name + ".gz")).read_bytes()) == bundle.payload.body
+        assert [p.name for p in path.parent.iterdir() if p.name.startswith(".")] == []
+
+    def test_existing_version_is_not_rewritten(self, bundle, tmp_path):
+        path = publish_bundle(bundle, tmp_path)
+        path.write_bytes(b"sentinel")
+        publish_bundle(bundle, tmp_path)
+        assert path.read_bytes() == b"sentinel"
+
+    def test_hash_follows_content(self, bundle):
+        assert bundle.hash == hashlib.sha256(bundle.payload.body).hexdigest()[:16]
+        assert bundle.filename == f"reference.{bundle.hash}.json"
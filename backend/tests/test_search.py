@@ -0,0 +1,116 @@
+"""Tests for full-text search over notable events and missions."""
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app.startup import upgrade_schema
+
+
+@pytest.fixture
+def journal(client, campaign):
+    cid = campaign["id"]
+    day_id = campaign["current_day"]["id"]
+    for line in (
+        "The river rose overnight and washed out the bridge.",
+        "Traded stories with the biscuit crew at Lone Tree Station.",
+        "A quiet day in the valley.",
+    ):
+        r = client.post(f"/api/campaigns/{cid}/events", json={"day_id": day_id, "text": line})
+        assert r.status_code == 201
+    r = client.post(f"/api/campaigns/{cid}/missions", json={"name": "Repair the River Bridge", "max_progress": 3})
+    assert r.status_code == 201
+    return campaign
+
+
+class TestSearch:
+    @pytest.mark.postgres
+    def test_matches_events_and_missions(self, client, journal):
+        r = client.get("/api/search", params={"q": "bridge"})
+        assert r.status_code == 200
+        results = r.json()["results"]
+        assert {x["kind"] for x in results} == {"event", "mission"}
+        assert all(x["campaign_name"] == "Test Run" for x in results)
+        assert all("**" in x["snippet"] for x in results)
+
+    @pytest.mark.postgres
+    def test_stemming(self, client, journal):
+        r = client.get("/api/search", params={"q": "washing"})
+        results = r.json()["results"]
+        assert len(results) == 1
+        assert results[0]["kind"] == "event"
+        assert results[0]["day_number"] == 1
+
+    @pytest.mark.postgres
+    def test_web_search_syntax(self, client, journal):
+        r = client.get("/api/search", params={"q": "river -mission -repair"})
+        results = r.json()["results"]
+        assert [x["kind"] for x in results] == ["event"]
+
+    def test_every_word_must_match(self, client, journal):
+        r = client.get("/api/search", params={"q": "river bridge"})
+        results = r.json()["results"]
+        assert sorted(x["kind"] for x in results) == ["event", "mission"]
+
+    def test_no_match(self, client, journal):
+        r = client.get("/api/search", params={"q": "owlbear"})
+        assert r.status_code == 200
+        assert r.json() == {"results": [], "next_offset": None}
+
+    def test_empty_query_rejected(self, client):
+        r = client.get("/api/search", params={"q": ""})
+        assert r.status_code == 422
+
+    @pytest.mark.postgres
+    def test_pagination(self, client, journal):
+        first = client.get("/api/search", params={"q": "bridge OR biscuit", "limit": 2}).json()
+        assert len(first["results"]) == 2
+        assert first["next_offset"] == 2
+        rest = client.get("/api/search", params={"q": "bridge OR biscuit", "limit": 2, "offset": 2}).json()
+        assert len(rest["results"]) == 1
+        assert rest["next_offset"] is None
+        ids = {(x["kind"], x["id"]) for x in first["results"] + rest["results"]}
+        assert len(ids) == 3
+
+    def test_excludes_inaccessible_campaigns(self, client, engine, journal, storyline_id):
+        with engine.connect() as conn:
+            other = conn.execute(text(
+                "INSERT INTO users (username, hashed_password) VALUES ('someone', 'x') RETURNING id"
+            )).scalar()
+            cid = conn.execute(
+                text(
+                    "INSERT INTO campaigns (name, storyline_id, status, owner_id, created_at) "
+                    "VALUES ('Private Run', :sid, 'active', :uid, CURRENT_TIMESTAMP) RETURNING id"
+                ),
+                {"sid": storyline_id, "uid": other},
+            ).scalar()
+            conn.execute(
+                text("INSERT INTO missions (campaign_id, name, progress, max_progress) VALUES (:cid, 'Bridge Watch', 0, 1)"),
+                {"cid": cid},
+            )
+            conn.commit()
+        results = client.get("/api/search", params={"q": "bridge"}).json()["results"]
+        assert "Private Run" not in {x["campaign_name"] for x in results}
+
+
+class TestSchemaUpgrade:
+    @pytest.mark.postgres
+    def test_adds_search_columns_to_existing_tables(self, engine, journal):
+        """A database from before search gains the columns and indexes (rolled back afterwards)."""
+        with engine.connect() as conn, conn.begin() as tx:
+            for table in ("missions", "notable_events"):
+                conn.execute(text(f"ALTER TABLE {table} DROP COLUMN search_vector"))
+
+            upgrade_schema(conn)
+            upgrade_schema(conn)
+
+            inspector = inspect(conn)
+            for table in ("missions", "notable_events"):
+                assert "search_vector" in {c["name"] for c in inspector.get_columns(table)}
+                assert f"ix_{table}_search_vector" in {ix["name"] for ix in inspector.get_indexes(table)}
+            assert conn.scalar(text(
+                "SELECT count(*) FROM missions WHERE search_vector @@ plainto_tsquery('english', 'bridges')"
+            )) == 1
+            assert conn.scalar(text(
+                "SELECT count(*) FROM notable_events WHERE search_vector @@ plainto_tsquery('english', 'bridges')"
+            )) == 1
+            tx.rollback()
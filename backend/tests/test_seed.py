@@ -0,0 +1,86 @@
+"""Tests for the hash-based reference data sync."""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.orm import sessionmaker
+
+from app import reference_cache, seed
+from app.models.card import Card
+from app.seed import seed_reference_data
+
+NEW_CARD = seed._card("Test Lantern", "background", "Artisan", "FOC", 1, ["Gear"])
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def resync(engine, db):
+    """Restore the canonical reference data (and drop test-only cards) after the test."""
+    yield
+    with engine.connect() as conn:
+        conn.execute(text("DELETE FROM cards WHERE name = :n"), {"n": NEW_CARD["name"]})
+        conn.execute(text("DELETE FROM reference_data_state"))
+        conn.commit()
+    seed_reference_data(db)
+    reference_cache.invalidate()
+
+
+class TestReferenceSync:
+    def test_unchanged_is_a_single_lookup(self, db, statements):
+        statements.clear()
+        assert seed_reference_data(db) is False
+        assert len(statements) == 1
+        assert "reference_data_state" in statements[0]
+
+    def test_corrected_card_is_updated_in_place(self, engine, db, card_ids, resync):
+        with engine.connect() as conn:
+            conn.execute(text("UPDATE cards SET cost = 9, tags = '[]' WHERE name = 'Insightful'"))
+            conn.execute(text("UPDATE reference_data_state SET content_hash = 'stale'"))
+            conn.commit()
+
+        assert seed_reference_data(db) is True
+        with engine.connect() as conn:
+            row = conn.execute(select(Card.id, Card.cost, Card.tags).where(Card.name == "Insightful")).one()
+        assert row.id == card_ids["Insightful"]
+        assert (row.cost, row.tags) == (1, ["Attribute", "Innate"])
+
+    def test_new_card_reaches_existing_database(self, engine, db, card_ids, monkeypatch, resync):
+        monkeypatch.setattr(seed, "ALL_CARDS", seed.ALL_CARDS + [NEW_CARD])
+        assert seed_reference_data(db) is True
+        with engine.connect() as conn:
+            names = {n for (n,) in conn.execute(text("SELECT name FROM cards"))}
+        assert names == set(card_ids) | {NEW_CARD["name"]}
+
+        # Applied once; the next boot is a no-op again
+        assert seed_reference_data(db) is False
+
+    def test_storyline_presets_are_repaired(self, engine, db, storyline_id, resync):
+        with engine.connect() as conn:
+            conn.execute(text(
+                "UPDATE storyline_day_presets SET weather = 'Sunny' WHERE storyline_id = :s AND day_number = 4"
+            ), {"s": storyline_id})
+            conn.execute(text(
+                "DELETE FROM storyline_day_presets WHERE storyline_id = :s AND day_number = 30"
+            ), {"s": storyline_id})
+            conn.execute(text(
+                "INSERT INTO storyline_day_presets (storyline_id, day_number, weather) VALUES (:s, 31, 'Downpour')"
+            ), {"s": storyline_id})
+            conn.execute(text("UPDATE reference_data_state SET content_hash = 'stale'"))
+            conn.commit()
+
+        assert seed_reference_data(db) is True
+        with engine.connect() as conn:
+            presets = dict(conn.execute(text(
+                "SELECT day_number, weather FROM storyline_day_presets WHERE storyline_id = :s"
+            ), {"s": storyline_id}).all())
+        assert presets == dict(seed._LOTV_WEATHER)
+
+    def test_hash_tracks_definitions(self, monkeypatch):
+        before = seed.reference_hash()
+        monkeypatch.setattr(seed, "ALL_CARDS", seed.ALL_CARDS + [NEW_CARD])
+        assert seed.reference_hash() != before
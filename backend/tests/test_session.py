@@ -0,0 +1,68 @@
+"""Tests for the campaign session bootstrap endpoint."""
+
+import pytest
+from sqlalchemy import text
+
+
+@pytest.fixture
+def table(client, engine, campaign, ranger_payload, card_ids):
+    """A campaign with a ranger who made one trade, a mission, an event and a reward."""
+    cid = campaign["id"]
+    day_id = campaign["current_day"]["id"]
+    client.post(f"/api/campaigns/{cid}/events", json={"day_id": day_id, "text": "Crossed the river."})
+    client.post(f"/api/campaigns/{cid}/missions", json={"name": "Biscuit Delivery", "max_progress": 2})
+    ranger = client.post(f"/api/campaigns/{cid}/rangers", json=ranger_payload).json()
+    with engine.connect() as conn:
+        conn.execute(
+            text("INSERT INTO campaign_rewards (campaign_id, card_id, quantity) VALUES (:cid, :card, 1)"),
+            {"cid": cid, "card": card_ids["Wrist-mounted Darter"]},
+        )
+        conn.commit()
+    client.post(f"/api/campaigns/{cid}/rangers/{ranger['id']}/trades", json={
+        "day_id": day_id,
+        "original_card_id": card_ids["Universal Power Cells"],
+        "reward_card_id": card_ids["Wrist-mounted Darter"],
+    })
+    return campaign
+
+
+class TestSession:
+    def test_returns_everything(self, client, table):
+        r = client.get(f"/api/campaigns/{table['id']}/session")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["current_day"]["day_number"] == 1
+        assert len(data["days"]) == 30
+        assert [m["name"] for m in data["missions"]] == ["Biscuit Delivery"]
+        assert [e["text"] for e in data["notable_events"]] == ["Crossed the river."]
+        assert [rw["quantity"] for rw in data["rewards"]] == [1]   # the traded-away original
+
+        [ranger] = data["rangers"]
+        assert len(ranger["trades"]) == 1
+        assert ranger["trades"][0]["reward_card"]["name"] == "Wrist-mounted Darter"
+        assert sum(e["quantity"] for e in ranger["current_decklist"]) == 30
+
+    def test_only_current_day_events(self, client, engine, table):
+        earlier = next(d for d in table["days"] if d["day_number"] == 2)
+        with engine.connect() as conn:
+            conn.execute(
+                text("INSERT INTO notable_events (campaign_id, day_id, text, created_at) VALUES (:cid, :day, 'Old news.', :at)"),
+                {"cid": table["id"], "day": earlier["id"], "at": "2020-01-01 00:00:00"},
+            )
+            conn.commit()
+        data = client.get(f"/api/campaigns/{table['id']}/session").json()
+        assert [e["text"] for e in data["notable_events"]] == ["Crossed the river."]
+        assert {e["day_id"] for e in data["notable_events"]} == {table["current_day"]["id"]}
+
+    def test_ranger_matches_ranger_endpoint(self, client, table):
+        session_ranger = client.get(f"/api/campaigns/{table['id']}/session").json()["rangers"][0]
+        ranger = client.get(f"/api/campaigns/{table['id']}/rangers/{session_ranger['id']}").json()
+        assert session_ranger == ranger
+
+    def test_fixed_query_count(self, client, table, statements):
+        statements.clear()
+        client.get(f"/api/campaigns/{table['id']}/session")
+        assert len(statements) == 7
+
+    def test_not_found(self, client):
+        assert client.get("/api/campaigns/9999/session").status_code == 404
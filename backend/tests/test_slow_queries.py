@@ -0,0 +1,153 @@
+"""Tests for the slow-query log and EXPLAIN capture."""
+
+import orjson
+import pytest
+from sqlalchemy import select, text
+
+from app import slow_queries
+from app.config import settings
+from app.database import create_db_engine
+from app.models.slow_query import SlowQuery
+from app.slow_queries import fingerprint, normalize
+
+
+@pytest.fixture
+def capture_all(monkeypatch, tmp_path, engine):
+    """Treat every statement as slow, flush immediately to the test database and log to a temp file."""
+    log = tmp_path / "slow.log"
+    monkeypatch.setattr(settings, "database_url", engine.url.render_as_string(hide_password=False))
+    monkeypatch.setattr(settings, "slow_query_ms", 0.0)
+    monkeypatch.setattr(settings, "slow_query_flush_seconds", 0.0)
+    monkeypatch.setattr(settings, "slow_query_log_file", str(log))
+    monkeypatch.setattr(settings, "slow_query_explain", True)
+    yield log
+    monkeypatch.setattr(settings, "slow_query_ms", None)
+    slow_queries.flush()
+
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    return {"X-Admin-Token": "s3cret"}
+
+
+def _log_entries(path) -> list[dict]:
+    return [orjson.loads(line) for line in path.read_text().splitlines()]
+
+
+class TestFingerprint:
+    def test_literals_and_parameters_are_normalized(self):
+        a = "SELECT * FROM cards WHERE id = %(id_1)s AND name = 'Insightful' LIMIT 10"
+        b = "SELECT *  FROM cards\n WHERE id = %(id_2)s AND name = 'Bold' LIMIT 5"
+        assert normalize(a) == "SELECT * FROM cards WHERE id = ? AND name = ? LIMIT ?"
+        assert fingerprint(normalize(a)) == fingerprint(normalize(b))
+
+    def test_in_lists_fold_regardless_of_length(self):
+        a = "SELECT id FROM rangers WHERE id IN (%(id_1_1)s, %(id_1_2)s)"
+        b = "SELECT id FROM rangers WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s, %(id_1_4)s)"
+        assert normalize(a) == normalize(b) == "SELECT id FROM rangers WHERE id IN (?)"
+
+    def test_casts_and_identifiers_survive(self):
+        s = "SELECT anon_1.x::text FROM t AS anon_1"
+        assert normalize(s) == s
+
+    def test_redaction(self):
+        assert slow_queries.redact({"id": 5, "name": "Aria"}) == {"id": "<int>", "name": "<str>"}
+        assert slow_queries.redact((5, None)) == ["<int>", "<NoneType>"]
+
+    def test_plan_redaction_keeps_costs(self):
+        plan = (
+            "Index Scan using cards_pkey on cards  (cost=0.15..8.17 rows=1 width=4) (actual time=0.01..0.01 rows=1 loops=1)\n"
+            "  Index Cond: (id = 42)\n"
+            "  Filter: ((name)::text = 'Insightful'::text)\n"
+            "  Rows Removed by Filter: 3\n"
+            "Execution Time: 0.031 ms"
+        )
+        assert slow_queries.redact_plan(plan) == (
+            "Index Scan using cards_pkey on cards  (cost=0.15..8.17 rows=1 width=4) (actual time=0.01..0.01 rows=1 loops=1)\n"
+            "  Index Cond: (id = ?)\n"
+            "  Filter: ((name)::text = ?::text)\n"
+            "  Rows Removed by Filter: 3\n"
+            "Execution Time: 0.031 ms"
+        )
+
+
+class TestSlowQueryLog:
+    @pytest.mark.postgres
+    def test_slow_statements_are_grouped(self, client, campaign, capture_all, engine):
+        for _ in range(3):
+            client.get(f"/api/campaigns/{campaign['id']}/rangers")
+        with engine.connect() as conn:
+            rows = conn.execute(text(
+                "SELECT statement, calls, total_ms, max_ms FROM slow_queries WHERE statement LIKE 'SELECT campaigns.%'"
+            )).all()
+        assert rows
+        assert max(r.calls for r in rows) >= 3
+        assert all(r.total_ms >= r.max_ms > 0 for r in rows)
+
+    @pytest.mark.postgres
+    def test_log_redacts_parameters_and_captures_plans(self, client, campaign, capture_all):
+        client.get(f"/api/campaigns/{campaign['id']}/rangers")
+        entries = _log_entries(capture_all)
+        select = next(e for e in entries if e["statement"].startswith("SELECT campaigns."))
+        assert str(campaign["id"]) not in orjson.dumps(select["parameters"]).decode()
+        assert set(select["parameters"].values()) == {"<int>"}
+        assert "actual time" in select["plan"]
+        assert "Buffers:" in select["plan"]
+
+    @pytest.mark.postgres
+    def test_plans_do_not_contain_parameter_values(self, capture_all, engine):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT id FROM cards WHERE name = :name AND cost > :cost"), {"name": "Insightful", "cost": 987})
+        plan = next(e for e in _log_entries(capture_all) if e["statement"].startswith("SELECT id FROM cards"))["plan"]
+        assert "Filter:" in plan
+        assert "Insightful" not in plan and "987" not in plan
+        with engine.connect() as conn:
+            stored = conn.scalar(select(SlowQuery.last_plan).where(SlowQuery.statement.like("SELECT id FROM cards%")))
+        assert stored == plan
+
+    @pytest.mark.postgres
+    def test_writes_are_not_executed_twice(self, client, campaign, capture_all):
+        url = f"/api/campaigns/{campaign['id']}/rewards"
+        client.post(url, json={"card_name": "Wrist-mounted Darter", "quantity": 1})
+        assert [r["quantity"] for r in client.get(url).json()] == [1]
+        insert = next(e for e in _log_entries(capture_all) if e["statement"].startswith("INSERT INTO campaign_rewards"))
+        assert insert["plan"] and "actual time" not in insert["plan"]
+
+    def test_replica_statements_are_stored_on_the_primary(self, capture_all, monkeypatch, tmp_path):
+        primary = create_db_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+        SlowQuery.__table__.create(primary)
+        monkeypatch.setattr(settings, "database_url", str(primary.url))
+        replica = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+        with replica.connect() as conn:
+            conn.execute(text("SELECT 42"))
+        with primary.connect() as conn:
+            assert conn.scalars(select(SlowQuery.statement)).all() == ["SELECT ?"]
+
+    def test_no_explain_in_production(self, client, campaign, capture_all, monkeypatch):
+        monkeypatch.setattr(settings, "slow_query_explain", None)
+        monkeypatch.setattr(settings, "app_env", "production")
+        client.get(f"/api/campaigns/{campaign['id']}")
+        assert all(e["plan"] is None for e in _log_entries(capture_all))
+
+    def test_below_threshold_is_ignored(self, client, campaign, capture_all, monkeypatch):
+        monkeypatch.setattr(settings, "slow_query_ms", 60_000.0)
+        client.get(f"/api/campaigns/{campaign['id']}")
+        assert not capture_all.exists() or _log_entries(capture_all) == []
+
+
+class TestAdminEndpoint:
+    @pytest.mark.postgres
+    def test_lists_heaviest_first(self, client, campaign, capture_all, admin):
+        client.get(f"/api/campaigns/{campaign['id']}/rangers")
+        rows = client.get("/api/admin/slow-queries?limit=5", headers=admin).json()
+        assert 0 < len(rows) <= 5
+        assert [r["total_ms"] for r in rows] == sorted((r["total_ms"] for r in rows), reverse=True)
+        assert all(r["mean_ms"] <= r["max_ms"] for r in rows)
+
+    def test_requires_admin_token(self, client, admin):
+        assert client.get("/api/admin/slow-queries").status_code == 403
+        assert client.get("/api/admin/slow-queries", headers={"X-Admin-Token": "nope"}).status_code == 403
+
+    def test_disabled_without_configured_token(self, client):
+        assert client.get("/api/admin/slow-queries", headers={"X-Admin-Token": "x"}).status_code == 404
@@ -0,0 +1,106 @@
+"""Tests for the per-day campaign timeline."""
+
+import pytest
+from sqlalchemy import text
+
+
+def _days(campaign):
+    return sorted(campaign["days"], key=lambda d: d["day_number"])
+
+
+def _close_day(client, campaign, day):
+    r = client.post(
+        f"/api/campaigns/{campaign['id']}/days/{day['id']}/close",
+        json={"location": "Lone Tree Station", "path_terrain": "Woods"},
+    )
+    assert r.status_code == 200
+
+
+@pytest.fixture
+def history(client, engine, campaign, ranger_payload, card_ids):
+    """Day 1: an event, a mission started and a trade. Day 2: mission completed. Day 3 active."""
+    day1, day2, day3 = _days(campaign)[:3]
+    cid = campaign["id"]
+
+    client.post(f"/api/campaigns/{cid}/events", json={"day_id": day1["id"], "text": "Met the Biscuit Delivery crew."})
+    mission = client.post(f"/api/campaigns/{cid}/missions", json={"name": "Biscuit Delivery", "max_progress": 2}).json()
+
+    ranger = client.post(f"/api/campaigns/{cid}/rangers", json=ranger_payload).json()
+    with engine.connect() as conn:
+        conn.execute(
+            text("INSERT INTO campaign_rewards (campaign_id, card_id, quantity) VALUES (:cid, :card, 1)"),
+            {"cid": cid, "card": card_ids["Wrist-mounted Darter"]},
+        )
+        conn.commit()
+    client.post(
+        f"/api/campaigns/{cid}/rangers/{ranger['id']}/trades",
+        json={
+            "day_id": day1["id"],
+            "original_card_id": card_ids["Universal Power Cells"],
+            "reward_card_id": card_ids["Wrist-mounted Darter"],
+        },
+    )
+    _close_day(client, campaign, day1)
+
+    client.patch(f"/api/campaigns/{cid}/missions/{mission['id']}", json={"day_completed_id": day2["id"]})
+    _close_day(client, campaign, day2)
+    return {"day1": day1, "day2": day2, "day3": day3, "mission": mission, "ranger": ranger}
+
+
+class TestTimeline:
+    def test_groups_by_day(self, client, campaign, history):
+        r = client.get(f"/api/campaigns/{campaign['id']}/timeline")
+        assert r.status_code == 200
+        days = r.json()["days"]
+        assert [d["day_number"] for d in days] == [1, 2, 3]
+
+        day1 = days[0]
+        assert day1["event_count"] == 1
+        assert day1["events"][0]["text"] == "Met the Biscuit Delivery crew."
+        assert day1["trade_count"] == 1
+        assert day1["trades"][0]["ranger_name"] == "Aria"
+        assert day1["trades"][0]["reward_card"]["name"] == "Wrist-mounted Darter"
+        assert day1["missions_started_count"] == 1
+        assert day1["missions_started"][0]["name"] == "Biscuit Delivery"
+
+        day2 = days[1]
+        assert day2["location"] == "Lone Tree Station"
+        assert day2["missions_completed"][0]["id"] == history["mission"]["id"]
+        assert day2["event_count"] == 0
+
+    def test_excludes_upcoming_by_default(self, client, campaign, history):
+        days = client.get(f"/api/campaigns/{campaign['id']}/timeline", params={"limit": 31}).json()["days"]
+        assert all(d["status"] != "upcoming" for d in days)
+        full = client.get(
+            f"/api/campaigns/{campaign['id']}/timeline", params={"limit": 31, "include_upcoming": True}
+        ).json()["days"]
+        assert len(full) == 30
+
+    def test_day_range(self, client, campaign, history):
+        days = client.get(
+            f"/api/campaigns/{campaign['id']}/timeline", params={"day_from": 2, "day_to": 2}
+        ).json()["days"]
+        assert [d["day_number"] for d in days] == [2]
+
+    def test_pagination(self, client, campaign, history):
+        page = client.get(f"/api/campaigns/{campaign['id']}/timeline", params={"limit": 2}).json()
+        assert [d["day_number"] for d in page["days"]] == [1, 2]
+        assert page["next_day_number"] == 3
+
+        page = client.get(
+            f"/api/campaigns/{campaign['id']}/timeline",
+            params={"limit": 2, "day_from": page["next_day_number"]},
+        ).json()
+        assert [d["day_number"] for d in page["days"]] == [3]
+        assert page["next_day_number"] is None
+
+    def test_reverted_trade_not_counted(self, client, campaign, history):
+        trade = client.get(f"/api/campaigns/{campaign['id']}/timeline").json()["days"][0]["trades"][0]
+        client.post(f"/api/campaigns/{campaign['id']}/rangers/{history['ranger']['id']}/trades/{trade['id']}/revert")
+        day1 = client.get(f"/api/campaigns/{campaign['id']}/timeline").json()["days"][0]
+        assert day1["trade_count"] == 0
+        assert day1["trades"][0]["reverted"] is True
+
+    def test_campaign_not_found(self, client):
+        r = client.get("/api/campaigns/9999/timeline")
+        assert r.status_code == 404
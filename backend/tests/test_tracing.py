@@ -0,0 +1,87 @@
+"""Tests for request/SQL tracing (Chrome trace-event output)."""
+
+import os
+
+import orjson
+import pytest
+
+from app import tracing
+from app.config import settings
+
+
+@pytest.fixture
+def trace_file(monkeypatch, tmp_path):
+    path = tmp_path / "trace.json"
+    monkeypatch.setattr(settings, "tracing_enabled", True)
+    monkeypatch.setattr(settings, "trace_sample_rate", 1.0)
+    monkeypatch.setattr(settings, "trace_output", str(path))
+    return path
+
+
+def _events(path) -> list[dict]:
+    # The file is an unterminated JSON array; close it the way trace viewers do
+    return orjson.loads(path.read_bytes().rstrip().rstrip(b",") + b"]")
+
+
+class TestTracing:
+    def test_request_spans(self, client, campaign, ranger_payload, trace_file):
+        url = f"/api/campaigns/{campaign['id']}/rangers"
+        r = client.post(url, json=ranger_payload)
+        assert r.status_code == 201
+        trace_id = r.headers["x-trace-id"]
+
+        events = _events(trace_file)
+        assert {e["tid"] for e in events} == {int(trace_id.split("-")[1])}
+        by_cat = {}
+        for e in events:
+            by_cat.setdefault(e["cat"], []).append(e)
+
+        (root,) = by_cat["request"]
+        assert root["name"] == "POST /api/campaigns/{campaign_id}/rangers"
+        assert root["args"] == {"path": url, "status": 201}
+        assert [e["name"] for e in by_cat["dependency"]] == ["require_campaign_write"]
+        assert {e["name"] for e in by_cat["decks"]} == {"_compute_decklist", "current_decklist"}
+        assert any("INSERT INTO rangers" in e["args"]["statement"] for e in by_cat["sql"])
+
+        # Every span lies within the request span
+        for e in events:
+            assert root["ts"] <= e["ts"] and e["ts"] + e["dur"] <= root["ts"] + root["dur"] + 1
+
+    def test_serializer_span(self, client, campaign, trace_file):
+        client.get(f"/api/campaigns/{campaign['id']}/rangers")
+        names = [e["name"] for e in _events(trace_file) if e["cat"] == "serialize"]
+        assert names == ["serialize list[app.schemas.ranger.RangerResponse]"]
+
+    def test_each_request_is_appended(self, client, campaign, trace_file):
+        client.get(f"/api/campaigns/{campaign['id']}")
+        client.get(f"/api/campaigns/{campaign['id']}")
+        roots = [e for e in _events(trace_file) if e["cat"] == "request"]
+        assert len(roots) == 2
+        assert roots[0]["tid"] != roots[1]["tid"]
+        assert trace_file.read_bytes().startswith(b"[\n")
+
+    def test_forked_process_gets_own_pid_and_ids(self):
+        tracing.Trace()
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:   # child: report and exit without running pytest teardown
+            os.write(write_fd, orjson.dumps([os.getpid(), tracing._PID, tracing.Trace().id]))
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as r:
+            child_pid, traced_pid, first_id = orjson.loads(r.read())
+        os.waitpid(pid, 0)
+        assert traced_pid == child_pid != tracing._PID
+        assert first_id == 1
+
+    def test_unsampled_requests_are_not_traced(self, client, campaign, trace_file, monkeypatch):
+        monkeypatch.setattr(settings, "trace_sample_rate", 0.0)
+        r = client.get(f"/api/campaigns/{campaign['id']}")
+        assert "x-trace-id" not in r.headers
+        assert not trace_file.exists()
+
+    def test_stdout_output(self, client, campaign, trace_file, monkeypatch, capfdbinary):
+        monkeypatch.setattr(settings, "trace_output", "stdout")
+        client.get(f"/api/campaigns/{campaign['id']}")
+        lines = [orjson.loads(line) for line in capfdbinary.readouterr().out.splitlines() if line.startswith(b"{")]
+        assert [e["name"] for e in lines if e["cat"] == "request"] == ["GET /api/campaigns/{campaign_id}"]
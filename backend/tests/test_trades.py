@@ -12,7 +12,9 @@ To set up a valid trade:
 """
 
 import pytest
-from sqlalchemy import text
+from sqlalchemy import inspect, text
+
+from app.startup import upgrade_schema
 
 
 @pytest.fixture
@@ -165,3 +167,87 @@ class TestRevertTrade:
             f"/api/campaigns/{campaign['id']}/rangers/{ranger['id']}/trades/{trade['id']}/revert"
         )
         assert r.status_code == 400
+
+
+class TestDeckHistory:
+    @pytest.fixture
+    def history(self, client, engine, campaign, ranger, card_ids):
+        """Day 1: Universal Power Cells → Wrist-mounted Darter.
+        Day 2: Ferinodex → Memorill Sketchpad, and a reverted Dayhowler → Infusion Canteen."""
+        days = {d["day_number"]: d for d in campaign["days"]}
+        with engine.connect() as conn:
+            for name in ("Wrist-mounted Darter", "Memorill Sketchpad", "Infusion Canteen"):
+                conn.execute(
+                    text("INSERT INTO campaign_rewards (campaign_id, card_id, quantity) VALUES (:cid, :card, 1)"),
+                    {"cid": campaign["id"], "card": card_ids[name]},
+                )
+            conn.commit()
+
+        url = f"/api/campaigns/{campaign['id']}/rangers/{ranger['id']}/trades"
+        for day, original, reward in (
+            (1, "Universal Power Cells", "Wrist-mounted Darter"),
+            (2, "Ferinodex", "Memorill Sketchpad"),
+            (2, "Dayhowler", "Infusion Canteen"),
+        ):
+            r = client.post(url, json={
+                "day_id": days[day]["id"],
+                "original_card_id": card_ids[original],
+                "reward_card_id": card_ids[reward],
+            })
+            assert r.status_code == 201
+        client.post(f"{url}/{r.json()['id']}/revert")
+        return f"/api/campaigns/{campaign['id']}/rangers/{ranger['id']}/deck"
+
+    @staticmethod
+    def _deck(r):
+        assert r.status_code == 200
+        data = r.json()
+        assert data["size"] == 30
+        return {e["card"]["name"]: e["quantity"] for e in data["cards"]}
+
+    def test_starting_deck(self, client, history):
+        deck = self._deck(client.get(history, params={"as_of_day": 0}))
+        assert deck["Universal Power Cells"] == 2
+        assert "Wrist-mounted Darter" not in deck
+
+    def test_as_of_day(self, client, history):
+        day1 = self._deck(client.get(history, params={"as_of_day": 1}))
+        assert day1["Universal Power Cells"] == 1
+        assert day1["Wrist-mounted Darter"] == 1
+        assert day1["Ferinodex"] == 2
+        assert "Memorill Sketchpad" not in day1
+
+        day2 = self._deck(client.get(history, params={"as_of_day": 2}))
+        assert day2["Ferinodex"] == 1
+        assert day2["Memorill Sketchpad"] == 1
+        assert day2["Dayhowler"] == 2            # reverted trade is ignored
+        assert "Infusion Canteen" not in day2
+
+    def test_current_deck_matches_ranger(self, client, campaign, ranger, history):
+        current = self._deck(client.get(history))
+        r = client.get(f"/api/campaigns/{campaign['id']}/rangers/{ranger['id']}")
+        assert current == {e["card"]["name"]: e["quantity"] for e in r.json()["current_decklist"]}
+
+    def test_diff(self, client, history):
+        r = client.get(f"{history}/diff", params={"day": 2})
+        assert r.status_code == 200
+        data = r.json()
+        assert [(e["card"]["name"], e["quantity"]) for e in data["added"]] == [("Memorill Sketchpad", 1)]
+        assert [(e["card"]["name"], e["quantity"]) for e in data["removed"]] == [("Ferinodex", 1)]
+
+    def test_diff_day_without_trades(self, client, history):
+        data = client.get(f"{history}/diff", params={"day": 3}).json()
+        assert data["added"] == [] and data["removed"] == []
+
+    @pytest.mark.postgres
+    def test_index_added_to_existing_database(self, engine):
+        with engine.connect() as conn, conn.begin() as tx:
+            conn.execute(text("DROP INDEX ix_ranger_trades_ranger_day"))
+            upgrade_schema(conn)
+            indexes = {ix["name"]: ix["column_names"] for ix in inspect(conn).get_indexes("ranger_trades")}
+            assert indexes["ix_ranger_trades_ranger_day"] == ["ranger_id", "day_id"]
+            tx.rollback()
+
+    def test_unknown_day(self, client, history):
+        assert client.get(history, params={"as_of_day": 99}).status_code == 404
+        assert client.get(f"{history}/diff", params={"day": 99}).status_code == 404
@@ -2,17 +2,42 @@ import { clearAuth, getToken } from '@/lib/auth'
 
 const base = '/api'
 
-async function req(method, path, body) {
+// Mutations that must not apply twice send an Idempotency-Key; if the network
+// drops before a response arrives they are resent with the same key, and the
+// server answers the retry with the stored result instead of re-applying it.
+const NETWORK_RETRIES = 2
+
+// crypto.randomUUID() exists only in secure contexts (HTTPS or localhost);
+// over plain HTTP build the same random (v4) UUID from getRandomValues().
+function newIdempotencyKey() {
+  if (crypto.randomUUID) return crypto.randomUUID()
+  const b = crypto.getRandomValues(new Uint8Array(16))
+  b[6] = (b[6] & 0x0f) | 0x40
+  b[8] = (b[8] & 0x3f) | 0x80
+  const hex = Array.from(b, (x) => x.toString(16).padStart(2, '0')).join('')
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`
+}
+
+async function req(method, path, body, { idempotent = false } = {}) {
   const token = getToken()
   const headers = {}
   if (body) headers['Content-Type'] = 'application/json'
   if (token) headers['Authorization'] = `Bearer ${token}`
+  if (idempotent) headers['Idempotency-Key'] = newIdempotencyKey()
 
-  const res = await fetch(`${base}${path}`, {
-    method,
-    headers,
-    body: body ? JSON.stringify(body) : undefined,
-  })
+  let res
+  for (let attempt = 0; ; attempt++) {
+    try {
+      res = await fetch(`${base}${path}`, {
+        method,
+        headers,
+        body: body ? JSON.stringify(body) : undefined,
+      })
+      break
+    } catch (e) {
+      if (!idempotent || attempt >= NETWORK_RETRIES) throw e
+    }
+  }
 
   if (res.status === 401 || res.status === 403) {
     clearAuth()
@@ -24,6 +49,22 @@ async function req(method, path, body) {
   return res.status === 204 ? null : res.json()
 }
 
+// Cards and storylines only change with a release.  The server advertises a
+// content-hashed bundle URL whose response is immutable, so the browser cache
+// serves it after the first download; within a page load it is kept here.
+let referenceData = null
+
+async function loadReferenceData() {
+  const { hash, url } = await req('GET', '/reference')
+  if (referenceData?.hash !== hash) {
+    const token = getToken()
+    const res = await fetch(url, { headers: token ? { Authorization: `Bearer ${token}` } : {} })
+    if (!res.ok) throw new Error(await res.text())
+    referenceData = { hash, data: await res.json() }
+  }
+  return referenceData.data
+}
+
 export const api = {
   // campaigns
   getCampaigns: () => req('GET', '/campaigns'),
@@ -31,33 +72,44 @@ export const api = {
   getCampaign: (id) => req('GET', `/campaigns/${id}`),
   patchCampaign: (id, body) => req('PATCH', `/campaigns/${id}`, body),
   deleteCampaign: (id) => req('DELETE', `/campaigns/${id}`),
+  getSession: (id) => req('GET', `/campaigns/${id}/session`),
   // days
   getDays: (cid) => req('GET', `/campaigns/${cid}/days`),
   getDay: (cid, did) => req('GET', `/campaigns/${cid}/days/${did}`),
   closeDay: (cid, did, body) => req('POST', `/campaigns/${cid}/days/${did}/close`, body),
   // rangers
-  getRangers: (cid) => req('GET', `/campaigns/${cid}/rangers`),
+  getRangers: (cid, params) => req('GET', `/campaigns/${cid}/rangers${params ? '?' + new URLSearchParams(params) : ''}`),
   createRanger: (cid, body) => req('POST', `/campaigns/${cid}/rangers`, body),
+  validateRanger: (cid, body) => req('POST', `/campaigns/${cid}/rangers/validate`, body),
+  getRangerOptions: (cid, params) => req('GET', `/campaigns/${cid}/rangers/options${params && Object.keys(params).length ? '?' + new URLSearchParams(params) : ''}`),
   getRanger: (cid, rid) => req('GET', `/campaigns/${cid}/rangers/${rid}`),
-  createTrade: (cid, rid, body) => req('POST', `/campaigns/${cid}/rangers/${rid}/trades`, body),
+  getRangerDeck: (cid, rid, params) => req('GET', `/campaigns/${cid}/rangers/${rid}/deck${params ? '?' + new URLSearchParams(params) : ''}`),
+  getRangerDeckDiff: (cid, rid, day) => req('GET', `/campaigns/${cid}/rangers/${rid}/deck/diff?day=${day}`),
+  createTrade: (cid, rid, body) => req('POST', `/campaigns/${cid}/rangers/${rid}/trades`, body, { idempotent: true }),
   revertTrade: (cid, rid, tid) => req('POST', `/campaigns/${cid}/rangers/${rid}/trades/${tid}/revert`),
   // missions
   getMissions: (cid) => req('GET', `/campaigns/${cid}/missions`),
   createMission: (cid, body) => req('POST', `/campaigns/${cid}/missions`, body),
   patchMission: (cid, mid, body) => req('PATCH', `/campaigns/${cid}/missions/${mid}`, body),
   // events
-  getEvents: (cid) => req('GET', `/campaigns/${cid}/events`),
+  getEvents: (cid, params) => req('GET', `/campaigns/${cid}/events${params ? '?' + new URLSearchParams(params) : ''}`),
   createEvent: (cid, body) => req('POST', `/campaigns/${cid}/events`, body),
   deleteEvent: (cid, eid) => req('DELETE', `/campaigns/${cid}/events/${eid}`),
+  // timeline
+  getTimeline: (cid, params) => req('GET', `/campaigns/${cid}/timeline${params ? '?' + new URLSearchParams(params) : ''}`),
   // rewards
   getRewards: (cid) => req('GET', `/campaigns/${cid}/rewards`),
-  addReward: (cid, body) => req('POST', `/campaigns/${cid}/rewards`, body),
+  addReward: (cid, body) => req('POST', `/campaigns/${cid}/rewards`, body, { idempotent: true }),
   removeReward: (cid, rwid) => req('DELETE', `/campaigns/${cid}/rewards/${rwid}`),
   // cards
   getCards: (params) => req('GET', `/cards${params ? '?' + new URLSearchParams(params) : ''}`),
   // storylines
   getStorylines: () => req('GET', '/storylines'),
+  // reference bundle: { cards, storylines }
+  getReferenceData: () => loadReferenceData(),
+  // search
+  search: (q, params) => req('GET', `/search?${new URLSearchParams({ q, ...params })}`),
   // import / export
   exportCampaign: (id) => req('GET', `/campaigns/${id}/export`),
-  importCampaign: (body) => req('POST', '/campaigns/import', body),
+  importCampaign: (body) => req('POST', '/campaigns/import', body, { idempotent: true }),
 }
@@ -20,8 +20,8 @@ export default function CampaignCreatePage() {
   const [storylineId, setStorylineId] = useState('')
 
   useEffect(() => {
-    api.getStorylines()
-      .then(setStorylines)
+    api.getReferenceData()
+      .then((ref) => setStorylines(ref.storylines))
       .catch((e) => setError(e.message))
       .finally(() => setLoading(false))
   }, [])
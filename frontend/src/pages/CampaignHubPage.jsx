@@ -18,11 +18,9 @@ import MissionProgressBar from '@/components/shared/MissionProgressBar'
 
 // ── Session Tab ──────────────────────────────────────────────────────────────
 
-function SessionTab({ campaign, activeDay, missions, onMissionUpdate, onRefresh }) {
+function SessionTab({ campaign, activeDay, missions, events, setEvents, onRewardsChange, onMissionUpdate, onRefresh }) {
   const navigate = useNavigate()
   const [eventText, setEventText] = useState('')
-  const [events, setEvents] = useState([])
-  const [rewards, setRewards] = useState([])
   const [rewardCardName, setRewardCardName] = useState('')
   const [rewardQty, setRewardQty] = useState('1')
   const [newMissionName, setNewMissionName] = useState('')
@@ -31,29 +29,21 @@ function SessionTab({ campaign, activeDay, missions, onMissionUpdate, onRefresh
 
   const cid = campaign.id
 
-  const loadEvents = useCallback(() => api.getEvents(cid).then(setEvents), [cid])
-  const loadRewards = useCallback(() => api.getRewards(cid).then(setRewards), [cid])
-
-  useEffect(() => {
-    loadEvents()
-    loadRewards()
-  }, [loadEvents, loadRewards])
-
   const ongoingMissions = missions.filter((m) => !m.day_completed_id)
 
   async function addEvent() {
     if (!eventText.trim() || !activeDay) return
     try {
-      await api.createEvent(cid, { day_id: activeDay.id, text: eventText.trim() })
+      const created = await api.createEvent(cid, { day_id: activeDay.id, text: eventText.trim() })
       setEventText('')
-      loadEvents()
+      setEvents((prev) => [...prev, created])
     } catch (e) { setError(e.message) }
   }
 
   async function deleteEvent(eid) {
     try {
       await api.deleteEvent(cid, eid)
-      loadEvents()
+      setEvents((prev) => prev.filter((ev) => ev.id !== eid))
     } catch (e) { setError(e.message) }
   }
 
@@ -79,7 +69,7 @@ function SessionTab({ campaign, activeDay, missions, onMissionUpdate, onRefresh
       await api.addReward(cid, { card_name: rewardCardName.trim(), quantity: parseInt(rewardQty) || 1 })
       setRewardCardName('')
       setRewardQty('1')
-      loadRewards()
+      onRewardsChange()
     } catch (e) { setError(e.message) }
   }
 
@@ -363,6 +353,11 @@ function MissionsTab({ campaign, missions, onRefresh }) {
 
 // ── Rangers Tab ───────────────────────────────────────────────────────────────
 
+// Summary rows carry trade_count; full rangers carry their trades
+function tradeCount(ranger) {
+  return ranger.trade_count ?? ranger.trades.filter((t) => !t.reverted).length
+}
+
 function RangersTab({ campaign, rangers }) {
   const navigate = useNavigate()
   const cid = campaign.id
@@ -398,11 +393,9 @@ function RangersTab({ campaign, rangers }) {
                 <span><span className="text-muted-foreground">FOC</span> {r.foc}</span>
                 <span><span className="text-muted-foreground">SPI</span> {r.spi}</span>
               </div>
-              {r.current_decklist?.length > 0 && (
-                <p className="text-xs text-muted-foreground mt-1">
-                  {r.current_decklist.reduce((s, e) => s + e.quantity, 0)} cards in deck
-                </p>
-              )}
+              <p className="text-xs text-muted-foreground mt-1">
+                {r.role_card.name} · {tradeCount(r)} {tradeCount(r) === 1 ? 'trade' : 'trades'}
+              </p>
             </CardContent>
           </Card>
         ))}
@@ -413,34 +406,27 @@ function RangersTab({ campaign, rangers }) {
 
 // ── Rewards Tab ───────────────────────────────────────────────────────────────
 
-function RewardsTab({ campaign }) {
-  const [rewards, setRewards] = useState([])
+function RewardsTab({ campaign, rewards, onRewardsChange }) {
   const [rewardCardName, setRewardCardName] = useState('')
   const [rewardQty, setRewardQty] = useState('1')
   const [error, setError] = useState(null)
 
   const cid = campaign.id
 
-  const loadRewards = useCallback(() => api.getRewards(cid).then(setRewards), [cid])
-
-  useEffect(() => {
-    loadRewards()
-  }, [loadRewards])
-
   async function addReward() {
     if (!rewardCardName.trim()) return
     try {
       await api.addReward(cid, { card_name: rewardCardName.trim(), quantity: parseInt(rewardQty) || 1 })
       setRewardCardName('')
       setRewardQty('1')
-      loadRewards()
+      onRewardsChange()
     } catch (e) { setError(e.message) }
   }
 
   async function removeReward(rwid) {
     try {
       await api.removeReward(cid, rwid)
-      loadRewards()
+      onRewardsChange()
     } catch (e) { setError(e.message) }
   }
 
@@ -517,18 +503,27 @@ export default function CampaignHubPage() {
   const [campaign, setCampaign] = useState(null)
   const [missions, setMissions] = useState([])
   const [rangers, setRangers] = useState([])
+  const [events, setEvents] = useState([])
+  const [rewards, setRewards] = useState([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState(null)
 
   const loadMissions = useCallback(() => api.getMissions(id).then(setMissions), [id])
-  const loadRangers = useCallback(() => api.getRangers(id).then(setRangers), [id])
+  const loadRewards = useCallback(() => api.getRewards(id).then(setRewards), [id])
 
+  // One request for everything the tabs need on first render
   useEffect(() => {
-    Promise.all([api.getCampaign(id), loadMissions(), loadRangers()])
-      .then(([c]) => setCampaign(c))
+    api.getSession(id)
+      .then((s) => {
+        setCampaign(s)
+        setMissions(s.missions)
+        setRangers(s.rangers)
+        setEvents(s.notable_events)   // the active day's only
+        setRewards(s.rewards)
+      })
       .catch((e) => setError(e.message))
       .finally(() => setLoading(false))
-  }, [id, loadMissions, loadRangers])
+  }, [id])
 
   if (loading) return <div className="container max-w-4xl mx-auto p-6"><LoadingSpinner /></div>
   if (error) return <div className="container max-w-4xl mx-auto p-6"><ErrorMessage message={error} /></div>
@@ -575,6 +570,9 @@ export default function CampaignHubPage() {
             campaign={campaign}
             activeDay={activeDay}
             missions={missions}
+            events={events}
+            setEvents={setEvents}
+            onRewardsChange={loadRewards}
             onMissionUpdate={loadMissions}
             onRefresh={() => {}}
           />
@@ -589,7 +587,7 @@ export default function CampaignHubPage() {
         </TabsContent>
 
         <TabsContent value="rewards">
-          <RewardsTab campaign={campaign} />
+          <RewardsTab campaign={campaign} rewards={rewards} onRewardsChange={loadRewards} />
         </TabsContent>
       </Tabs>
     </div>
@@ -1,4 +1,4 @@
-import { useState, useEffect, useCallback } from 'react'
+import { useState, useEffect } from 'react'
 import { useNavigate, useParams } from 'react-router-dom'
 import { api } from '@/lib/api'
 import { Button } from '@/components/ui/button'
@@ -13,16 +13,7 @@ import ErrorMessage from '@/components/shared/ErrorMessage'
 const PATH_TERRAINS = ['Forest', 'Grassland', 'Marsh', 'Mountain', 'River', 'Scrubland']
 
 function RangerTradePanel({ ranger, rewards }) {
-  const cid = ranger.campaign_id
-  const [decklist, setDecklist] = useState([])
-
-  const loadRanger = useCallback(async () => {
-    const r = await api.getRanger(cid, ranger.id)
-    setDecklist(r.current_decklist ?? [])
-  }, [cid, ranger.id])
-
-  useEffect(() => { loadRanger() }, [loadRanger])
-
+  const decklist = ranger.current_decklist ?? []
   const activeRewards = rewards.filter((rw) => rw.quantity > 0)
 
   return (
@@ -78,14 +69,16 @@ export default function DayClosePage() {
   const [submitting, setSubmitting] = useState(false)
   const [error, setError] = useState(null)
 
-  const loadRewards = useCallback(() => api.getRewards(id).then(setRewards), [id])
-
   useEffect(() => {
-    Promise.all([api.getCampaign(id), api.getRangers(id), loadRewards()])
-      .then(([c, r]) => { setCampaign(c); setRangers(r) })
+    api.getSession(id)
+      .then((s) => {
+        setCampaign(s)
+        setRangers(s.rangers)
+        setRewards(s.rewards)
+      })
       .catch((e) => setError(e.message))
       .finally(() => setLoading(false))
-  }, [id, loadRewards])
+  }, [id])
 
   if (loading) return <div className="container max-w-2xl mx-auto p-6"><LoadingSpinner /></div>
   if (error) return <div className="container max-w-2xl mx-auto p-6"><ErrorMessage message={error} /></div>
@@ -56,7 +56,7 @@ export default function RangerCreatePage() {
   const { id: cid } = useParams()
   const navigate = useNavigate()
   const [step, setStep] = useState(0)
-  const [allCards, setAllCards] = useState([])
+  const [options, setOptions] = useState(null)
   const [loading, setLoading] = useState(true)
   const [submitting, setSubmitting] = useState(false)
   const [error, setError] = useState(null)
@@ -74,36 +74,33 @@ export default function RangerCreatePage() {
   const [roleCardId, setRoleCardId] = useState(null)
   const [outsideInterestId, setOutsideInterestId] = useState(null)
 
+  // Legal choices come precomputed from the server: cards already held by
+  // another ranger in this campaign are excluded, and the per-set lists are
+  // refreshed whenever the background or specialty set changes.
   useEffect(() => {
-    api.getCards()
-      .then(setAllCards)
+    const params = {}
+    if (backgroundSet) params.background_set = backgroundSet
+    if (specialtySet) params.specialty_set = specialtySet
+    api.getRangerOptions(cid, params)
+      .then(setOptions)
       .catch((e) => setError(e.message))
       .finally(() => setLoading(false))
-  }, [])
-
-  const selectedAspectCard = allCards.find((c) => c.id === aspectCardId)
+  }, [cid, backgroundSet, specialtySet])
 
   const personalityByAspect = useMemo(() => {
     const map = {}
     ASPECTS.forEach((asp) => {
-      map[asp] = allCards.filter((c) => c.card_type === 'personality' && c.source_set === asp)
+      map[asp] = (options?.personality ?? []).filter((c) => c.source_set === asp)
     })
     return map
-  }, [allCards])
-
-  const bgCards = useMemo(() =>
-    backgroundSet ? allCards.filter((c) => c.card_type === 'background' && c.source_set === backgroundSet) : [],
-    [allCards, backgroundSet])
+  }, [options])
 
-  const spCards = useMemo(() =>
-    specialtySet ? allCards.filter((c) => c.card_type === 'specialty' && c.source_set === specialtySet) : [],
-    [allCards, specialtySet])
+  const bgCards = options?.background ?? []
+  const spCards = options?.specialty ?? []
+  const roleCards = options?.role ?? []
 
-  const roleCards = useMemo(() =>
-    specialtySet ? allCards.filter((c) => c.card_type === 'role' && c.source_set === specialtySet) : [],
-    [allCards, specialtySet])
-
-  // Outside interest: non-expert background or specialty, not already chosen
+  // Outside interest: server list is already non-expert background/specialty;
+  // additionally hide cards chosen in this draft
   const chosenIds = new Set([
     ...backgroundIds.filter(Boolean),
     ...specialtyIds.filter(Boolean),
@@ -111,14 +108,9 @@ export default function RangerCreatePage() {
   ].filter(Boolean))
 
   const outsideInterestCards = useMemo(() =>
-    allCards.filter((c) =>
-      (c.card_type === 'background' || c.card_type === 'specialty') &&
-      !c.is_expert &&
-      c.card_type !== 'role' &&
-      !chosenIds.has(c.id)
-    ),
+    (options?.outside_interest ?? []).filter((c) => !chosenIds.has(c.id)),
     // eslint-disable-next-line react-hooks/exhaustive-deps
-    [allCards, backgroundIds, specialtyIds, roleCardId])
+    [options, backgroundIds, specialtyIds, roleCardId])
 
   function setBackgroundId(index, val) {
     setBackgroundIds((prev) => { const n = [...prev]; n[index] = val; return n })
@@ -172,7 +164,9 @@ export default function RangerCreatePage() {
 
   if (loading) return <div className="container max-w-2xl mx-auto p-6"><LoadingSpinner /></div>
 
-  const cardById = Object.fromEntries(allCards.map((c) => [c.id, c]))
+  const cardById = Object.fromEntries(
+    Object.values(options ?? {}).flat().map((c) => [c.id, c])
+  )
 
   return (
     <div className="container max-w-2xl mx-auto p-6">
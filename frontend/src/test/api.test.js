@@ -94,3 +94,84 @@ describe('api.revertTrade()', () => {
     )
   })
 })
+
+describe('api.getRangerOptions()', () => {
+  it('passes the chosen sets as query params', async () => {
+    global.fetch = mockFetch(200, {})
+    await api.getRangerOptions(1, { background_set: 'Artisan', specialty_set: 'Explorer' })
+    const calledUrl = fetch.mock.calls[0][0]
+    expect(calledUrl).toContain('/api/campaigns/1/rangers/options?')
+    expect(calledUrl).toContain('background_set=Artisan')
+    expect(calledUrl).toContain('specialty_set=Explorer')
+  })
+
+  it('calls without query string when no sets are chosen', async () => {
+    global.fetch = mockFetch(200, {})
+    await api.getRangerOptions(1, {})
+    expect(fetch).toHaveBeenCalledWith('/api/campaigns/1/rangers/options', expect.anything())
+  })
+})
+
+describe('api.addReward()', () => {
+  it('sends an Idempotency-Key header', async () => {
+    global.fetch = mockFetch(201, { id: 1 })
+    await api.addReward(1, { card_name: 'Wrist-mounted Darter', quantity: 1 })
+    const { headers } = fetch.mock.calls[0][1]
+    expect(headers['Idempotency-Key']).toEqual(expect.any(String))
+  })
+
+  it('builds the key without crypto.randomUUID (insecure context)', async () => {
+    const real = globalThis.crypto
+    vi.stubGlobal('crypto', { getRandomValues: (a) => real.getRandomValues(a) })
+    try {
+      global.fetch = mockFetch(201, { id: 1 })
+      await api.addReward(1, { card_name: 'Wrist-mounted Darter', quantity: 1 })
+      const { headers } = fetch.mock.calls[0][1]
+      expect(headers['Idempotency-Key']).toMatch(/^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$/)
+    } finally {
+      vi.unstubAllGlobals()
+    }
+  })
+
+  it('retries a network failure with the same key', async () => {
+    const ok = { ok: true, status: 201, json: () => Promise.resolve({ id: 1 }) }
+    global.fetch = vi.fn()
+      .mockRejectedValueOnce(new TypeError('Failed to fetch'))
+      .mockResolvedValueOnce(ok)
+    const result = await api.addReward(1, { card_name: 'Wrist-mounted Darter', quantity: 1 })
+    expect(result).toEqual({ id: 1 })
+    expect(fetch).toHaveBeenCalledTimes(2)
+    const [first, second] = fetch.mock.calls.map(([, init]) => init.headers['Idempotency-Key'])
+    expect(second).toBe(first)
+  })
+})
+
+describe('api.getReferenceData()', () => {
+  function mockReference(hash) {
+    return vi.fn((url) => Promise.resolve({
+      ok: true,
+      status: 200,
+      json: () => Promise.resolve(
+        url === '/api/reference'
+          ? { hash, url: `/bundles/reference.${hash}.json` }
+          : { cards: [], storylines: [{ id: 1, hash }] }
+      ),
+    }))
+  }
+
+  it('downloads the advertised bundle once per hash', async () => {
+    global.fetch = mockReference('aaaa')
+    const first = await api.getReferenceData()
+    const second = await api.getReferenceData()
+    expect(second).toBe(first)
+    const urls = fetch.mock.calls.map(([url]) => url)
+    expect(urls).toEqual(['/api/reference', '/bundles/reference.aaaa.json', '/api/reference'])
+  })
+
+  it('refetches when the hash changes', async () => {
+    global.fetch = mockReference('bbbb')
+    const data = await api.getReferenceData()
+    expect(data.storylines[0].hash).toBe('bbbb')
+    expect(fetch).toHaveBeenCalledWith('/bundles/reference.bbbb.json', expect.anything())
+  })
+})